@@ -0,0 +1,172 @@
+# Ajuste automático de los pesos de la heurística (pesos.py) con SPSA sobre
+# partidas de autojuego repartidas en un ProcessPoolExecutor. En cada iteración
+# se perturban todos los pesos a la vez en una dirección aleatoria, la versión
+# "+" juega contra la "-" y los pesos se mueven hacia la que obtuvo mejor
+# resultado. El resultado va a pesos_ajustados.json; con --install (o
+# copiándolo a mano) pasa a pesos.json, el archivo que carga GameLogic.
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, NamedTuple, Optional, Sequence
+
+from algoritmo import Difficulty
+from pesos import DEFAULT_WEIGHTS, TUNED_WEIGHTS_PATH, WEIGHTS_PATH, EvalWeights, load_weights, save_weights
+from tablas import BOARD_VARIANTS, DEFAULT_BOARD, BoardConfig
+from torneo import EngineConfig, GameResult, format_report, opening_positions, play_game, run_tournament
+
+# Los pesos escritos se redondean a este paso: con múltiplos de 0.5 la
+# evaluación por lotes (evaluacion.py) coincide exactamente con la escalar
+WEIGHT_STEP = 0.5
+
+
+class SpsaSettings(NamedTuple):
+    """Parámetros de SPSA; paso y perturbación son relativos a la escala de cada peso"""
+    iterations: int = 50
+    games_per_iteration: int = 16  # Se juegan por pares, intercambiando colores
+    learning_rate: float = 0.5     # a
+    perturbation: float = 0.2      # c
+    stability: float = 5.0         # A
+    alpha: float = 0.602
+    gamma: float = 0.101
+
+
+class SpsaIteration(NamedTuple):
+    iteration: int
+    reward: float            # Resultado medio de "+" contra "-", entre -1 y 1
+    weights: EvalWeights     # Pesos tras la iteración (sin redondear)
+    elapsed_s: float
+
+
+def weight_scales(weights: EvalWeights) -> List[float]:
+    """Escala de cada peso: su valor inicial, con un mínimo de 1"""
+    return [max(abs(value), 1.0) for value in weights]
+
+
+def round_weights(weights: EvalWeights, step: float = WEIGHT_STEP) -> EvalWeights:
+    return EvalWeights(*(round(value / step) * step for value in weights))
+
+
+def game_reward(result: GameResult, zone_count: int) -> float:
+    """Resultado de la partida para el motor A, entre -1 y 1.
+
+    Muchas partidas entre motores parecidos terminan en empate; la diferencia
+    de zonas ganadas (la que decide el ganador) desempata la señal.
+    """
+    a_zones, b_zones = ((result.green_zones, result.red_zones) if result.a_is_green
+                        else (result.red_zones, result.green_zones))
+    return (result.score_a - 0.5) + 0.5 * (a_zones - b_zones) / zone_count
+
+
+def spsa_tune(
+    start: EvalWeights = DEFAULT_WEIGHTS,
+    settings: SpsaSettings = SpsaSettings(),
+    difficulty: Difficulty = Difficulty.AMATEUR,
+    max_depth: Optional[int] = 2,
+    board: BoardConfig = DEFAULT_BOARD,
+    max_plies: int = 200,
+    workers: Optional[int] = None,
+    seed: int = 0,
+    on_iteration: Optional[Callable[[SpsaIteration], None]] = None
+) -> EvalWeights:
+    """Ajusta ``start`` con SPSA y devuelve los pesos finales (sin redondear).
+
+    Los pesos se optimizan normalizados por su escala y nunca bajan de cero
+    (todas las penalizaciones se guardan en positivo). Cada iteración juega
+    ``games_per_iteration`` partidas en el mismo ProcessPoolExecutor, desde
+    posiciones iniciales nuevas para no sobreajustar unas pocas aperturas.
+    """
+    rng = random.Random(seed)
+    scales = weight_scales(start)
+    point = [value / scale for value, scale in zip(start, scales)]
+    zone_count = len(board.special_zones)
+    pairs = max(1, settings.games_per_iteration // 2)
+
+    def to_weights(values: Sequence[float]) -> EvalWeights:
+        return EvalWeights(*(max(0.0, value) * scale for value, scale in zip(values, scales)))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for k in range(settings.iterations):
+            started = time.perf_counter()
+            a_k = settings.learning_rate / (k + 1 + settings.stability) ** settings.alpha
+            c_k = settings.perturbation / (k + 1) ** settings.gamma
+            delta = [rng.choice((-1.0, 1.0)) for _ in point]
+            plus = EngineConfig("+", difficulty, max_depth,
+                                weights=to_weights([u + c_k * d for u, d in zip(point, delta)]))
+            minus = EngineConfig("-", difficulty, max_depth,
+                                 weights=to_weights([u - c_k * d for u, d in zip(point, delta)]))
+
+            futures = [
+                pool.submit(play_game, plus, minus, green_pos, red_pos, a_is_green, max_plies, board)
+                for green_pos, red_pos in opening_positions(pairs, rng.getrandbits(32), board)
+                for a_is_green in (True, False)
+            ]
+            rewards = [game_reward(future.result(), zone_count) for future in futures]
+            reward = sum(rewards) / len(rewards)
+
+            # Estimación del gradiente: (f(+) - f(-)) / (2 c_k delta_i), con 1/delta_i = delta_i
+            point = [max(0.0, u + a_k * reward / (2.0 * c_k) * d) for u, d in zip(point, delta)]
+            if on_iteration is not None:
+                on_iteration(SpsaIteration(k + 1, reward, to_weights(point), time.perf_counter() - started))
+    return to_weights(point)
+
+
+def main(argv: Optional[List[str]] = None):
+    defaults = SpsaSettings()
+    parser = argparse.ArgumentParser(description="Ajusta los pesos de la heurística con SPSA y autojuego")
+    parser.add_argument("--output", default=TUNED_WEIGHTS_PATH)
+    parser.add_argument("--install", action="store_true",
+                        help=f"al terminar, copiar los pesos ajustados a {os.path.basename(WEIGHTS_PATH)} "
+                             "(los que carga GameLogic)")
+    parser.add_argument("--start", default=None, help="archivo de pesos inicial (por defecto los de pesos.py)")
+    parser.add_argument("--iterations", type=int, default=defaults.iterations)
+    parser.add_argument("--games", type=int, default=defaults.games_per_iteration, help="partidas por iteración")
+    parser.add_argument("--learning-rate", type=float, default=defaults.learning_rate)
+    parser.add_argument("--perturbation", type=float, default=defaults.perturbation)
+    parser.add_argument("--difficulty", default="AMATEUR", choices=[difficulty.name for difficulty in Difficulty])
+    parser.add_argument("--depth", type=int, default=2, help="profundidad fija de las partidas de ajuste")
+    parser.add_argument("--board", default="8x8", choices=list(BOARD_VARIANTS))
+    parser.add_argument("--max-plies", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--validate", type=int, default=0,
+                        help="partidas finales de los pesos ajustados contra los iniciales")
+    args = parser.parse_args(argv)
+
+    start = load_weights(args.start) if args.start else DEFAULT_WEIGHTS
+    settings = defaults._replace(iterations=args.iterations, games_per_iteration=args.games,
+                                 learning_rate=args.learning_rate, perturbation=args.perturbation)
+    difficulty = Difficulty[args.difficulty]
+    board = BOARD_VARIANTS[args.board]
+
+    # El progreso va a un archivo aparte: interrumpir el ajuste conserva lo
+    # avanzado sin dejar en ``--output`` unos pesos a medio ajustar
+    progress_path = args.output + ".parcial"
+
+    def report(step: SpsaIteration):
+        save_weights(round_weights(step.weights), progress_path)
+        values = ", ".join(f"{name}={value:.2f}" for name, value in step.weights._asdict().items())
+        print(f"[{step.iteration}/{settings.iterations}] resultado {step.reward:+.3f} "
+              f"({step.elapsed_s:.1f} s): {values}", flush=True)
+
+    tuned = round_weights(spsa_tune(start, settings, difficulty, args.depth, board, args.max_plies,
+                                    args.workers, args.seed, report))
+    save_weights(tuned, args.output)
+    if os.path.exists(progress_path):
+        os.remove(progress_path)
+    print(f"Pesos escritos en {args.output}")
+    if args.install:
+        save_weights(tuned, WEIGHTS_PATH)
+        print(f"Pesos instalados en {WEIGHTS_PATH}")
+
+    if args.validate:
+        config_a = EngineConfig("ajustados", difficulty, args.depth, weights=tuned)
+        config_b = EngineConfig("iniciales", difficulty, args.depth, weights=start)
+        result = run_tournament(config_a, config_b, args.validate, args.workers, args.seed + 1,
+                                args.max_plies, board)
+        print(format_report(config_a, config_b, result))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,23 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from enum import Enum
-from typing import List, Tuple, Set, Dict, Optional
+import math
+import multiprocessing
+import os
+from typing import Callable, Deque, List, NamedTuple, Tuple, Set, Dict, Optional, Union
 import random
+import threading
+import time
+
+from bitboard import BitboardState, GameSnapshot, zobrist_keys
+from tablas import BOARD_SIZE, DEFAULT_BOARD, BoardConfig, board_tables, iter_bits
+from aperturas import OPENING_BOOK_PATH, OpeningBook
+from cache_posiciones import PositionCache, open_position_cache
+from estadisticas import SearchStats, export_json_lines
+from evaluacion import BatchEvaluator
+from finales import EndgameResult, EndgameSolver
+from pesos import DEFAULT_WEIGHTS, WEIGHTS_PATH, EvalWeights, resolve_weights
+from transposicion import EXACT, LOWER_BOUND, UPPER_BOUND, TranspositionTable
 
 class Player(Enum):
     GREEN = 1
@@ -11,13 +28,218 @@ class Difficulty(Enum):
     AMATEUR = 4
     EXPERT = 6
 
+class SearchProfile(NamedTuple):
+    """Límites de búsqueda de una dificultad: profundidad máxima y tiempo por jugada"""
+    max_depth: int
+    time_budget_ms: Optional[int]
+
+# Perfil de cada dificultad para la profundización iterativa con tiempo acotado
+DIFFICULTY_PROFILES = {
+    Difficulty.BEGINNER: SearchProfile(max_depth=2, time_budget_ms=250),
+    Difficulty.AMATEUR: SearchProfile(max_depth=4, time_budget_ms=500),
+    Difficulty.EXPERT: SearchProfile(max_depth=6, time_budget_ms=1000),
+}
+
+# Ordenamiento de movimientos: la prioridad estática (zonas, repetición) domina,
+# luego los movimientos asesinos del ply y por último la tabla de historia, que
+# se mantiene por debajo de HISTORY_LIMIT dividiéndola a la mitad
+HISTORY_LIMIT = 1 << 16
+KILLER_BONUS = (3 * HISTORY_LIMIT, 2 * HISTORY_LIMIT)
+STATIC_SCALE = 4 * HISTORY_LIMIT
+
+# Semiancho de la ventana de aspiración alrededor del puntaje esperado y
+# profundidad restante mínima para buscar con ventana nula (PVS); más cerca de
+# las hojas el ordenamiento no es lo bastante bueno y las repeticiones cuestan más
+ASPIRATION_WINDOW = 40.0
+PVS_MIN_DEPTH = 3
+
+# Casillas de zona libres a partir de las cuales el final se resuelve exactamente
+ENDGAME_CELLS = 3
+
+# Valor de una partida terminada (por encima de cualquier puntaje heurístico); la
+# heurística se suma para preferir los finales con mejor posición
+GAME_OVER_SCORE = 10000.0
+
+# Búsquedas cuyas estadísticas se conservan en memoria (las anteriores se descartan;
+# para el registro completo está ``enable_stats(log_path)``)
+STATS_HISTORY_LIMIT = 1000
+
+def order_moves(
+    moves: List[int],
+    priority: List[float],
+    history_scores: List[int],
+    history_base: int,
+    killers: List[Optional[int]],
+    tt_move: Optional[int] = None,
+    pv_move: Optional[int] = None
+):
+    """Ordena ``moves`` en el sitio: prioridad estática, asesinos e historia;
+    delante el movimiento de la tabla y, delante de todos, la variante principal.
+
+    Lo usan la búsqueda secuencial y el reparto de la raíz de la paralela: con
+    el mismo orden ambas desempatan igual.
+    """
+    if len(moves) > 1:
+        order = {move: priority[move] + history_scores[history_base + move] for move in moves}
+        for killer, bonus in zip(killers, KILLER_BONUS):
+            if killer in order:
+                order[killer] += bonus
+        moves.sort(key=order.__getitem__, reverse=True)
+    for first in (tt_move, pv_move):
+        if first is not None and first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+
+class SearchTimeout(Exception):
+    """Se lanza dentro de la búsqueda cuando se agota el tiempo disponible"""
+
+class SearchCancelled(Exception):
+    """Se lanza dentro de la búsqueda cuando se cancela desde otro hilo"""
+
+class AIMoveFuture:
+    """Resultado pendiente de una búsqueda lanzada con ``get_ai_move_async``.
+
+    El bucle del juego consulta ``done()`` (o recibe un aviso con
+    ``add_done_callback``) en lugar de bloquearse, y puede abortar la búsqueda
+    con ``cancel()``.
+    """
+
+    def __init__(self, future: Future, stop_event: threading.Event):
+        self._future = future
+        self._stop_event = stop_event
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def result(self) -> Optional[Tuple[int, int]]:
+        """Movimiento calculado (bloquea si la búsqueda no ha terminado); None si se
+        canceló antes de empezar"""
+        if self._future.cancelled():
+            return None
+        return self._future.result()
+
+    def add_done_callback(self, callback: Callable[["AIMoveFuture"], None]):
+        """Llama a ``callback`` al terminar la búsqueda, desde el hilo de la búsqueda
+        (o enseguida si ya terminó)"""
+        self._future.add_done_callback(lambda _: callback(self))
+
+    def cancel(self):
+        """Pide a la búsqueda que se detenga; el resultado será None"""
+        self._stop_event.set()
+        self._future.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._stop_event.is_set()
+
 class GameLogic:
-    def __init__(self, difficulty: Difficulty, special_zones: List[List[Tuple[int, int]]]):
+    def __init__(
+        self,
+        difficulty: Difficulty,
+        special_zones: Optional[List[List[Tuple[int, int]]]] = None,
+        tt_max_bytes: int = 16 * 1024 * 1024,
+        parallel_workers: int = 0,
+        pvs: bool = False,
+        aspiration: bool = False,
+        endgame_cells: int = ENDGAME_CELLS,
+        opening_book: Optional[str] = OPENING_BOOK_PATH,
+        board: Optional[BoardConfig] = None,
+        position_cache: Optional[str] = None,
+        weights: Union[EvalWeights, str, None] = WEIGHTS_PATH
+    ):
         self.difficulty = difficulty
-        self.special_zones = special_zones
+
+        # Pesos de la heurística (ver pesos.py): explícitos o de un archivo, que
+        # se carga si existe; si no, los de por defecto
+        self.weights = resolve_weights(weights)
+
+        # Tablero (tamaño, zonas y umbral); sin ``board`` es el de 8x8 con ``special_zones``.
+        # Las tablas de cada configuración se construyen una vez y se comparten.
+        if board is None:
+            board = BoardConfig.create(BOARD_SIZE, special_zones)
+        self.board = board
+        self.tables = board_tables(board)
+        self.zobrist = zobrist_keys(self.tables.num_squares)
+        self.special_zones = self.tables.special_zones
+        self.zone_masks = self.tables.zone_masks
+        self.zone_win_threshold = board.zone_win_threshold
+        self.closer_green, self.closer_red = self.tables.proximity_masks
+        self.center_bonus = [self.weights.centrality * steps for steps in self.tables.center_steps]
         self.initial_zone = None
         self.initial_zone_index = None
 
+        # Tabla de transposición compartida entre llamadas a get_ai_move de una partida
+        self.transposition_table = TranspositionTable(tt_max_bytes)
+
+        # Hilo de búsqueda en segundo plano (se crea al primer uso)
+        self._executor = None
+
+        # Búsqueda paralela: con 2 o más procesos la raíz se reparte entre ellos
+        self.tt_max_bytes = tt_max_bytes
+        self.parallel_workers = parallel_workers
+        self._process_pool = None
+        self._shared_scores = None
+
+        # Historia de cortes por [jugador][desde][hacia], conservada entre turnos
+        self.history_scores = [0] * (2 * self.tables.num_squares * self.tables.num_squares)
+
+        # Variantes de la búsqueda, apagadas por defecto: en el corpus de
+        # benchmarks/ PVS visita más nodos que alfa-beta simple. Se activan para
+        # compararlas (SEARCH_MODES en bench_search.py)
+        self.pvs = pvs
+        self.aspiration = aspiration
+        self.previous_score: Optional[float] = None  # Puntaje del turno anterior
+
+        # Puntaje y tiempo de la última jugada elegida (para el registro de partidas);
+        # el puntaje es None si no hubo búsqueda (libro, jugada única, final resuelto)
+        self.last_score: Optional[float] = None
+        self.last_think_ms = 0.0
+
+        # Resolvedor exacto del final (0 lo desactiva); sus capas se conservan entre turnos
+        self.endgame_cells = endgame_cells
+        self.endgame_solver = EndgameSolver(self.zone_masks, self.zone_win_threshold, board=board)
+        self.last_endgame: Optional[EndgameResult] = None
+
+        # Libro de aperturas (ver aperturas.py), generado para el tablero estándar
+        # con los pesos por defecto; sin archivo, en otros tableros o con otros
+        # pesos se busca siempre. Un libro de otra versión (generado con reglas
+        # anteriores) se ignora hasta que se regenere
+        self.opening_book = None
+        if (opening_book and board == DEFAULT_BOARD and self.weights == DEFAULT_WEIGHTS and
+                os.path.exists(opening_book)):
+            try:
+                self.opening_book = OpeningBook(opening_book)
+            except ValueError:
+                pass
+
+        # Caché persistente de posiciones (ver cache_posiciones.py), opcional: se
+        # lee y prepara la siembra de la tabla en segundo plano, y la primera
+        # búsqueda que empieza con la siembra lista la adopta
+        self.position_cache: Optional[PositionCache] = None
+        self._position_cache_seed = None
+        if position_cache:
+            self.position_cache = open_position_cache(position_cache, board, self.weights)
+            self._position_cache_seed = self.position_cache.prepare_seed(self.transposition_table.size)
+            self.transposition_table.track_changes()
+
+        # Respuestas calculadas durante el turno del rival (ver ``start_pondering``)
+        self._pondered: Dict[tuple, Tuple[Tuple[int, int], Optional[float]]] = {}
+
+        # Estadísticas de búsqueda (desactivadas por defecto, sin costo en ese caso)
+        self.stats_enabled = False
+        self.stats_log_path = None
+        self.last_stats: Optional[SearchStats] = None
+        self.stats_history: Deque[SearchStats] = deque(maxlen=STATS_HISTORY_LIMIT)
+
+    def enable_stats(self, log_path: Optional[str] = None):
+        """Activa la recolección de estadísticas; con ``log_path`` se anexa una línea JSON por jugada"""
+        self.stats_enabled = True
+        self.stats_log_path = log_path
+
+    def disable_stats(self):
+        self.stats_enabled = False
+        self.stats_log_path = None
+
     def set_initial_zone(self, green_pos: Tuple[int, int], special_zones: List[List[Tuple[int, int]]]):
         """Establece la zona inicial más cercana para la estrategia experta"""
         min_distance = float('inf')
@@ -35,202 +257,834 @@ class GameLogic:
         self.initial_zone = closest_zone
         self.initial_zone_index = closest_zone_index
 
+    @property
+    def profile(self) -> SearchProfile:
+        """Perfil de tiempo y profundidad de la dificultad actual"""
+        return DIFFICULTY_PROFILES[self.difficulty]
+
     def get_ai_move(
         self,
         green_pos: Tuple[int, int],
         red_pos: Tuple[int, int],
         painted_cells: Set[Tuple[int, int]],
         cell_owner: Dict[Tuple[int, int], Player],
-        move_history: List[Tuple[int, int]] = None
+        move_history: List[Tuple[int, int]] = None,
+        time_budget_ms: Optional[int] = None,
+        max_depth: Optional[int] = None
+    ) -> Optional[Tuple[int, int]]:
+        state = BitboardState.from_game(
+            self.special_zones, green_pos, red_pos, painted_cells, cell_owner, self.zone_masks, self.board
+        )
+        return self.get_ai_move_from_state(state, move_history, time_budget_ms, max_depth)
+
+    def get_ai_move_async(
+        self,
+        state: Union[BitboardState, GameSnapshot],
+        move_history: List[Tuple[int, int]] = None,
+        time_budget_ms: Optional[int] = None,
+        max_depth: Optional[int] = None
+    ) -> AIMoveFuture:
+        """Lanza la búsqueda en un hilo de trabajo y devuelve un resultado pendiente.
+
+        Se copian el estado y el historial, así que el llamador puede seguir
+        modificándolos; una GameSnapshot es inmutable y se pasa tal cual (el
+        historial sale de ella y ``move_history`` no se usa). Un único hilo
+        garantiza que la tabla de transposición nunca se use desde dos
+        búsquedas a la vez.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="yoshi-ai")
+        stop_event = threading.Event()
+        if isinstance(state, GameSnapshot):
+            future = self._executor.submit(
+                self.get_ai_move_from_snapshot, state, time_budget_ms, max_depth, stop_event
+            )
+            return AIMoveFuture(future, stop_event)
+        future = self._executor.submit(
+            self.get_ai_move_from_state,
+            state.copy(),
+            list(move_history) if move_history else None,
+            time_budget_ms,
+            max_depth,
+            stop_event
+        )
+        return AIMoveFuture(future, stop_event)
+
+    def start_pondering(
+        self,
+        state: Union[BitboardState, GameSnapshot],
+        move_history: List[Tuple[int, int]] = None,
+        time_budget_ms: Optional[int] = None,
+        max_depth: Optional[int] = None
+    ) -> AIMoveFuture:
+        """Reflexiona en segundo plano mientras piensa el rival (ROJO al turno en ``state``).
+
+        Para cada movimiento posible de ROJO, empezando por el que predijo la
+        última búsqueda, calcula la respuesta con los mismos límites que luego
+        recibirá ``get_ai_move_async`` y la guarda: si el rival juega uno de
+        ellos, la búsqueda siguiente devuelve la respuesta al instante. Hay que
+        cancelar el resultado antes de pedir el movimiento; una respuesta a
+        medio calcular deja igualmente la tabla de transposición caliente.
+        Como en ``get_ai_move_async``, una GameSnapshot no se copia.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="yoshi-ai")
+        stop_event = threading.Event()
+        if isinstance(state, GameSnapshot):
+            position, history = state, None
+        else:
+            position, history = state.copy(), list(move_history) if move_history else []
+        future = self._executor.submit(
+            self._ponder,
+            position,
+            history,
+            time_budget_ms,
+            max_depth,
+            stop_event
+        )
+        return AIMoveFuture(future, stop_event)
+
+    def _ponder(
+        self,
+        state: Union[BitboardState, GameSnapshot],
+        move_history: Optional[List[Tuple[int, int]]],
+        time_budget_ms: Optional[int],
+        max_depth: Optional[int],
+        stop_event: threading.Event
+    ):
+        if isinstance(state, GameSnapshot):
+            state, move_history = state.to_state(), state.move_history()
+        depth = max_depth if max_depth is not None else self.difficulty.value
+        self._pondered.clear()
+        red_moves = state.legal_moves(False)
+
+        # La respuesta de ROJO que predijo la última búsqueda va primero
+        key = state.hash ^ self._context_key(move_history) ^ self.zobrist.red_to_move
+        entry = self.transposition_table.peek(key)
+        if entry is not None and entry[4] in red_moves:
+            red_moves.remove(entry[4])
+            red_moves.insert(0, entry[4])
+
+        # Cada búsqueda envejece la historia y deja su puntaje como referencia de
+        # la siguiente: las respuestas parten del estado de la partida y este se
+        # restaura al terminar, así que reflexionar no cambia la búsqueda real
+        saved_history = self.history_scores[:]
+        saved_scores = (self.previous_score, self.last_score, self.last_endgame)
+        try:
+            for red_move in red_moves:
+                if stop_event.is_set():
+                    break
+                # Solo las últimas jugadas del historial afectan a la búsqueda, así que
+                # no hace falta recortarlo como la partida
+                history = move_history + [self.tables.to_pos(red_move)]
+                previous = state.make_move(False, red_move)
+                try:
+                    key = self._ponder_key(state, history, depth, time_budget_ms)
+                    self.history_scores[:] = saved_history
+                    self.previous_score, self.last_score, self.last_endgame = saved_scores[0], None, None
+                    move = self._choose_move(state, history, depth, time_budget_ms, stop_event)
+                finally:
+                    state.unmake_move(False, red_move, previous)
+                if move is not None and not stop_event.is_set():
+                    self._pondered[key] = (move, self.last_score)
+        finally:
+            self.history_scores[:] = saved_history
+            self.previous_score, self.last_score, self.last_endgame = saved_scores
+
+    def _ponder_key(
+        self,
+        state: BitboardState,
+        move_history: Optional[List[Tuple[int, int]]],
+        depth: int,
+        time_budget_ms: Optional[int]
+    ) -> tuple:
+        return (state.hash ^ self._context_key(move_history), self.difficulty, depth, time_budget_ms)
+
+    def shutdown(self):
+        """Detiene el hilo de búsqueda en segundo plano, si existe, escribe la caché de posiciones
+        y cierra el libro de aperturas"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+        if self.position_cache is not None:
+            self.position_cache.flush()
+        if self.opening_book is not None:
+            self.opening_book.close()
+            self.opening_book = None
+
+    def get_ai_move_from_snapshot(
+        self,
+        snapshot: GameSnapshot,
+        time_budget_ms: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        stop_event: Optional[threading.Event] = None
+    ) -> Optional[Tuple[int, int]]:
+        """Como ``get_ai_move_from_state`` sobre una instantánea (VERDE es la IA)"""
+        return self.get_ai_move_from_state(snapshot.to_state(), snapshot.move_history(),
+                                           time_budget_ms, max_depth, stop_event)
+
+    def get_ai_move_from_state(
+        self,
+        state: BitboardState,
+        move_history: List[Tuple[int, int]] = None,
+        time_budget_ms: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        stop_event: Optional[threading.Event] = None
     ) -> Optional[Tuple[int, int]]:
-        depth = self.difficulty.value
-
-        def is_in_special_zone(pos: Tuple[int, int]) -> bool:
-            for zone in self.special_zones:
-                if pos in zone:
-                    return True
-            return False
-
-        def get_valid_knight_moves(pos: Tuple[int, int]) -> List[Tuple[int, int]]:
-            row, col = pos
-            knight_moves = [
-                (-2, -1), (-2, 1), (-1, -2), (-1, 2),
-                (1, -2), (1, 2), (2, -1), (2, 1)
-            ]
-            valid_moves = []
-            for dr, dc in knight_moves:
-                new_row, new_col = row + dr, col + dc
-                if (0 <= new_row < 8 and 0 <= new_col < 8 and
-                    (new_row, new_col) not in painted_cells):
-                    
-                    #No permitir ocupar la misma posición que el oponente
-                    if (new_row, new_col) != red_pos:
-                        valid_moves.append((new_row, new_col))
-            return valid_moves
-
-        def is_repetitive_move(pos: Tuple[int, int], history: List[Tuple[int, int]]) -> bool:
-            """Verifica si un movimiento causaría repetición excesiva"""
-            if not history or len(history) < 4:
-                return False
-            
-            # Contar cuántas veces aparece esta posición en el historial reciente
-            recent_history = history[-4:]
-            return recent_history.count(pos) >= 2
-
-        def evaluate_position(green_pos, red_pos, painted_cells, cell_owner) -> float:
-            """Función heurística mejorada con anti-bucles y estrategia experta"""
+        """Calcula el movimiento de la IA sobre un estado en bitboards.
+
+        El estado se modifica durante la búsqueda con hacer/deshacer y se
+        devuelve intacto al terminar.
+
+        Sin ``time_budget_ms`` se busca a profundidad fija (la de la dificultad o
+        ``max_depth``). Con presupuesto se profundiza iterativamente hasta agotar
+        el tiempo y se devuelve el mejor movimiento de la última iteración completa.
+        Si ``stop_event`` se activa la búsqueda se aborta y devuelve None.
+
+        Con ``parallel_workers`` >= 2 la búsqueda a profundidad fija reparte los
+        movimientos de la raíz entre procesos (ver ``_parallel_search``).
+        """
+        depth = max_depth if max_depth is not None else self.difficulty.value
+        stats = SearchStats(self.difficulty.name, depth, time_budget_ms) if self.stats_enabled else None
+        self.last_score = None
+        start = time.perf_counter()
+        move = self._choose_move(state, move_history, depth, time_budget_ms, stop_event, stats)
+        self.last_think_ms = (time.perf_counter() - start) * 1000.0
+        if stats is None:
+            return move
+
+        stats.total_time_ms = self.last_think_ms
+        stats.move = move
+        self.last_stats = stats
+        self.stats_history.append(stats)
+        if self.stats_log_path:
+            export_json_lines([stats], self.stats_log_path)
+        return move
+
+    def _choose_move(
+        self,
+        state: BitboardState,
+        move_history: Optional[List[Tuple[int, int]]],
+        depth: int,
+        time_budget_ms: Optional[int],
+        stop_event: Optional[threading.Event],
+        stats: Optional[SearchStats] = None
+    ) -> Optional[Tuple[int, int]]:
+        """Filtra los movimientos de la raíz y lanza la búsqueda adecuada"""
+        repetitive_mask = self._repetitive_mask(move_history)
+
+        # Obtener movimientos válidos
+        valid_moves = state.legal_moves(True)
+
+        if not valid_moves:
+            return None
+
+        # Respuesta ya calculada mientras el rival pensaba
+        if self._pondered:
+            pondered = self._pondered.get(self._ponder_key(state, move_history, depth, time_budget_ms))
+            if pondered is not None and self.tables.to_square(pondered[0]) in valid_moves:
+                if stats is not None:
+                    stats.pondered = True
+                self.last_score = pondered[1]
+                if pondered[1] is not None:
+                    self.previous_score = pondered[1]
+                return pondered[0]
+
+        # Filtrar movimientos repetitivos
+        non_repetitive_moves = [move for move in valid_moves if not (repetitive_mask >> move) & 1]
+        if non_repetitive_moves:
+            valid_moves = non_repetitive_moves
+
+        # Si solo hay un movimiento válido, tomarlo directamente
+        if len(valid_moves) == 1:
+            return self.tables.to_pos(valid_moves[0])
+
+        # Las primeras jugadas ya están buscadas en el libro de aperturas
+        if self.opening_book is not None:
+            book_move = self.opening_book.lookup(state.hash ^ self._context_key(move_history),
+                                                 self.difficulty.value)
+            if book_move is not None and book_move in valid_moves:
+                if stats is not None:
+                    stats.book_move = True
+                return self.tables.to_pos(book_move)
+
+        # Con pocas casillas de zona libres el final se resuelve hasta el último movimiento
+        self.last_endgame = None
+        root_moves = None
+        if 0 < self.endgame_solver.free_zone_cells(state) <= self.endgame_cells:
+            start = time.perf_counter()
+            deadline = None if time_budget_ms is None else start + time_budget_ms / 1000.0
+            result = self.endgame_solver.solve(state, True, valid_moves, deadline, stop_event)
+            self.last_endgame = result
+            if stats is not None:
+                stats.endgame_proven = result.proven
+                stats.endgame_outcome = result.outcome if result.proven else None
+                stats.endgame_distance = result.distance
+            if stop_event is not None and stop_event.is_set():
+                return None
+            if result.proven:
+                # Una victoria forzada se juega por el camino más corto; si no, la
+                # heurística elige entre los movimientos que conservan el resultado
+                # (el rival puede equivocarse)
+                if (result.outcome == 1 and result.distance is not None) or len(result.moves) == 1:
+                    return self.tables.to_pos(result.move)
+                valid_moves = root_moves = list(result.moves)
+            # La heurística usa lo que quede del presupuesto
+            if time_budget_ms is not None:
+                time_budget_ms = max(1, time_budget_ms - int((time.perf_counter() - start) * 1000.0))
+
+        # Usar minimax para encontrar el mejor movimiento
+        try:
+            if (self.parallel_workers > 1 and time_budget_ms is None and stop_event is None and
+                    root_moves is None):
+                score, best_move = self._parallel_search(state, move_history, depth)
+            else:
+                score, best_move = self._search(state, move_history, depth, time_budget_ms, stop_event,
+                                                root_moves=root_moves, stats=stats)
+        except SearchCancelled:
+            return None
+        if best_move is not None and math.isfinite(score):
+            self.previous_score = self.last_score = score
+
+        # Fallback: si minimax no encuentra movimiento, tomar uno aleatorio
+        if best_move is None:
+            best_move = random.choice(valid_moves)
+
+        return self.tables.to_pos(best_move)
+
+    def _parallel_search(
+        self,
+        state: BitboardState,
+        move_history: Optional[List[Tuple[int, int]]],
+        depth: int
+    ) -> Tuple[float, Optional[int]]:
+        """Reparte los movimientos de la raíz entre un ProcessPoolExecutor.
+
+        Cada proceso busca un movimiento con ventana (alfa, +inf), donde alfa es
+        el mejor puntaje exacto ya publicado por los movimientos *anteriores* en
+        el orden de la raíz. Un movimiento que falla bajo no puede ser el elegido
+        (la búsqueda secuencial se queda con el primero en caso de empate) y la
+        raíz se ordena con ``order_moves`` como en la secuencial, así que el
+        resultado tiene el mismo puntaje y desempate que ella.
+        Cada proceso conserva su propia tabla de transposición entre llamadas.
+        """
+        green_priority, _ = self._static_priorities(state, self._repetitive_mask(move_history))
+        root_moves = state.legal_moves(True)
+        if not root_moves:
+            return float('-inf'), None
+        # Mismo orden que la raíz de la búsqueda secuencial (historia envejecida,
+        # sin asesinos todavía y el movimiento de la tabla delante) para que los
+        # empates se resuelvan igual
+        history_scores = self.history_scores
+        history_scores[:] = [value >> 1 for value in history_scores]
+        entry = self.transposition_table.peek(state.hash ^ self._context_key(move_history))
+        order_moves(root_moves, green_priority, history_scores, state.green_sq * self.tables.num_squares,
+                    [None, None], entry[4] if entry is not None else None)
+
+        if self._process_pool is None:
+            self._shared_scores = multiprocessing.Array('d', 8, lock=False)
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.parallel_workers,
+                initializer=_init_parallel_worker,
+                initargs=(self._shared_scores,)
+            )
+        for i in range(len(self._shared_scores)):
+            self._shared_scores[i] = float('-inf')
+
+        config = (
+            self.difficulty,
+            self.board,
+            self.initial_zone_index,
+            self.tt_max_bytes,
+            self.pvs,
+            self.weights
+        )
+        # Cada tarea recibe la instantánea compacta, no el estado con sus tablas
+        snapshot = GameSnapshot.from_state(state, True, move_history)
+        futures = [
+            self._process_pool.submit(_parallel_root_worker, config, snapshot, depth, index, move)
+            for index, move in enumerate(root_moves)
+        ]
+
+        best_score, best_index = float('-inf'), None
+        for future in futures:
+            index, score, exact = future.result()
+            if exact and score > best_score:
+                best_score, best_index = score, index
+        if best_index is None:
+            return float('-inf'), root_moves[0]
+        return best_score, root_moves[best_index]
+
+    def _repetitive_mask(self, move_history: Optional[List[Tuple[int, int]]]) -> int:
+        """Casillas que causarían repetición según el historial reciente"""
+        repetitive_mask = 0
+        if move_history and len(move_history) >= 4:
+            recent_history = move_history[-4:]
+            for pos in recent_history:
+                if recent_history.count(pos) >= 2:
+                    repetitive_mask |= 1 << self.tables.to_square(pos)
+        return repetitive_mask
+
+    def _context_key(self, move_history: Optional[List[Tuple[int, int]]]) -> int:
+        """Parte de la clave que no está en el estado.
+
+        La heurística depende del historial y de la zona inicial: se incluyen en
+        la clave para que las entradas de turnos anteriores sigan siendo correctas.
+        """
+        context_key = 0
+        for square in iter_bits(self._repetitive_mask(move_history)):
+            context_key ^= self.zobrist.repetitive[square]
+        if self.difficulty == Difficulty.EXPERT and self.initial_zone_index is not None:
+            context_key ^= self.zobrist.initial_zone[self.initial_zone_index]
+        return context_key
+
+    def _static_priorities(self, state: BitboardState, repetitive_mask: int) -> Tuple[List[int], List[int]]:
+        """Prioridad de cada casilla destino para VERDE y para ROJO, ya escalada.
+
+        Pintar una zona es bueno para ambos; la repetición solo penaliza a VERDE,
+        que es quien evalúa la heurística.
+        """
+        zones_mask = state.zones_mask
+        green_priority = []
+        red_priority = []
+        for square in range(self.tables.num_squares):
+            zone = 100 * ((zones_mask >> square) & 1)
+            green_priority.append((zone - 50 * ((repetitive_mask >> square) & 1)) * STATIC_SCALE)
+            red_priority.append(zone * STATIC_SCALE)
+        return green_priority, red_priority
+
+    def _zone_terms(self) -> List[List[List[float]]]:
+        """Término de cada zona precalculado por (casillas verdes, casillas rojas)"""
+        expert = self.difficulty == Difficulty.EXPERT
+        initial_zone_index = self.initial_zone_index
+        threshold = self.zone_win_threshold
+        weights = self.weights
+
+        def zone_term(i: int, green_count: int, red_count: int) -> float:
+            """Contribución de una zona a la heurística según sus casillas pintadas"""
             score = 0.0
-            
+
+            # Bonificación por controlar zonas
+            if green_count > red_count:
+                score += weights.zone_lead * (green_count - red_count)
+            elif red_count > green_count:
+                score -= weights.zone_lead * (red_count - green_count)
+
+            # Priorizar zona inicial si no está completamente perdida
+            if expert and i == initial_zone_index:
+                # Si aún podemos ganar esta zona, darle alta prioridad
+                if red_count < threshold:
+                    score += weights.initial_zone * green_count
+
+            # Bonificación por completar (capturar) una zona o estar cerca
+            if green_count >= threshold:
+                score += weights.zone_won
+            elif green_count == threshold - 1:
+                score += weights.zone_near
+
+            # Penalización si el oponente completó la zona o está cerca
+            if red_count >= threshold:
+                score -= weights.zone_lost
+            elif red_count == threshold - 1:
+                score -= weights.zone_threat
+
+            return score
+
+        return [
+            [[zone_term(i, green_count, red_count) for red_count in range(mask.bit_count() + 1)]
+             for green_count in range(mask.bit_count() + 1)]
+            for i, mask in enumerate(self.zone_masks)
+        ]
+
+    def make_evaluator(
+        self,
+        state: BitboardState,
+        move_history: Optional[List[Tuple[int, int]]] = None
+    ) -> Callable[[], float]:
+        """Devuelve la heurística ligada a ``state``: evalúa su contenido actual.
+
+        La búsqueda llama a la función devuelta en cada hoja mientras modifica
+        ``state`` con hacer/deshacer; los términos que no dependen de la posición
+        se precalculan aquí una sola vez.
+        """
+        repetitive_mask = self._repetitive_mask(move_history)
+        zone_terms = self._zone_terms()
+        zone_indices = range(len(zone_terms))
+        closer_green = self.closer_green
+        closer_red = self.closer_red
+        center_bonus = self.center_bonus
+        num_squares = self.tables.num_squares
+        proximity_green = self.weights.proximity_green
+        proximity_red = self.weights.proximity_red
+        repetition = self.weights.repetition
+        green_counts = state.green_counts
+        red_counts = state.red_counts
+
+        def evaluate_position() -> float:
+            """Función heurística mejorada con anti-bucles y estrategia experta.
+
+            Los conteos por zona se mantienen al hacer/deshacer y la proximidad sale
+            de máscaras precalculadas por par de casillas, así que la evaluación no
+            recorre el tablero.
+            """
             # 1. Evaluar control de zonas (peso principal)
-            for i, zone in enumerate(self.special_zones):
-                green_count = sum(1 for cell in zone if cell in cell_owner and cell_owner[cell] == Player.GREEN)
-                red_count = sum(1 for cell in zone if cell in cell_owner and cell_owner[cell] == Player.RED)
-                
-                # Bonificación por controlar zonas
-                if green_count > red_count:
-                    score += 10 * (green_count - red_count)
-                elif red_count > green_count:
-                    score -= 10 * (red_count - green_count)
-                
-                # Priorizar zona inicial si no está completamente perdida
-                if (self.difficulty == Difficulty.EXPERT and 
-                    self.initial_zone_index is not None and 
-                    i == self.initial_zone_index):
-                    
-                    # Si aún podemos ganar esta zona, darle alta prioridad
-                    if red_count < 3:
-                        score += 15 * green_count
-
-                # Bonificación por estar cerca de completar una zona
-                if green_count == 3:
-                    score += 25
-                elif green_count == 2:
-                    score += 15
-                
-                # Penalización si el oponente está cerca de completar
-                if red_count == 3:
-                    score -= 30
-                elif red_count == 2:
-                    score -= 20
+            score = 0.0
+            for i in zone_indices:
+                score += zone_terms[i][green_counts[i]][red_counts[i]]
 
             # 2. Evaluar proximidad a zonas no controladas
-            for zone in self.special_zones:
-                for cell in zone:
-                    if cell not in painted_cells:
-                        g_dist = abs(green_pos[0] - cell[0]) + abs(green_pos[1] - cell[1])
-                        r_dist = abs(red_pos[0] - cell[0]) + abs(red_pos[1] - cell[1])
-                        
-                        # Bonificación por estar más cerca de celdas no pintadas
-                        if g_dist < r_dist:
-                            score += 3
-                        elif r_dist < g_dist:
-                            score -= 2
+            green_sq = state.green_sq
+            index = green_sq * num_squares + state.red_sq
+            unpainted = ~state.painted
+            score += proximity_green * (closer_green[index] & unpainted).bit_count()
+            score -= proximity_red * (closer_red[index] & unpainted).bit_count()
 
             # 3. Evaluar posición estratégica
             # Bonificación por posiciones centrales (más opciones de movimiento)
-            center_distance = abs(green_pos[0] - 3.5) + abs(green_pos[1] - 3.5)
-            score += (7 - center_distance) * 0.5
+            score += center_bonus[green_sq]
 
             # 4. Penalización por repetición de movimientos
-            if move_history and is_repetitive_move(green_pos, move_history):
-                score -= 20
+            if (repetitive_mask >> green_sq) & 1:
+                score -= repetition
 
             #Impresion de la utilidad heuristica de cada movimiento
-            #print(f"[Evaluación heurística] GREEN: {green_pos}, RED: {red_pos}, Puntaje: {score}")
-            
+            #print(f"[Evaluación heurística] GREEN: {self.tables.to_pos(green_sq)}, RED: {self.tables.to_pos(state.red_sq)}, Puntaje: {score}")
 
             return score
 
-        def minimax(g_pos, r_pos, painted, cell_owner, maximizing, depth_left, alpha=float('-inf'), beta=float('inf')):
-            """Minimax con poda alfa-beta para mejor rendimiento"""
+        return evaluate_position
+
+    def make_batch_evaluator(
+        self,
+        move_history: Optional[List[Tuple[int, int]]] = None
+    ) -> BatchEvaluator:
+        """Heurística de ``make_evaluator`` para lotes de posiciones (requiere NumPy)"""
+        return BatchEvaluator(self.tables, self._zone_terms(), self._repetitive_mask(move_history), self.weights)
+
+    def _search(
+        self,
+        state: BitboardState,
+        move_history: Optional[List[Tuple[int, int]]],
+        depth: int,
+        time_budget_ms: Optional[int] = None,
+        stop_event: Optional[threading.Event] = None,
+        root_moves: Optional[List[int]] = None,
+        root_alpha: float = float('-inf'),
+        stats: Optional[SearchStats] = None
+    ) -> Tuple[float, Optional[int]]:
+        """Búsqueda alfa-beta desde ``state`` con VERDE al turno.
+
+        Devuelve el puntaje y el mejor movimiento (como casilla). ``root_moves``
+        restringe los movimientos de la raíz y ``root_alpha`` fija la cota
+        inferior inicial; ambos los usa la búsqueda paralela para repartir la
+        raíz entre procesos. Lanza SearchCancelled si ``stop_event`` se activa.
+        Con ``stats`` se cuentan nodos, cortes por ply, tiempos por profundidad
+        y se extrae la variante principal.
+        """
+        table = self.transposition_table
+        cache = self.position_cache
+        seed = self._position_cache_seed
+        if seed is not None and seed.done():
+            # Antes de new_search: lo sembrado cuenta como de una búsqueda anterior.
+            # Si aún no está listo, esta búsqueda empieza en frío
+            self._position_cache_seed = None
+            if seed.exception() is None:
+                table.adopt(seed.result())
+        table.new_search()
+        if stats is not None:
+            probes_before, hits_before = table.hits + table.misses, table.hits
+
+        repetitive_mask = self._repetitive_mask(move_history)
+        context_key = self._context_key(move_history)
+
+        evaluate_position = self.make_evaluator(state, move_history)
+
+        if stats is not None:
+            # Solo con estadísticas activas se envuelve la heurística para contarla
+            raw_evaluate_position = evaluate_position
+
+            def evaluate_position() -> float:
+                stats.leaf_evaluations += 1
+                return raw_evaluate_position()
+
+        # Ordenamiento: prioridad estática por casilla, dos asesinos por ply e historia
+        green_priority, red_priority = self._static_priorities(state, repetitive_mask)
+        killers = [[None, None] for _ in range(depth + 1)]
+        history_scores = self.history_scores
+        saved_history = history_scores[:]
+        history_scores[:] = [value >> 1 for value in history_scores]  # Envejecer turnos anteriores
+
+        deadline = None
+        root_depth = depth
+        num_squares = self.tables.num_squares
+        zones_mask = state.zones_mask
+        red_to_move_key = self.zobrist.red_to_move
+        pvs = self.pvs
+        aspiration = self.aspiration
+
+        def record_cutoff(maximizing: bool, ply: int, depth_left: int, move: int):
+            """Recuerda el movimiento que produjo un corte como asesino del ply y en la historia"""
+            if stats is not None:
+                stats.record_cutoff(ply)
+            ply_killers = killers[ply]
+            if ply_killers[0] != move:
+                ply_killers[1] = ply_killers[0]
+                ply_killers[0] = move
+            from_sq = state.green_sq if maximizing else num_squares + state.red_sq
+            index = from_sq * num_squares + move
+            history_scores[index] += depth_left * depth_left
+            if history_scores[index] >= HISTORY_LIMIT:
+                history_scores[:] = [value >> 1 for value in history_scores]
+
+        def game_over_score() -> float:
+            """Puntaje de una partida terminada: decide el resultado por zonas ganadas"""
+            return state.outcome() * GAME_OVER_SCORE + evaluate_position()
+
+        def minimax(maximizing, depth_left, alpha=float('-inf'), beta=float('inf'), pv_move=None,
+                    moves=None):
+            """Minimax con poda alfa-beta sobre el estado compartido (hacer/deshacer).
+
+            ``state.make_move`` aplica las mismas reglas que la partida real
+            (captura de zonas), así que solo se recorren posiciones alcanzables.
+            """
+            if not zones_mask & ~state.painted:
+                return game_over_score(), None  # Sin casillas de zona libres: fin de la partida
             if depth_left == 0:
-                return evaluate_position(g_pos, r_pos, painted, cell_owner), None
+                return evaluate_position(), None
+
+            if deadline is not None and time.perf_counter() >= deadline:
+                raise SearchTimeout()
+            if stop_event is not None and stop_event.is_set():
+                raise SearchCancelled()
+            if stats is not None:
+                stats.nodes += 1
+
+            # Consultar la tabla de transposición (no con la raíz restringida, cuya
+            # entrada no representaría la posición completa)
+            key = state.hash ^ context_key
+            if not maximizing:
+                key ^= red_to_move_key
+            tt_move = None
+            entry = table.probe(key) if moves is None else None
+            if entry is not None:
+                tt_move = entry[4]
+                if entry[1] >= depth_left:
+                    bound, tt_score = entry[2], entry[3]
+                    if (bound == EXACT or
+                            (bound == LOWER_BOUND and tt_score >= beta) or
+                            (bound == UPPER_BOUND and tt_score <= alpha)):
+                        return tt_score, tt_move
 
-            current_pos = g_pos if maximizing else r_pos
-            valid_moves = get_valid_knight_moves(current_pos)
+            valid_moves = state.legal_moves(maximizing) if moves is None else list(moves)
 
             if not valid_moves:
-                return evaluate_position(g_pos, r_pos, painted, cell_owner), None
+                return game_over_score(), None  # El jugador al turno no puede moverse
+            if stats is not None:
+                stats.moves_generated += len(valid_moves)
+
+            ply = root_depth - depth_left
+            if maximizing:
+                priority, history_base = green_priority, state.green_sq * num_squares
+            else:
+                priority, history_base = red_priority, (num_squares + state.red_sq) * num_squares
+            # El mejor movimiento conocido de la tabla se prueba primero y, en la
+            # raíz, la variante principal de la iteración anterior antes que él
+            order_moves(valid_moves, priority, history_scores, history_base, killers[ply], tt_move, pv_move)
 
             best_move = None
+            alpha_orig, beta_orig = alpha, beta
 
             if maximizing:
                 max_eval = float('-inf')
-                
-                # Ordenar movimientos para mejorar la poda alfa-beta
-                def move_priority(move):
-                    priority = 0
-                    if is_in_special_zone(move):
-                        priority += 100
-                    if move_history and is_repetitive_move(move, move_history):
-                        priority -= 50
-                    return priority
-                    
-                valid_moves.sort(key=move_priority, reverse=True)
-                
-                for move in valid_moves:
-                    new_painted = painted.copy()
-                    new_owner = cell_owner.copy()
 
-                    if is_in_special_zone(move):
-                        new_painted.add(move)
-                        new_owner[move] = Player.GREEN
+                for move in valid_moves:
+                    previous = state.make_move(True, move)
+                    if pvs and best_move is not None and depth_left >= PVS_MIN_DEPTH:
+                        # PVS: basta probar que no supera a alfa; si lo supera, se repite
+                        eval_score, _ = minimax(False, depth_left - 1, alpha, math.nextafter(alpha, beta))
+                        if alpha < eval_score < beta:
+                            # El fallo alto es una cota inferior: la repetición parte de ella
+                            if stats is not None:
+                                stats.pvs_researches += 1
+                            eval_score, _ = minimax(False, depth_left - 1,
+                                                    math.nextafter(eval_score, alpha), beta)
+                    else:
+                        eval_score, _ = minimax(False, depth_left - 1, alpha, beta)
+                    state.unmake_move(True, move, previous)
 
-                    eval_score, _ = minimax(move, r_pos, new_painted, new_owner, False, depth_left - 1, alpha, beta)
-                    
                     if eval_score > max_eval:
                         max_eval = eval_score
                         best_move = move
-                    
+
                     alpha = max(alpha, eval_score)
                     if beta <= alpha:
+                        record_cutoff(True, ply, depth_left, move)
                         break
-                        
-                return max_eval, best_move
+
+                result = max_eval
             else:
                 min_eval = float('inf')
-                
-                for move in valid_moves:
-                    new_painted = painted.copy()
-                    new_owner = cell_owner.copy()
 
-                    if is_in_special_zone(move):
-                        new_painted.add(move)
-                        new_owner[move] = Player.RED
+                for move in valid_moves:
+                    previous = state.make_move(False, move)
+                    if pvs and best_move is not None and depth_left >= PVS_MIN_DEPTH:
+                        eval_score, _ = minimax(True, depth_left - 1, math.nextafter(beta, alpha), beta)
+                        if alpha < eval_score < beta:
+                            if stats is not None:
+                                stats.pvs_researches += 1
+                            eval_score, _ = minimax(True, depth_left - 1, alpha,
+                                                    math.nextafter(eval_score, beta))
+                    else:
+                        eval_score, _ = minimax(True, depth_left - 1, alpha, beta)
+                    state.unmake_move(False, move, previous)
 
-                    eval_score, _ = minimax(g_pos, move, new_painted, new_owner, True, depth_left - 1, alpha, beta)
-                    
                     if eval_score < min_eval:
                         min_eval = eval_score
                         best_move = move
-                    
+
                     beta = min(beta, eval_score)
                     if beta <= alpha:
+                        record_cutoff(False, ply, depth_left, move)
                         break
-                        
-                return min_eval, best_move
 
-        # Obtener movimientos válidos
-        valid_moves = get_valid_knight_moves(green_pos)
-        
-        if not valid_moves:
-            return None
+                result = min_eval
 
-        # Filtrar movimientos repetitivos
-        if move_history:
-            non_repetitive_moves = [move for move in valid_moves if not is_repetitive_move(move, move_history)]
-            if non_repetitive_moves:
-                valid_moves = non_repetitive_moves
+            if result <= alpha_orig:
+                bound = UPPER_BOUND
+            elif result >= beta_orig:
+                bound = LOWER_BOUND
+            else:
+                bound = EXACT
+            if moves is None:
+                table.store(key, depth_left, bound, result, best_move)
 
-        # Si solo hay un movimiento válido, tomarlo directamente
-        if len(valid_moves) == 1:
-            return valid_moves[0]
+            return result, best_move
 
-        # Usar minimax para encontrar el mejor movimiento
-        _, best_move = minimax(green_pos, red_pos, painted_cells, cell_owner, True, depth)
-        
-        # Fallback: si minimax no encuentra movimiento, tomar uno aleatorio
-        if best_move is None:
-            best_move = random.choice(valid_moves)
-        
-        return best_move
\ No newline at end of file
+        def principal_variation(first_move: int, max_length: int) -> List[Tuple[int, int]]:
+            """Reconstruye la variante principal siguiendo los mejores movimientos de la tabla"""
+            pv = []
+            undo = []
+            maximizing = True
+            move = first_move
+            while move is not None and len(pv) < max_length:
+                if move not in state.legal_moves(maximizing):
+                    break
+                undo.append((maximizing, move, state.make_move(maximizing, move)))
+                pv.append(self.tables.to_pos(move))
+                maximizing = not maximizing
+                key = state.hash ^ context_key
+                if not maximizing:
+                    key ^= red_to_move_key
+                entry = table.peek(key)
+                move = entry[4] if entry is not None else None
+            for maximizing, move, previous in reversed(undo):
+                state.unmake_move(maximizing, move, previous)
+            return pv
+
+        def finish(result: Tuple[float, Optional[int]], completed_depth: int) -> Tuple[float, Optional[int]]:
+            if cache is not None:
+                cache.record(table)
+            if stats is not None:
+                stats.score = result[0]
+                stats.tt_probes = table.hits + table.misses - probes_before
+                stats.tt_hits = table.hits - hits_before
+                if result[1] is not None:
+                    stats.principal_variation = principal_variation(result[1], completed_depth)
+            return result
+
+        def search_root(current_depth: int, pv_move: Optional[int], guess: Optional[float]):
+            """Búsqueda de la raíz, con ventana de aspiración alrededor de ``guess``.
+
+            Si el puntaje cae fuera de la ventana se repite abriendo ese lado, así
+            que el resultado es el mismo que con la ventana completa.
+            """
+            if (not aspiration or guess is None or not math.isfinite(guess) or
+                    root_moves is not None or root_alpha != float('-inf')):
+                return minimax(True, current_depth, root_alpha, pv_move=pv_move, moves=root_moves)
+            low, high = guess - ASPIRATION_WINDOW, guess + ASPIRATION_WINDOW
+            score, move = minimax(True, current_depth, low, high, pv_move=pv_move)
+            if score <= low:
+                low = float('-inf')
+            elif score >= high:
+                high = float('inf')
+            else:
+                return score, move
+            if stats is not None:
+                stats.aspiration_researches += 1
+            return minimax(True, current_depth, low, high, pv_move=move if move is not None else pv_move)
+
+        saved_state = state.copy()
+        try:
+            if time_budget_ms is None:
+                start = time.perf_counter()
+                result = search_root(depth, None, self.previous_score)
+                if stats is not None:
+                    stats.depth_times_ms.append((depth, (time.perf_counter() - start) * 1000.0))
+                return finish(result, depth)
+
+            # Profundización iterativa: la primera iteración nunca se interrumpe, así
+            # que siempre hay un movimiento; si el tiempo se agota a mitad de una
+            # iteración se restaura el estado y se conserva la anterior
+            start = time.perf_counter()
+            budget = time_budget_ms / 1000.0
+            best_score, best_move = float('-inf'), None
+            completed_depth = 0
+            for current_depth in range(1, depth + 1):
+                deadline = None if current_depth == 1 else start + budget
+                root_depth = current_depth
+                iteration_start = time.perf_counter()
+                try:
+                    guess = self.previous_score if best_move is None else best_score
+                    score, move = search_root(current_depth, best_move, guess)
+                except SearchTimeout:
+                    state.restore(saved_state)
+                    break
+                if stats is not None:
+                    stats.depth_times_ms.append(
+                        (current_depth, (time.perf_counter() - iteration_start) * 1000.0)
+                    )
+                completed_depth = current_depth
+                if move is not None:
+                    best_score, best_move = score, move
+                if time.perf_counter() - start >= budget:
+                    break
+            return finish((best_score, best_move), completed_depth)
+        except SearchCancelled:
+            # Una búsqueda cancelada no cuenta: ni el envejecimiento ni sus cortes
+            state.restore(saved_state)
+            history_scores[:] = saved_history
+            raise
+
+
+# Estado de cada proceso de la búsqueda paralela: puntajes publicados por
+# movimiento de la raíz y un GameLogic por configuración (con su tabla)
+_worker_shared_scores = None
+_worker_logics = {}
+
+def _init_parallel_worker(shared_scores):
+    global _worker_shared_scores
+    _worker_shared_scores = shared_scores
+
+def _parallel_root_worker(config, snapshot, depth, index, move):
+    """Busca un único movimiento de la raíz dentro de un proceso de trabajo"""
+    difficulty, board, initial_zone_index, tt_max_bytes, pvs, weights = config
+    logic = _worker_logics.get((difficulty, board, weights))
+    if logic is None:
+        # Los trabajadores solo buscan desde la raíz: no necesitan el libro de aperturas
+        logic = GameLogic(difficulty, tt_max_bytes=tt_max_bytes, board=board, weights=weights,
+                          opening_book=None)
+        _worker_logics[(difficulty, board, weights)] = logic
+    logic.initial_zone_index = initial_zone_index
+    logic.pvs = pvs
+
+    # Cota inferior: mejor puntaje exacto de los movimientos anteriores en el orden
+    alpha = max(_worker_shared_scores[:index], default=float('-inf'))
+    score, _ = logic._search(snapshot.to_state(), snapshot.move_history(), depth,
+                             root_moves=[move], root_alpha=alpha)
+    exact = score > alpha
+    if exact:
+        _worker_shared_scores[index] = score
+    return index, score, exact
@@ -0,0 +1,198 @@
+import argparse
+import mmap
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+from tablas import DEFAULT_BOARD, SPECIAL_ZONES, board_tables
+
+# Libro por defecto, junto a los módulos; GameLogic lo carga si existe
+OPENING_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "libro_aperturas.bin")
+
+# Cabecera: firma, versión, tamaño de registro y número de registros. Cada
+# registro guarda la clave de la posición (hash Zobrist del estado con la
+# clave de contexto de GameLogic), la dificultad, el movimiento y la profundidad
+# con la que se buscó. Los registros van ordenados por clave y dificultad.
+BOOK_MAGIC = b"YZAB"
+BOOK_VERSION = 2  # 2: captura de zonas y fin de partida en las reglas
+HEADER = struct.Struct("<4sHHI")
+RECORD = struct.Struct("<QBBB")
+
+BookEntry = Tuple[int, int, int, int]  # (clave, dificultad, casilla, profundidad)
+
+
+class OpeningBook:
+    """Libro de aperturas en disco, mapeado en memoria y consultado por búsqueda binaria"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._data = None
+        self._file = open(path, "rb")
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap no admite archivos vacíos
+            self._file.close()
+            raise ValueError(f"Libro de aperturas vacío: {path}")
+        if len(self._data) < HEADER.size:
+            self.close()
+            raise ValueError(f"Libro de aperturas truncado: {path}")
+        magic, version, record_size, count = HEADER.unpack_from(self._data, 0)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"Libro de aperturas no válido: {path}")
+        if HEADER.size + count * RECORD.size > len(self._data):
+            self.close()
+            raise ValueError(f"Libro de aperturas truncado: {path}")
+        self.count = count
+
+    def __enter__(self) -> "OpeningBook":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _record(self, index: int) -> BookEntry:
+        return RECORD.unpack_from(self._data, HEADER.size + index * RECORD.size)
+
+    def lookup(self, key: int, difficulty: int) -> Optional[int]:
+        """Casilla del movimiento guardado para la posición, o None si no está (o si el libro
+        ya se cerró)"""
+        if self._data is None:
+            return None
+        target = (key, difficulty)
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            record = self._record(middle)
+            if (record[0], record[1]) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count:
+            record = self._record(low)
+            if record[0] == key and record[1] == difficulty:
+                return record[2]
+        return None
+
+    def close(self):
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+        self._file.close()
+
+
+def write_book(entries: Iterable[BookEntry], path: str) -> int:
+    """Escribe el libro ordenado (una entrada por clave y dificultad); devuelve cuántas guardó"""
+    unique = {}
+    for key, difficulty, move, depth in entries:
+        previous = unique.get((key, difficulty))
+        if previous is None or depth > previous[1]:
+            unique[(key, difficulty)] = (move, depth)
+    records = sorted(unique.items())
+    with open(path, "wb") as book_file:
+        book_file.write(HEADER.pack(BOOK_MAGIC, BOOK_VERSION, RECORD.size, len(records)))
+        for (key, difficulty), (move, depth) in records:
+            book_file.write(RECORD.pack(key, difficulty, move, depth))
+    return len(records)
+
+
+def start_squares() -> List[int]:
+    """Casillas donde _place_yoshis_randomly puede colocar a los Yoshis"""
+    return board_tables(DEFAULT_BOARD).start_squares()
+
+
+def _book_lines(difficulty_name: str, green_sq: int, ai_moves: int, extra_depth: int) -> List[BookEntry]:
+    """Busca las primeras ``ai_moves`` jugadas de la IA desde cada inicio con VERDE en ``green_sq``.
+
+    La IA es determinista, así que de ella solo se sigue el movimiento del
+    libro; del humano se recorren todas las respuestas.
+    """
+    # Importaciones diferidas: algoritmo importa este módulo para leer el libro
+    from algoritmo import DIFFICULTY_PROFILES, Difficulty, GameLogic, Player
+    from reglas import HeadlessGame
+    from pesos import DEFAULT_WEIGHTS
+
+    tables = board_tables(DEFAULT_BOARD)
+    difficulty = Difficulty[difficulty_name]
+    depth = DIFFICULTY_PROFILES[difficulty].max_depth + extra_depth
+    entries = []
+    for red_sq in tables.start_squares():
+        if red_sq == green_sq:
+            continue
+        green_pos, red_pos = tables.to_pos(green_sq), tables.to_pos(red_sq)
+        # El libro solo se consulta con los pesos por defecto: se busca con ellos
+        # aunque exista un pesos.json
+        logic = GameLogic(difficulty, SPECIAL_ZONES, opening_book=None, endgame_cells=0,
+                          weights=DEFAULT_WEIGHTS)
+        logic.set_initial_zone(green_pos, SPECIAL_ZONES)
+
+        lines: List[List[Tuple[int, int]]] = [[]]
+        for ai_move in range(ai_moves):
+            next_lines = []
+            for line in lines:
+                game = HeadlessGame(green_pos, red_pos, SPECIAL_ZONES)
+                for pos in line:
+                    game.make_move(pos)
+                state = game.perspective_state(Player.GREEN)
+                move = logic.get_ai_move_from_state(state, game.move_history, max_depth=depth)
+                if move is None:
+                    continue
+                key = state.hash ^ logic._context_key(game.move_history)
+                entries.append((key, difficulty.value, tables.to_square(move), depth))
+                if ai_move + 1 == ai_moves:
+                    continue
+                game.make_move(move)
+                if not game.game_over:
+                    next_lines.extend(line + [move, reply] for reply in game.legal_moves())
+            lines = next_lines
+    return entries
+
+
+def build_book(
+    difficulties: List[str],
+    ai_moves: int = 2,
+    extra_depth: int = 2,
+    workers: Optional[int] = None,
+    green_squares: Optional[List[int]] = None
+) -> List[BookEntry]:
+    """Genera las entradas del libro repartiendo las casillas iniciales en un ProcessPoolExecutor"""
+    if green_squares is None:
+        green_squares = start_squares()
+    tasks = [(name, square) for name in difficulties for square in green_squares]
+    entries = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_book_lines, name, square, ai_moves, extra_depth) for name, square in tasks]
+        for future in futures:
+            entries.extend(future.result())
+    return entries
+
+
+def main(argv: Optional[List[str]] = None):
+    from algoritmo import Difficulty
+
+    parser = argparse.ArgumentParser(description="Genera el libro de aperturas con búsquedas profundas")
+    parser.add_argument("--output", default=OPENING_BOOK_PATH)
+    parser.add_argument("--difficulty", action="append", choices=[difficulty.name for difficulty in Difficulty],
+                        help="dificultades a incluir (por defecto todas)")
+    parser.add_argument("--ai-moves", type=int, default=2, help="jugadas de la IA por línea")
+    parser.add_argument("--extra-depth", type=int, default=2,
+                        help="profundidad adicional sobre la de cada dificultad")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--starts", type=int, default=None,
+                        help="usar solo las primeras N casillas iniciales de VERDE (para pruebas)")
+    args = parser.parse_args(argv)
+
+    difficulties = args.difficulty or [difficulty.name for difficulty in Difficulty]
+    green_squares = start_squares()[:args.starts] if args.starts else None
+    entries = build_book(difficulties, args.ai_moves, args.extra_depth, args.workers, green_squares)
+    count = write_book(entries, args.output)
+    print(f"{count} posiciones escritas en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
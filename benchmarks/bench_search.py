@@ -0,0 +1,142 @@
+import pytest
+
+from algoritmo import Difficulty, GameLogic
+from corpus import CORPUS, PHASES, VARIANT_CORPUS
+from pesos import DEFAULT_WEIGHTS
+from tablas import BOARD_VARIANTS, SPECIAL_ZONES
+
+# Sin libro de aperturas, caché ni pesos.json del árbol de trabajo: los números
+# no dependen de archivos locales y cada jugada se busca de verdad
+REPRODUCIBLE = {"opening_book": None, "position_cache": None, "weights": DEFAULT_WEIGHTS}
+
+
+def _fresh_engines(difficulty, positions):
+    """Un GameLogic nuevo por posición, para que la tabla no arrastre otras rondas"""
+    engines = []
+    for position in positions:
+        logic = GameLogic(difficulty, SPECIAL_ZONES, **REPRODUCIBLE)
+        logic.set_initial_zone(position.start_green, SPECIAL_ZONES)
+        engines.append(logic)
+    return engines
+
+
+@pytest.mark.parametrize("phase", PHASES)
+@pytest.mark.parametrize("difficulty", list(Difficulty), ids=lambda difficulty: difficulty.name)
+def bench_get_ai_move(benchmark, difficulty, phase):
+    positions = CORPUS[phase]
+
+    def setup():
+        return (_fresh_engines(difficulty, positions),), {}
+
+    def search_all(engines):
+        for logic, position in zip(engines, positions):
+            logic.get_ai_move_from_state(position.state, position.move_history)
+
+    benchmark.pedantic(search_all, setup=setup, rounds=5)
+
+
+@pytest.mark.parametrize("phase", PHASES)
+def bench_move_generation(benchmark, phase):
+    states = [position.state for position in CORPUS[phase]]
+
+    def generate_all():
+        count = 0
+        for state in states:
+            for green in (True, False):
+                for move in state.legal_moves(green):
+                    previous = state.make_move(green, move)
+                    count += len(state.legal_moves(not green))
+                    state.unmake_move(green, move, previous)
+        return count
+
+    benchmark(generate_all)
+
+
+@pytest.mark.parametrize("phase", PHASES)
+def bench_evaluate_position(benchmark, phase):
+    evaluators = []
+    for position in CORPUS[phase]:
+        logic = _fresh_engines(Difficulty.EXPERT, [position])[0]
+        evaluators.append(logic.make_evaluator(position.state, position.move_history))
+
+    def evaluate_all():
+        total = 0.0
+        for _ in range(100):
+            for evaluate in evaluators:
+                total += evaluate()
+        return total
+
+    benchmark(evaluate_all)
+
+
+@pytest.mark.parametrize("phase", PHASES)
+def bench_evaluate_batch(benchmark, phase):
+    """Las mismas evaluaciones que bench_evaluate_position, en un solo lote con NumPy"""
+    pytest.importorskip("numpy")
+    positions = CORPUS[phase]
+    logic = _fresh_engines(Difficulty.EXPERT, positions[:1])[0]
+    evaluator = logic.make_batch_evaluator(positions[0].move_history)
+    states = [position.state for position in positions] * 100
+
+    benchmark(evaluator.evaluate_states, states)
+
+
+SEARCH_MODES = {
+    "alphabeta": {"pvs": False, "aspiration": False},
+    "pvs": {"pvs": True, "aspiration": False},
+    "aspiration": {"pvs": False, "aspiration": True},
+    "pvs-aspiration": {"pvs": True, "aspiration": True},
+}
+
+
+@pytest.mark.parametrize("mode", SEARCH_MODES)
+@pytest.mark.parametrize("difficulty", [Difficulty.AMATEUR, Difficulty.EXPERT],
+                         ids=lambda difficulty: difficulty.name)
+def bench_search_mode(benchmark, difficulty, mode):
+    """Nodos por modo a igual profundidad (en ``extra_info``).
+
+    Cada posición se busca dos veces vaciando la tabla entre ambas, para que la
+    ventana de aspiración tenga el puntaje de un turno anterior.
+    """
+    positions = CORPUS["midgame"]
+
+    def setup():
+        engines = _fresh_engines(difficulty, positions)
+        for logic in engines:
+            logic.pvs = SEARCH_MODES[mode]["pvs"]
+            logic.aspiration = SEARCH_MODES[mode]["aspiration"]
+            logic.enable_stats()
+        return (engines,), {}
+
+    def search_all(engines):
+        nodes = 0
+        for logic, position in zip(engines, positions):
+            for _ in range(2):
+                logic.transposition_table.clear()
+                logic.get_ai_move_from_state(position.state, position.move_history,
+                                             max_depth=difficulty.value)
+                nodes += logic.last_stats.nodes
+        benchmark.extra_info["nodes"] = nodes
+
+    benchmark.pedantic(search_all, setup=setup, rounds=5)
+
+
+@pytest.mark.parametrize("variant", BOARD_VARIANTS)
+def bench_board_variant(benchmark, variant):
+    """Búsqueda AMATEUR en el medio juego de cada variante de tablero"""
+    board = BOARD_VARIANTS[variant]
+    positions = VARIANT_CORPUS[variant]
+
+    def setup():
+        engines = []
+        for position in positions:
+            logic = GameLogic(Difficulty.AMATEUR, board=board, **REPRODUCIBLE)
+            logic.set_initial_zone(position.start_green, logic.special_zones)
+            engines.append(logic)
+        return (engines,), {}
+
+    def search_all(engines):
+        for logic, position in zip(engines, positions):
+            logic.get_ai_move_from_state(position.state, position.move_history)
+
+    benchmark.pedantic(search_all, setup=setup, rounds=5)
@@ -0,0 +1,71 @@
+import random
+from typing import Dict, List, NamedTuple, Tuple
+
+from algoritmo import Player
+from bitboard import BitboardState
+from reglas import HeadlessGame
+from tablas import BOARD_VARIANTS, DEFAULT_BOARD, BoardConfig, board_tables
+
+# Corpus fijo de posiciones para los benchmarks: mismas semillas, mismas posiciones
+PHASES = ("opening", "midgame", "endgame")
+POSITIONS_PER_PHASE = 8
+MIDGAME_PLIES = 12
+
+
+class BenchPosition(NamedTuple):
+    name: str
+    start_green: Tuple[int, int]  # Para fijar la zona inicial de la IA
+    state: BitboardState          # VERDE al turno
+    move_history: List[Tuple[int, int]]
+
+
+def opening(seed: int, board: BoardConfig = DEFAULT_BOARD) -> HeadlessGame:
+    """Igual que YoshisZonesGame._place_yoshis_randomly con random.seed(seed)"""
+    tables = board_tables(board)
+    available = [tables.to_pos(square) for square in tables.start_squares()]
+    green_pos, red_pos = random.Random(seed).sample(available, 2)
+    return HeadlessGame(green_pos, red_pos, board=board)
+
+
+def _play_random(game: HeadlessGame, rng: random.Random, stop) -> bool:
+    """Juega movimientos aleatorios hasta que ``stop(game)`` se cumpla con VERDE al turno"""
+    while not game.game_over:
+        if game.current_player == Player.GREEN and stop(game):
+            return True
+        game.make_move(rng.choice(game.legal_moves()))
+    return False
+
+
+def _unpainted_zone_cells(game: HeadlessGame) -> int:
+    return (game.state.zones_mask & ~game.state.painted).bit_count()
+
+
+def _build_phase(phase: str, board: BoardConfig = DEFAULT_BOARD) -> List[BenchPosition]:
+    positions = []
+    seed = 0
+    while len(positions) < POSITIONS_PER_PHASE:
+        game = opening(seed, board)
+        rng = random.Random(1000 + seed)
+        if phase == "opening":
+            reached = True
+        elif phase == "midgame":
+            reached = _play_random(game, rng, lambda g: g.plies >= MIDGAME_PLIES)
+        else:
+            reached = _play_random(game, rng, lambda g: _unpainted_zone_cells(g) <= 8)
+        if reached:
+            positions.append(BenchPosition(
+                f"{phase}-{seed}", game.start_positions[0],
+                game.perspective_state(Player.GREEN), list(game.move_history)
+            ))
+        seed += 1
+    return positions
+
+
+def build_corpus() -> Dict[str, List[BenchPosition]]:
+    return {phase: _build_phase(phase) for phase in PHASES}
+
+
+CORPUS = build_corpus()
+
+# Medio juego de cada variante de tablero, para comparar la velocidad de búsqueda
+VARIANT_CORPUS = {name: _build_phase("midgame", board) for name, board in BOARD_VARIANTS.items()}
@@ -0,0 +1,500 @@
+import random
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from tablas import DEFAULT_BOARD, BoardConfig, board_tables, build_square_zone, build_zone_masks, iter_bits
+
+
+def _build_zobrist_keys(count: int, rng: random.Random) -> List[int]:
+    return [rng.getrandbits(64) for _ in range(count)]
+
+
+class ZobristKeys(NamedTuple):
+    green: List[int]
+    red: List[int]
+    green_owned: List[int]
+    red_owned: List[int]
+    red_to_move: int
+    repetitive: List[int]     # Claves de contexto: casillas repetitivas del historial
+    initial_zone: List[int]   # y zona inicial experta
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(num_squares: int) -> ZobristKeys:
+    """Claves Zobrist de un tablero de ``num_squares`` casillas.
+
+    La semilla es constante para que los hashes sean reproducibles (el libro de
+    aperturas los guarda en disco).
+    """
+    rng = random.Random(0x59055)
+    green = _build_zobrist_keys(num_squares, rng)
+    red = _build_zobrist_keys(num_squares, rng)
+    green_owned = _build_zobrist_keys(num_squares, rng)
+    red_owned = _build_zobrist_keys(num_squares, rng)
+    red_to_move = rng.getrandbits(64)
+    repetitive = _build_zobrist_keys(num_squares, rng)
+    initial_zone = _build_zobrist_keys(num_squares, rng)
+    return ZobristKeys(green, red, green_owned, red_owned, red_to_move, repetitive, initial_zone)
+
+
+# Marca en el valor de ``make_move`` de que el movimiento capturó una zona
+CAPTURE_FLAG = 1 << 16
+
+
+def paint_square(
+    zone_masks: List[int],
+    zone_win_threshold: int,
+    painted: int,
+    green_owned: int,
+    red_owned: int,
+    green: bool,
+    square: int
+) -> Tuple[int, int, int]:
+    """Pinta una casilla de zona y captura la zona si llega al umbral.
+
+    Es la regla de ``BitboardState.make_move`` sobre (pintadas, de verde, de
+    rojo); la usa el resolvedor del final, que trabaja con esas máscaras.
+    """
+    bit = 1 << square
+    painted |= bit
+    if green:
+        green_owned |= bit
+    else:
+        red_owned |= bit
+    for mask in zone_masks:
+        if mask & bit:
+            owned = green_owned if green else red_owned
+            if (owned & mask).bit_count() >= zone_win_threshold:
+                painted |= mask
+                if green:
+                    green_owned |= mask
+                    red_owned &= ~mask
+                else:
+                    red_owned |= mask
+                    green_owned &= ~mask
+            break
+    return painted, green_owned, red_owned
+
+
+class BitboardState:
+    """Estado del juego en enteros de 64 bits con movimientos hacer/deshacer.
+
+    La búsqueda modifica un único objeto en lugar de copiar conjuntos y
+    diccionarios en cada nodo: ``make_move`` devuelve la casilla anterior y
+    ``unmake_move`` la usa para restaurar el estado exacto.
+
+    Aquí están las reglas del juego, las mismas para la interfaz (a través de
+    reglas.HeadlessGame) y para la búsqueda: al llegar al umbral de casillas en
+    una zona se captura entera (queda pintada, así que ya no se puede entrar), y
+    la partida termina sin casillas de zona libres o si el jugador al turno no
+    puede moverse (ver ``is_game_over`` y ``outcome``).
+    """
+
+    __slots__ = ("board", "zone_masks", "zones_mask", "square_zone", "green_sq", "red_sq",
+                 "painted", "green_owned", "red_owned", "hash",
+                 "green_counts", "red_counts", "knight_targets", "knight_attacks",
+                 "zobrist_green", "zobrist_red", "zobrist_green_owned", "zobrist_red_owned",
+                 "zone_win_threshold", "captures")
+
+    def __init__(self, zone_masks: List[int], green_sq: int, red_sq: int,
+                 painted: int = 0, green_owned: int = 0, red_owned: int = 0,
+                 board: BoardConfig = DEFAULT_BOARD):
+        # Tablas de la configuración (compartidas, en caché) guardadas en el estado
+        tables = board_tables(board)
+        keys = zobrist_keys(tables.num_squares)
+        self.board = board
+        self.knight_targets = tables.knight_targets
+        self.knight_attacks = tables.knight_attacks
+        self.zobrist_green = keys.green
+        self.zobrist_red = keys.red
+        self.zobrist_green_owned = keys.green_owned
+        self.zobrist_red_owned = keys.red_owned
+        self.zone_win_threshold = board.zone_win_threshold
+
+        self.zone_masks = zone_masks
+        self.zones_mask = 0
+        for mask in zone_masks:
+            self.zones_mask |= mask
+        self.square_zone = build_square_zone(zone_masks, tables.num_squares)
+        self.green_sq = green_sq
+        self.red_sq = red_sq
+        self.painted = painted
+        self.green_owned = green_owned
+        self.red_owned = red_owned
+        self.hash = self.compute_hash()
+
+        # Casillas por zona de cada jugador, mantenidas al hacer/deshacer
+        self.green_counts = [(green_owned & mask).bit_count() for mask in zone_masks]
+        self.red_counts = [(red_owned & mask).bit_count() for mask in zone_masks]
+
+        # Capturas pendientes de deshacer: (casillas ganadas, casillas perdidas por el rival)
+        self.captures: List[Tuple[int, int]] = []
+
+    def compute_hash(self) -> int:
+        """Calcula desde cero el hash Zobrist (la búsqueda lo mantiene incrementalmente)"""
+        key = self.zobrist_green[self.green_sq] ^ self.zobrist_red[self.red_sq]
+        for square in iter_bits(self.green_owned):
+            key ^= self.zobrist_green_owned[square]
+        for square in iter_bits(self.red_owned):
+            key ^= self.zobrist_red_owned[square]
+        return key
+
+    @classmethod
+    def from_game(
+        cls,
+        special_zones: List[List[Tuple[int, int]]],
+        green_pos: Tuple[int, int],
+        red_pos: Tuple[int, int],
+        painted_cells: Set[Tuple[int, int]],
+        cell_owner: Dict[Tuple[int, int], "Player"],
+        zone_masks: Optional[List[int]] = None,
+        board: BoardConfig = DEFAULT_BOARD
+    ) -> "BitboardState":
+        """Construye el estado a partir de la representación con conjuntos y diccionarios"""
+        from algoritmo import Player
+
+        to_square = board_tables(board).to_square
+        if zone_masks is None:
+            zone_masks = build_zone_masks(special_zones, board.size)
+        painted = 0
+        for cell in painted_cells:
+            painted |= 1 << to_square(cell)
+        green_owned = 0
+        red_owned = 0
+        for cell, owner in cell_owner.items():
+            if owner == Player.GREEN:
+                green_owned |= 1 << to_square(cell)
+            elif owner == Player.RED:
+                red_owned |= 1 << to_square(cell)
+        return cls(zone_masks, to_square(green_pos), to_square(red_pos),
+                   painted, green_owned, red_owned, board)
+
+    def copy(self) -> "BitboardState":
+        return BitboardState(self.zone_masks, self.green_sq, self.red_sq,
+                             self.painted, self.green_owned, self.red_owned, self.board)
+
+    def restore(self, other: "BitboardState"):
+        """Copia en este objeto el contenido de otro estado (p. ej. tras abortar una búsqueda)"""
+        self.green_sq = other.green_sq
+        self.red_sq = other.red_sq
+        self.painted = other.painted
+        self.green_owned = other.green_owned
+        self.red_owned = other.red_owned
+        self.hash = other.hash
+        self.green_counts = list(other.green_counts)
+        self.red_counts = list(other.red_counts)
+        self.captures = list(other.captures)
+
+    def legal_moves(self, green: bool) -> List[int]:
+        """Destinos válidos del Yoshi indicado, en el orden de KNIGHT_OFFSETS"""
+        if green:
+            origin, blocked = self.green_sq, self.painted | (1 << self.red_sq)
+        else:
+            origin, blocked = self.red_sq, self.painted | (1 << self.green_sq)
+        return [target for target in self.knight_targets[origin] if not (blocked >> target) & 1]
+
+    def legal_moves_mask(self, green: bool) -> int:
+        """Máscara de destinos válidos del Yoshi indicado"""
+        if green:
+            return self.knight_attacks[self.green_sq] & ~(self.painted | (1 << self.red_sq))
+        return self.knight_attacks[self.red_sq] & ~(self.painted | (1 << self.green_sq))
+
+    def make_move(self, green: bool, square: int) -> int:
+        """Mueve un Yoshi, pinta la casilla si es de zona y captura la zona si llega al umbral.
+
+        Devuelve la casilla anterior (con CAPTURE_FLAG si hubo captura), que es
+        lo que necesita ``unmake_move``.
+        """
+        bit = 1 << square
+        if green:
+            previous = self.green_sq
+            self.green_sq = square
+            self.hash ^= self.zobrist_green[previous] ^ self.zobrist_green[square]
+            if self.zones_mask & bit:
+                self.painted |= bit
+                self.green_owned |= bit
+                self.hash ^= self.zobrist_green_owned[square]
+                zone = self.square_zone[square]
+                self.green_counts[zone] += 1
+                if self.green_counts[zone] >= self.zone_win_threshold:
+                    self._capture(zone, True)
+                    previous |= CAPTURE_FLAG
+        else:
+            previous = self.red_sq
+            self.red_sq = square
+            self.hash ^= self.zobrist_red[previous] ^ self.zobrist_red[square]
+            if self.zones_mask & bit:
+                self.painted |= bit
+                self.red_owned |= bit
+                self.hash ^= self.zobrist_red_owned[square]
+                zone = self.square_zone[square]
+                self.red_counts[zone] += 1
+                if self.red_counts[zone] >= self.zone_win_threshold:
+                    self._capture(zone, False)
+                    previous |= CAPTURE_FLAG
+        return previous
+
+    def unmake_move(self, green: bool, square: int, previous: int):
+        """Deshace ``make_move`` (la casilla destino nunca estaba pintada antes)"""
+        bit = 1 << square
+        if previous & CAPTURE_FLAG:
+            self._uncapture(self.square_zone[square], green)
+            previous ^= CAPTURE_FLAG
+        if self.zones_mask & bit:
+            self.painted &= ~bit
+            if green:
+                self.green_owned &= ~bit
+                self.hash ^= self.zobrist_green_owned[square]
+                self.green_counts[self.square_zone[square]] -= 1
+            else:
+                self.red_owned &= ~bit
+                self.hash ^= self.zobrist_red_owned[square]
+                self.red_counts[self.square_zone[square]] -= 1
+        if green:
+            self.green_sq = previous
+            self.hash ^= self.zobrist_green[square] ^ self.zobrist_green[previous]
+        else:
+            self.red_sq = previous
+            self.hash ^= self.zobrist_red[square] ^ self.zobrist_red[previous]
+
+    def _capture(self, zone_index: int, green: bool):
+        """Pinta la zona entera a favor de ``green`` y guarda lo necesario para deshacerlo"""
+        mask = self.zone_masks[zone_index]
+        if green:
+            gained = mask & ~self.green_owned
+            lost = mask & self.red_owned
+            self.green_owned |= mask
+            self.red_owned &= ~mask
+            own_keys, other_keys = self.zobrist_green_owned, self.zobrist_red_owned
+            self.green_counts[zone_index], self.red_counts[zone_index] = mask.bit_count(), 0
+        else:
+            gained = mask & ~self.red_owned
+            lost = mask & self.green_owned
+            self.red_owned |= mask
+            self.green_owned &= ~mask
+            own_keys, other_keys = self.zobrist_red_owned, self.zobrist_green_owned
+            self.red_counts[zone_index], self.green_counts[zone_index] = mask.bit_count(), 0
+        self.painted |= mask
+        for square in iter_bits(gained):
+            self.hash ^= own_keys[square]
+        for square in iter_bits(lost):
+            self.hash ^= other_keys[square]
+        self.captures.append((gained, lost))
+
+    def _uncapture(self, zone_index: int, green: bool):
+        """Deshace la última captura (hecha por ``green`` en ``zone_index``)"""
+        gained, lost = self.captures.pop()
+        mask = self.zone_masks[zone_index]
+        if green:
+            self.green_owned &= ~gained
+            self.red_owned |= lost
+            own_keys, other_keys = self.zobrist_green_owned, self.zobrist_red_owned
+            self.green_counts[zone_index] = (self.green_owned & mask).bit_count()
+            self.red_counts[zone_index] = lost.bit_count()
+        else:
+            self.red_owned &= ~gained
+            self.green_owned |= lost
+            own_keys, other_keys = self.zobrist_red_owned, self.zobrist_green_owned
+            self.red_counts[zone_index] = (self.red_owned & mask).bit_count()
+            self.green_counts[zone_index] = lost.bit_count()
+        self.painted &= ~(gained & ~lost)
+        for square in iter_bits(gained):
+            self.hash ^= own_keys[square]
+        for square in iter_bits(lost):
+            self.hash ^= other_keys[square]
+
+    def free_zone_cells(self) -> int:
+        """Casillas de zona que todavía se pueden pintar"""
+        return (self.zones_mask & ~self.painted).bit_count()
+
+    def is_game_over(self, green: bool) -> bool:
+        """La partida terminó: no quedan casillas de zona libres o ``green`` no puede moverse.
+
+        Las zonas capturadas quedan pintadas, así que con todas las zonas
+        ganadas tampoco quedan casillas libres.
+        """
+        return not self.zones_mask & ~self.painted or not self.legal_moves_mask(green)
+
+    def zone_winner(self, zone_index: int) -> Optional[bool]:
+        """True si la zona es de verde, False si es de rojo y None si no tiene ganador"""
+        if self.green_counts[zone_index] >= self.zone_win_threshold:
+            return True
+        if self.red_counts[zone_index] >= self.zone_win_threshold:
+            return False
+        return None
+
+    def zones_won(self) -> Tuple[int, int]:
+        """Zonas ganadas por verde y por rojo"""
+        threshold = self.zone_win_threshold
+        green_won = sum(1 for count in self.green_counts if count >= threshold)
+        red_won = sum(1 for count in self.red_counts if count >= threshold)
+        return green_won, red_won
+
+    def outcome(self) -> int:
+        """Resultado por zonas ganadas desde VERDE: 1 gana, 0 empata, -1 pierde"""
+        green_won, red_won = self.zones_won()
+        return (green_won > red_won) - (red_won > green_won)
+
+
+# Jugadas recientes que guarda GameSnapshot: las que decide la penalización por repetición
+SNAPSHOT_RECENT_MOVES = 4
+
+# Primer byte de GameSnapshot.to_bytes: VERDE al turno y cantidad de jugadas recientes
+_SNAPSHOT_GREEN_TO_MOVE = 0x80
+
+
+class GameSnapshot:
+    """Posición inmutable y compacta: lo que la búsqueda necesita de una partida.
+
+    Guarda las casillas de los Yoshis, las casillas de cada jugador (las
+    pintadas son su unión), quién mueve y las últimas jugadas, que son las que
+    deciden la penalización por repetición. El hash Zobrist se calcula al
+    crearla y ``apply`` lo actualiza incrementalmente, así que compararlas o
+    usarlas como clave de diccionario es O(1); las tablas del tablero se
+    comparten entre todas las instantáneas del mismo tablero.
+
+    Al ser inmutable se puede pasar a otro hilo o proceso sin copiarla:
+    ``to_bytes`` la serializa en a lo sumo 23 bytes (8x8) y se envía así a los
+    procesos de trabajo.
+    """
+
+    __slots__ = ("board", "green_sq", "red_sq", "green_owned", "red_owned", "green_to_move", "recent", "hash")
+
+    def __init__(self, green_sq: int, red_sq: int, green_owned: int = 0, red_owned: int = 0,
+                 green_to_move: bool = True, recent: Tuple[int, ...] = (),
+                 board: BoardConfig = DEFAULT_BOARD, hash: Optional[int] = None):
+        if hash is None:
+            keys = zobrist_keys(board.num_squares)
+            hash = keys.green[green_sq] ^ keys.red[red_sq]
+            for square in iter_bits(green_owned):
+                hash ^= keys.green_owned[square]
+            for square in iter_bits(red_owned):
+                hash ^= keys.red_owned[square]
+            if not green_to_move:
+                hash ^= keys.red_to_move
+        setattr_ = object.__setattr__
+        setattr_(self, "board", board)
+        setattr_(self, "green_sq", green_sq)
+        setattr_(self, "red_sq", red_sq)
+        setattr_(self, "green_owned", green_owned)
+        setattr_(self, "red_owned", red_owned)
+        setattr_(self, "green_to_move", green_to_move)
+        setattr_(self, "recent", tuple(recent[-SNAPSHOT_RECENT_MOVES:]))
+        setattr_(self, "hash", hash)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("GameSnapshot es inmutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("GameSnapshot es inmutable")
+
+    def __hash__(self) -> int:
+        return self.hash ^ hash(self.recent)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, GameSnapshot):
+            return NotImplemented
+        return (self.hash == other.hash and self.green_sq == other.green_sq and self.red_sq == other.red_sq
+                and self.green_owned == other.green_owned and self.red_owned == other.red_owned
+                and self.green_to_move == other.green_to_move and self.recent == other.recent
+                and self.board == other.board)
+
+    def __repr__(self) -> str:
+        side = "VERDE" if self.green_to_move else "ROJO"
+        return f"GameSnapshot(verde={self.green_sq}, rojo={self.red_sq}, turno={side}, hash={self.hash:#018x})"
+
+    def __reduce__(self):
+        # Para pickle (procesos de trabajo) se usa la forma compacta
+        return GameSnapshot.from_bytes, (self.to_bytes(), self.board)
+
+    @property
+    def painted(self) -> int:
+        return self.green_owned | self.red_owned
+
+    @classmethod
+    def from_state(cls, state: BitboardState, green_to_move: bool = True,
+                   move_history: Optional[List[Tuple[int, int]]] = None) -> "GameSnapshot":
+        """Instantánea de ``state`` (reutiliza su hash) con las últimas jugadas de ``move_history``"""
+        to_square = board_tables(state.board).to_square
+        recent = tuple(to_square(pos) for pos in (move_history or [])[-SNAPSHOT_RECENT_MOVES:])
+        key = state.hash if green_to_move else state.hash ^ zobrist_keys(state.board.num_squares).red_to_move
+        return cls(state.green_sq, state.red_sq, state.green_owned, state.red_owned,
+                   green_to_move, recent, state.board, key)
+
+    def to_state(self) -> BitboardState:
+        """Estado mutable para la búsqueda (el turno no forma parte de BitboardState)"""
+        return BitboardState(board_tables(self.board).zone_masks, self.green_sq, self.red_sq,
+                             self.painted, self.green_owned, self.red_owned, self.board)
+
+    def move_history(self) -> List[Tuple[int, int]]:
+        """Últimas jugadas como posiciones, en el formato que recibe GameLogic"""
+        to_pos = board_tables(self.board).to_pos
+        return [to_pos(square) for square in self.recent]
+
+    def legal_moves(self) -> List[int]:
+        """Destinos válidos del jugador al turno"""
+        tables = board_tables(self.board)
+        if self.green_to_move:
+            origin, other = self.green_sq, self.red_sq
+        else:
+            origin, other = self.red_sq, self.green_sq
+        blocked = self.green_owned | self.red_owned | (1 << other)
+        return [target for target in tables.knight_targets[origin] if not (blocked >> target) & 1]
+
+    def apply(self, square: int) -> "GameSnapshot":
+        """Nueva instantánea tras mover el jugador al turno a ``square`` (misma regla que make_move)"""
+        board = self.board
+        green = self.green_to_move
+        keys = zobrist_keys(board.num_squares)
+        key = self.hash ^ keys.red_to_move
+        green_sq, red_sq = self.green_sq, self.red_sq
+        if green:
+            key ^= keys.green[green_sq] ^ keys.green[square]
+            green_sq = square
+        else:
+            key ^= keys.red[red_sq] ^ keys.red[square]
+            red_sq = square
+
+        green_owned, red_owned = self.green_owned, self.red_owned
+        tables = board_tables(board)
+        if tables.square_zone[square] >= 0:
+            _, new_green, new_red = paint_square(tables.zone_masks, board.zone_win_threshold,
+                                                 green_owned | red_owned, green_owned, red_owned, green, square)
+            for changed in iter_bits(new_green ^ green_owned):
+                key ^= keys.green_owned[changed]
+            for changed in iter_bits(new_red ^ red_owned):
+                key ^= keys.red_owned[changed]
+            green_owned, red_owned = new_green, new_red
+
+        return GameSnapshot(green_sq, red_sq, green_owned, red_owned, not green,
+                            self.recent + (square,), board, key)
+
+    def swapped(self) -> "GameSnapshot":
+        """La misma posición con los papeles de los Yoshis intercambiados (para motores con ROJO)"""
+        return GameSnapshot(self.red_sq, self.green_sq, self.red_owned, self.green_owned,
+                            not self.green_to_move, self.recent, self.board)
+
+    def to_bytes(self) -> bytes:
+        """Forma compacta: turno, casillas, jugadas recientes y casillas de cada jugador.
+
+        El tablero no se guarda (lo conoce quien la lee) y las casillas
+        pintadas y el hash se reconstruyen al leerla.
+        """
+        mask_bytes = (self.board.num_squares + 7) // 8
+        flags = len(self.recent) | (_SNAPSHOT_GREEN_TO_MOVE if self.green_to_move else 0)
+        return (bytes((flags, self.green_sq, self.red_sq)) + bytes(self.recent)
+                + self.green_owned.to_bytes(mask_bytes, "little")
+                + self.red_owned.to_bytes(mask_bytes, "little"))
+
+    @classmethod
+    def from_bytes(cls, data: bytes, board: BoardConfig = DEFAULT_BOARD) -> "GameSnapshot":
+        flags = data[0]
+        recent_count = flags & ~_SNAPSHOT_GREEN_TO_MOVE
+        mask_bytes = (board.num_squares + 7) // 8
+        start = 3 + recent_count
+        if recent_count > SNAPSHOT_RECENT_MOVES or len(data) != start + 2 * mask_bytes:
+            raise ValueError("Instantánea con un tamaño que no corresponde al tablero")
+        return cls(data[1], data[2],
+                   int.from_bytes(data[start:start + mask_bytes], "little"),
+                   int.from_bytes(data[start + mask_bytes:], "little"),
+                   bool(flags & _SNAPSHOT_GREEN_TO_MOVE), tuple(data[3:start]), board)
@@ -0,0 +1,341 @@
+# Caché persistente de posiciones buscadas (clave -> profundidad, cota, puntaje y
+# mejor movimiento) compartida entre partidas y sesiones. Vive en un archivo
+# SQLite que se lee en segundo plano al crear el motor, que también prepara allí
+# las ranuras con las que se siembra su tabla de transposición; al terminar cada
+# búsqueda, las entradas profundas se escriben en segundo plano.
+import atexit
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Set, Tuple
+
+from pesos import DEFAULT_WEIGHTS, EvalWeights, weights_scope
+from tablas import BoardConfig
+from transposicion import TTEntry, TranspositionTable
+
+# Caché de la interfaz, junto a los módulos (como el libro de aperturas)
+POSITION_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache_posiciones.sqlite")
+
+# Cambia cuando cambian las reglas o la heurística: los puntajes guardados dejan de valer
+CACHE_VERSION = 2  # 2: captura de zonas y fin de partida en las reglas
+
+# Entradas conservadas (en memoria y en disco); al superarlas se descartan las
+# usadas hace más tiempo
+DEFAULT_MAX_ENTRIES = 100_000
+
+# Profundidad mínima para guardar una entrada: las poco profundas se recalculan
+# más rápido de lo que cuesta guardarlas
+MIN_STORE_DEPTH = 2
+
+CacheEntry = Tuple[int, int, float, Optional[int]]  # (profundidad, tipo de cota, puntaje, mejor movimiento)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS positions (
+    board INTEGER NOT NULL,
+    key INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    bound INTEGER NOT NULL,
+    score REAL NOT NULL,
+    best_move INTEGER,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (board, key)
+);
+CREATE INDEX IF NOT EXISTS positions_last_used ON positions (last_used);
+"""
+
+# Las entradas encontradas en una búsqueda sin volver a escribirse solo se marcan como recientes
+_TOUCH = "UPDATE positions SET last_used = ? WHERE board = ? AND key = ?"
+
+# Se conserva la entrada más profunda, pero cualquier uso la marca como reciente
+_UPSERT = """
+INSERT INTO positions (board, key, depth, bound, score, best_move, last_used)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (board, key) DO UPDATE SET
+    bound = CASE WHEN excluded.depth >= depth THEN excluded.bound ELSE bound END,
+    score = CASE WHEN excluded.depth >= depth THEN excluded.score ELSE score END,
+    best_move = CASE WHEN excluded.depth >= depth THEN excluded.best_move ELSE best_move END,
+    depth = MAX(depth, excluded.depth),
+    last_used = excluded.last_used
+"""
+
+
+def board_scope(board: BoardConfig, weights: EvalWeights = DEFAULT_WEIGHTS) -> int:
+    """Identificador estable de un tablero y unos pesos de la heurística: un mismo
+    archivo sirve para varias variantes y los puntajes de otros pesos no se mezclan"""
+    return zlib.crc32(repr(tuple(board)).encode()) ^ weights_scope(weights)
+
+
+def _to_signed(key: int) -> int:
+    """SQLite guarda enteros de 64 bits con signo; las claves Zobrist no lo tienen"""
+    return key - (1 << 64) if key >= 1 << 63 else key
+
+
+def _to_unsigned(key: int) -> int:
+    return key & ((1 << 64) - 1)
+
+
+class PositionCache:
+    """Posiciones buscadas de un tablero, en memoria con descarte LRU y en disco.
+
+    El archivo se abre y se lee en un hilo aparte (``load``), así que crear el
+    motor no espera al disco; mientras tanto las búsquedas simplemente empiezan
+    en frío. Las claves son las de la tabla de transposición (estado más clave
+    de contexto), que no dependen del proceso, y los puntajes son exactos solo
+    con la misma heurística: ``CACHE_VERSION`` invalida el archivo si cambia su
+    código y cada juego de pesos tiene su propio ámbito dentro del archivo.
+    Un archivo dañado o inaccesible no detiene el juego: la caché sigue en
+    memoria y ``error`` guarda el motivo.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        board: BoardConfig,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        min_depth: int = MIN_STORE_DEPTH,
+        weights: EvalWeights = DEFAULT_WEIGHTS
+    ):
+        self.path = path
+        self.scope = board_scope(board, weights)
+        self.max_entries = max_entries
+        self.min_depth = min_depth
+        self.error: Optional[Exception] = None
+
+        self._entries: "OrderedDict[int, CacheEntry]" = OrderedDict()
+        self._pending: Dict[int, CacheEntry] = {}
+        self._touched: Set[int] = set()
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._load_started = False
+        self._flush_scheduled = False
+
+        # Un solo hilo para todo el acceso a SQLite, así que la conexión nunca se usa a la vez
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="position-cache")
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded.is_set()
+
+    def load(self):
+        """Empieza a leer el archivo en segundo plano (solo la primera vez)"""
+        if not self._load_started:
+            self._load_started = True
+            self._executor.submit(self._load)
+
+    def wait_loaded(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que termine la lectura y las siembras ya pedidas (para herramientas
+        y pruebas; el motor no espera)"""
+        self.load()
+        if self._executor is not None:
+            wait([self._executor.submit(lambda: None)], timeout)
+        return self._loaded.is_set()
+
+    def prepare_seed(self, table_size: int) -> "Future[List[Optional[TTEntry]]]":
+        """Ranuras de una tabla de ``table_size`` entradas con lo guardado (ver ``TranspositionTable.adopt``).
+
+        Se construyen en el hilo de la caché después de leer el archivo, así
+        que sembrar no cuesta tiempo a ninguna búsqueda. Las entradas quedan
+        como de una búsqueda anterior y se reemplazan si hace falta sitio; en
+        una colisión gana la más profunda.
+        """
+        if self._executor is None:
+            # Caché ya cerrada: nada que sembrar
+            future: "Future[List[Optional[TTEntry]]]" = Future()
+            future.set_result([None] * table_size)
+            return future
+        self.load()
+        return self._executor.submit(self._build_seed, table_size)
+
+    def record(self, table: TranspositionTable):
+        """Guarda las entradas profundas escritas en la última búsqueda de ``table``
+        (que debe anotarlas, ver ``track_changes``), marca como recientes las
+        encontradas y programa la escritura"""
+        generation = table.generation
+        min_depth = self.min_depth
+        slots = table.slots
+        fresh = {}
+        for index in table.written:
+            entry = slots[index]
+            if entry is not None and entry[5] == generation and entry[1] >= min_depth:
+                fresh[entry[0]] = entry
+        hit_keys = [key for key in table.hit_keys if key not in fresh]
+        if not fresh and not hit_keys:
+            return
+        with self._lock:
+            entries = self._entries
+            for key, depth, bound, score, best_move, _ in fresh.values():
+                previous = entries.pop(key, None)
+                if previous is not None and previous[0] > depth:
+                    value = previous
+                else:
+                    value = (depth, bound, score, best_move)
+                entries[key] = value
+                self._pending[key] = value
+            for key in hit_keys:
+                if key in entries:
+                    entries.move_to_end(key)
+                    self._touched.add(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+            schedule = not self._flush_scheduled
+            self._flush_scheduled = True
+        if schedule and self._executor is not None:
+            self._executor.submit(self._flush)
+
+    def flush(self):
+        """Escribe en disco lo pendiente y espera a que termine"""
+        if self._executor is not None:
+            self._executor.submit(self._flush).result()
+
+    def close(self):
+        """Escribe lo pendiente y cierra el archivo"""
+        if self._executor is None:
+            return
+        try:
+            self._executor.submit(self._flush)
+            self._executor.submit(self._close)
+        except RuntimeError:
+            # Al salir, concurrent.futures cierra sus hilos antes que atexit: se
+            # escribe desde este hilo (el de SQLite ya terminó)
+            self._flush()
+            self._close()
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    # Lo que sigue corre en el hilo de SQLite
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != CACHE_VERSION:
+                # Archivo nuevo o de otra versión de la heurística: se empieza de cero
+                connection.execute("DROP TABLE IF EXISTS positions")
+                connection.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+            # WAL permite que varios procesos del torneo lean mientras otro escribe
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.executescript(_SCHEMA)
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def _disable(self, error: Exception):
+        self.error = error
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _load(self):
+        try:
+            if self.error is None:
+                rows = self._connect().execute(
+                    "SELECT key, depth, bound, score, best_move FROM positions "
+                    "WHERE board = ? ORDER BY last_used DESC LIMIT ?",
+                    (self.scope, self.max_entries)
+                ).fetchall()
+            else:
+                rows = []
+        except sqlite3.Error as error:
+            self._disable(error)
+            rows = []
+        # Las más recientes quedan al final (el lado que no se descarta); lo
+        # registrado mientras se leía es aún más reciente
+        loaded: "OrderedDict[int, CacheEntry]" = OrderedDict(
+            (_to_unsigned(key), (depth, bound, score, best_move))
+            for key, depth, bound, score, best_move in reversed(rows)
+        )
+        with self._lock:
+            for key, value in self._entries.items():
+                loaded.pop(key, None)
+                loaded[key] = value
+            while len(loaded) > self.max_entries:
+                loaded.popitem(last=False)
+            self._entries = loaded
+        self._loaded.set()
+
+    def _build_seed(self, table_size: int) -> List[Optional[TTEntry]]:
+        # Corre después de ``_load`` (mismo hilo, encolado antes)
+        with self._lock:
+            entries = list(self._entries.items())
+        mask = table_size - 1
+        slots: List[Optional[TTEntry]] = [None] * table_size
+        for key, (depth, bound, score, best_move) in entries:
+            index = key & mask
+            entry = slots[index]
+            if entry is None or entry[1] <= depth:
+                slots[index] = (key, depth, bound, score, best_move, 0)
+        return slots
+
+    def _flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            touched, self._touched = self._touched - pending.keys(), set()
+            self._flush_scheduled = False
+        if not (pending or touched) or self.error is not None:
+            return
+        now = time.time()
+        scope = self.scope
+        rows: List[tuple] = [
+            (scope, _to_signed(key), depth, bound, score, best_move, now)
+            for key, (depth, bound, score, best_move) in pending.items()
+        ]
+        try:
+            connection = self._connect()
+            with connection:
+                connection.executemany(_UPSERT, rows)
+                connection.executemany(_TOUCH, [(now, scope, _to_signed(key)) for key in touched])
+                # Tope de tamaño del archivo: fuera las entradas usadas hace más tiempo
+                count = connection.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+                if count > self.max_entries:
+                    connection.execute(
+                        "DELETE FROM positions WHERE rowid IN "
+                        "(SELECT rowid FROM positions ORDER BY last_used LIMIT ?)",
+                        (count - self.max_entries,)
+                    )
+        except sqlite3.Error as error:
+            self._disable(error)
+
+    def _close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+# Una caché por (archivo, tablero y pesos) y proceso: los motores de un torneo la comparten
+_open_caches: Dict[Tuple[str, int], PositionCache] = {}
+_open_caches_lock = threading.Lock()
+
+
+def open_position_cache(
+    path: str,
+    board: BoardConfig,
+    weights: EvalWeights = DEFAULT_WEIGHTS,
+    max_entries: int = DEFAULT_MAX_ENTRIES
+) -> PositionCache:
+    """Caché compartida del proceso para ``path``, ``board`` y ``weights``; empieza a leerse en segundo plano"""
+    with _open_caches_lock:
+        key = (path, board_scope(board, weights))
+        cache = _open_caches.get(key)
+        if cache is None:
+            if not _open_caches:
+                atexit.register(close_position_caches)
+            cache = _open_caches[key] = PositionCache(path, board, max_entries, weights=weights)
+            cache.load()
+        return cache
+
+
+def close_position_caches():
+    """Escribe y cierra todas las cachés abiertas (se llama también al salir)"""
+    with _open_caches_lock:
+        caches = list(_open_caches.values())
+        _open_caches.clear()
+    for cache in caches:
+        cache.close()
@@ -0,0 +1,102 @@
+import json
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class SearchStats:
+    """Estadísticas de una llamada a get_ai_move.
+
+    Solo se crean cuando GameLogic tiene las estadísticas activadas; con ellas
+    desactivadas la búsqueda no toca ningún contador.
+    """
+
+    def __init__(self, difficulty: str, max_depth: int, time_budget_ms: Optional[int]):
+        self.difficulty = difficulty
+        self.max_depth = max_depth
+        self.time_budget_ms = time_budget_ms
+
+        self.nodes = 0               # Nodos interiores expandidos
+        self.leaf_evaluations = 0    # Llamadas a la heurística
+        self.moves_generated = 0     # Suma de movimientos legales de los nodos expandidos
+        self.cutoffs_per_ply: List[int] = []
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.pvs_researches = 0         # Ventanas nulas que fallaron alto y se repitieron
+        self.aspiration_researches = 0  # Raíces repetidas por salir de la ventana de aspiración
+        self.book_move = False                        # Movimiento tomado del libro de aperturas
+        self.pondered = False                         # Respuesta calculada durante el turno del rival
+        self.endgame_proven: Optional[bool] = None    # None si no se usó el resolvedor del final
+        self.endgame_outcome: Optional[int] = None    # 1, 0, -1 para la IA
+        self.endgame_distance: Optional[int] = None   # Plies hasta el final
+        self.depth_times_ms: List[Tuple[int, float]] = []  # (profundidad completada, ms)
+        self.principal_variation: List[Tuple[int, int]] = []
+        self.score: Optional[float] = None
+        self.move: Optional[Tuple[int, int]] = None
+        self.total_time_ms = 0.0
+
+    def record_cutoff(self, ply: int):
+        cutoffs = self.cutoffs_per_ply
+        while len(cutoffs) <= ply:
+            cutoffs.append(0)
+        cutoffs[ply] += 1
+
+    @property
+    def branching_factor(self) -> float:
+        """Promedio de movimientos legales por nodo expandido"""
+        return self.moves_generated / self.nodes if self.nodes else 0.0
+
+    @property
+    def completed_depth(self) -> int:
+        return self.depth_times_ms[-1][0] if self.depth_times_ms else 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "difficulty": self.difficulty,
+            "max_depth": self.max_depth,
+            "time_budget_ms": self.time_budget_ms,
+            "completed_depth": self.completed_depth,
+            "nodes": self.nodes,
+            "leaf_evaluations": self.leaf_evaluations,
+            "branching_factor": round(self.branching_factor, 3),
+            "cutoffs_per_ply": list(self.cutoffs_per_ply),
+            "tt_probes": self.tt_probes,
+            "tt_hits": self.tt_hits,
+            "pvs_researches": self.pvs_researches,
+            "aspiration_researches": self.aspiration_researches,
+            "book_move": self.book_move,
+            "pondered": self.pondered,
+            "endgame_proven": self.endgame_proven,
+            "endgame_outcome": self.endgame_outcome,
+            "endgame_distance": self.endgame_distance,
+            "depth_times_ms": [[depth, round(ms, 3)] for depth, ms in self.depth_times_ms],
+            "principal_variation": [list(pos) for pos in self.principal_variation],
+            "score": self.score,
+            "move": list(self.move) if self.move is not None else None,
+            "total_time_ms": round(self.total_time_ms, 3),
+        }
+
+    def to_json(self) -> str:
+        """Una línea JSON (formato JSON lines) con todas las estadísticas.
+
+        JSON no admite infinitos ni NaN (p. ej. el puntaje de una posición
+        perdida): se escriben como null.
+        """
+        return json.dumps(_finite(self.as_dict()), ensure_ascii=False, allow_nan=False)
+
+
+def _finite(value: Any) -> Any:
+    """``value`` con los flotantes no finitos (también dentro de listas y diccionarios) como None"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def export_json_lines(stats: List[SearchStats], path: str, append: bool = True):
+    """Escribe una línea JSON por búsqueda para graficar el costo por turno"""
+    with open(path, "a" if append else "w", encoding="utf-8") as log_file:
+        for entry in stats:
+            log_file.write(entry.to_json() + "\n")
@@ -0,0 +1,113 @@
+# Evaluación por lotes con NumPy de la heurística de GameLogic. NumPy es
+# opcional: sin él el motor sigue usando la evaluación escalar de make_evaluator.
+from typing import List, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from bitboard import BitboardState
+from pesos import DEFAULT_WEIGHTS, EvalWeights
+from tablas import BoardTables
+
+HAS_NUMPY = np is not None
+
+# Bits activos de cada byte, para contar bits en máscaras uint64 sin bitwise_count
+_BYTE_BITS = np.array([bin(value).count("1") for value in range(256)], dtype=np.int64) if HAS_NUMPY else None
+
+
+def _as_masks(values) -> "np.ndarray":
+    return np.ascontiguousarray(values, dtype=np.uint64)
+
+
+def _bit_count(masks: "np.ndarray") -> "np.ndarray":
+    """Bits activos de cada máscara de 64 bits"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(masks).astype(np.int64)
+    masks = np.ascontiguousarray(masks)
+    return _BYTE_BITS[masks.view(np.uint8).reshape(masks.shape + (8,))].sum(axis=-1)
+
+
+class BatchEvaluator:
+    """Heurística de GameLogic sobre un lote de posiciones en una sola pasada.
+
+    Cada posición se describe con la casilla de cada Yoshi y las máscaras de
+    casillas de cada jugador. Con pesos múltiplos de 0.5 (los de por defecto y
+    los que escribe ajuste.py) todos los términos lo son, así que en float64 el
+    resultado coincide exactamente con ``evaluate_position``. Se obtiene con
+    ``GameLogic.make_batch_evaluator``.
+    """
+
+    def __init__(self, tables: BoardTables, zone_terms: List[List[List[float]]], repetitive_mask: int,
+                 weights: EvalWeights = DEFAULT_WEIGHTS):
+        if not HAS_NUMPY:
+            raise ImportError("La evaluación por lotes necesita NumPy")
+        if tables.num_squares > 64:
+            raise ValueError("La evaluación por lotes usa máscaras uint64: tableros de hasta 8x8")
+        self.num_squares = tables.num_squares
+        self.zone_masks = _as_masks(tables.zone_masks)
+        self.zone_indices = np.arange(len(tables.zone_masks))
+        size = max(len(terms) for terms in zone_terms)
+        self.zone_terms = np.zeros((len(zone_terms), size, size))
+        for i, terms in enumerate(zone_terms):
+            for green_count, row in enumerate(terms):
+                self.zone_terms[i, green_count, :len(row)] = row
+        closer_green, closer_red = tables.proximity_masks
+        self.closer_green = _as_masks(closer_green)
+        self.closer_red = _as_masks(closer_red)
+        self.proximity_green = weights.proximity_green
+        self.proximity_red = weights.proximity_red
+        self.center_bonus = weights.centrality * np.array(tables.center_steps, dtype=np.float64)
+        self.repetition_penalty = np.array(
+            [weights.repetition * ((repetitive_mask >> square) & 1) for square in range(tables.num_squares)]
+        )
+
+    def evaluate(self, green_sq, red_sq, green_owned, red_owned, painted=None) -> "np.ndarray":
+        """Puntaje de cada posición del lote, desde VERDE.
+
+        Sin ``painted`` se toman como pintadas las casillas de ambos jugadores.
+        """
+        green_sq = np.asarray(green_sq, dtype=np.intp)
+        red_sq = np.asarray(red_sq, dtype=np.intp)
+        green_owned = _as_masks(green_owned)
+        red_owned = _as_masks(red_owned)
+        painted = green_owned | red_owned if painted is None else _as_masks(painted)
+
+        # 1. Control de zonas: conteos (posiciones x zonas) indexando la tabla de términos
+        green_counts = _bit_count(green_owned[:, None] & self.zone_masks)
+        red_counts = _bit_count(red_owned[:, None] & self.zone_masks)
+        score = self.zone_terms[self.zone_indices, green_counts, red_counts].sum(axis=1)
+
+        # 2. Proximidad a zonas no pintadas
+        index = green_sq * self.num_squares + red_sq
+        unpainted = ~painted
+        score += self.proximity_green * _bit_count(self.closer_green[index] & unpainted)
+        score -= self.proximity_red * _bit_count(self.closer_red[index] & unpainted)
+
+        # 3. Centralidad y 4. repetición
+        score += self.center_bonus[green_sq]
+        score -= self.repetition_penalty[green_sq]
+        return score
+
+    def evaluate_states(self, states: Sequence[BitboardState]) -> "np.ndarray":
+        """Puntaje de cada estado (p. ej. un lote de partidas de autojuego)"""
+        return self.evaluate(
+            [state.green_sq for state in states],
+            [state.red_sq for state in states],
+            [state.green_owned for state in states],
+            [state.red_owned for state in states],
+            [state.painted for state in states],
+        )
+
+    def evaluate_children(self, state: BitboardState, green: bool, moves: Sequence[int]) -> "np.ndarray":
+        """Puntaje de cada hijo de ``state`` al mover el Yoshi indicado a ``moves``"""
+        count = len(moves)
+        green_sq, red_sq = [state.green_sq] * count, [state.red_sq] * count
+        green_owned, red_owned, painted = [0] * count, [0] * count, [0] * count
+        for i, move in enumerate(moves):
+            previous = state.make_move(green, move)
+            green_sq[i], red_sq[i] = state.green_sq, state.red_sq
+            green_owned[i], red_owned[i], painted[i] = state.green_owned, state.red_owned, state.painted
+            state.unmake_move(green, move, previous)
+        return self.evaluate(green_sq, red_sq, green_owned, red_owned, painted)
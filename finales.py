@@ -0,0 +1,286 @@
+from array import array
+import heapq
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from bitboard import BitboardState, paint_square
+from tablas import DEFAULT_BOARD, BoardConfig, board_tables
+
+# Valores desde VERDE: ganar a distancia d (plies hasta el final) vale WIN - d,
+# perder -(WIN - d) y empatar 0, así que se prefiere ganar antes y perder después.
+# Una distancia de STALL o más significa que el resultado se obtiene sin que la
+# partida termine (conservando el marcador, ver EndgameSolver).
+WIN = 10000
+STALL = 1000
+
+Layer = Tuple[int, int, int]  # (pintadas, de verde, de rojo)
+
+
+class SolverLimit(Exception):
+    """Se agotó el tiempo del resolvedor o se canceló la búsqueda"""
+    pass
+
+
+class EndgameResult(NamedTuple):
+    """Resultado del resolvedor visto desde el jugador al turno"""
+    proven: bool
+    outcome: int                 # 1 victoria, 0 empate, -1 derrota (si proven)
+    distance: Optional[int]      # Plies hasta el final; None en empates o si no termina
+    move: Optional[int]          # Mejor movimiento (casilla)
+    layers: int                  # Capas resueltas en esta llamada
+    moves: Tuple[int, ...] = ()  # Todos los movimientos con el resultado óptimo
+
+
+def value_distance(value: int) -> int:
+    """Distancia codificada en un valor (0 para los empates)"""
+    return WIN - abs(value) if value else 0
+
+
+def _encode(outcome: int, distance: int) -> int:
+    return outcome * (WIN - min(distance, STALL))
+
+
+class EndgameSolver:
+    """Resolvedor exacto del final por análisis retrógrado.
+
+    Pintar casillas es irreversible, así que el juego se divide en capas: una
+    capa fija las casillas pintadas y de quién son, y dentro de ella solo
+    cambian las casillas de los dos Yoshis y el turno (2 * casillas² estados, 8192
+    en el tablero de 8x8: el índice es turno, casilla verde, casilla roja).
+    Mover a una casilla de zona libre sale a otra capa con una casilla más
+    pintada (y la zona entera si se captura), que se resuelve primero.
+
+    La partida termina cuando todas las zonas tienen ganador, cuando no quedan
+    casillas de zona libres o cuando el jugador al turno no puede moverse. Dentro
+    de una capa el marcador no cambia, así que jugar indefinidamente (repetir
+    posiciones) se puntúa con el marcador actual. Con eso cada capa se resuelve
+    con atractores: el conjunto de estados desde los que un jugador fuerza un
+    resultado, con la distancia que minimiza quien gana y maximiza quien pierde.
+
+    Las capas resueltas se memorizan por (pintadas, de verde, de rojo) y se
+    conservan entre llamadas: en los turnos siguientes el final ya está resuelto.
+    """
+
+    def __init__(
+        self,
+        zone_masks: List[int],
+        zone_win_threshold: int = 3,
+        max_layers: int = 512,
+        board: BoardConfig = DEFAULT_BOARD
+    ):
+        tables = board_tables(board)
+        self.num_squares = tables.num_squares
+        self.knight_targets = tables.knight_targets
+        self.red_to_move_offset = self.num_squares * self.num_squares
+        self.layer_states = 2 * self.red_to_move_offset
+        self.zone_masks = zone_masks
+        self.zones_mask = 0
+        for mask in zone_masks:
+            self.zones_mask |= mask
+        self.zone_win_threshold = zone_win_threshold
+        self.max_layers = max_layers
+        self.layers: Dict[Layer, array] = {}  # 32 KB por capa en el tablero de 8x8
+        self.deadline: Optional[float] = None
+        self.stop_event: Optional[threading.Event] = None
+        self.layers_solved = 0
+
+    def clear(self):
+        self.layers.clear()
+
+    def free_zone_cells(self, state: BitboardState) -> int:
+        """Casillas de zona que todavía se pueden pintar"""
+        return (self.zones_mask & ~state.painted).bit_count()
+
+    def solve(
+        self,
+        state: BitboardState,
+        green: bool = True,
+        root_moves: Optional[List[int]] = None,
+        deadline: Optional[float] = None,
+        stop_event: Optional[threading.Event] = None
+    ) -> EndgameResult:
+        """Resuelve ``state`` con ``green`` al turno; ``root_moves`` restringe la raíz.
+
+        Si se agota ``deadline`` o se activa ``stop_event`` devuelve un resultado
+        no probado y conserva las capas ya resueltas para la próxima llamada.
+        """
+        self.deadline = deadline
+        self.stop_event = stop_event
+        self.layers_solved = 0
+        layer = (state.painted, state.green_owned, state.red_owned)
+        moves = state.legal_moves(green) if root_moves is None else list(root_moves)
+        if not moves:
+            return EndgameResult(False, 0, None, None, 0)
+        try:
+            values = []
+            for move in moves:
+                child_layer, child_index = self._child(layer, green, state.green_sq, state.red_sq, move)
+                value = self._layer_values(child_layer)[child_index]
+                values.append(value if green else -value)  # Vistos desde el jugador al turno
+        except SolverLimit:
+            return EndgameResult(False, 0, None, None, self.layers_solved)
+
+        best_value = max(values)
+        best_move = moves[values.index(best_value)]
+        outcome = (best_value > 0) - (best_value < 0)
+        distance = value_distance(best_value)
+        if outcome == 0 or distance >= STALL:
+            distance = None
+        else:
+            distance += 1
+        optimal = tuple(move for move, value in zip(moves, values) if (value > 0) - (value < 0) == outcome)
+        return EndgameResult(True, outcome, distance, best_move, self.layers_solved, optimal)
+
+    def _capture(self, layer: Layer, green: bool, square: int) -> Layer:
+        """Capa resultante de pintar ``square`` (con la captura de zona si corresponde)"""
+        if not self.zones_mask & (1 << square):
+            return layer
+        return paint_square(self.zone_masks, self.zone_win_threshold, *layer, green, square)
+
+    def _child(self, layer: Layer, green: bool, green_sq: int, red_sq: int, move: int) -> Tuple[Layer, int]:
+        """Capa e índice del estado tras mover"""
+        child_layer = self._capture(layer, green, move)
+        if green:
+            return child_layer, self.red_to_move_offset + move * self.num_squares + red_sq
+        return child_layer, green_sq * self.num_squares + move
+
+    def _final_value(self, layer: Layer) -> int:
+        """Valor de terminar la partida con el marcador de la capa"""
+        _, green_owned, red_owned = layer
+        threshold = self.zone_win_threshold
+        green_won = sum(1 for mask in self.zone_masks if (green_owned & mask).bit_count() >= threshold)
+        red_won = sum(1 for mask in self.zone_masks if (red_owned & mask).bit_count() >= threshold)
+        return _encode((green_won > red_won) - (red_won > green_won), 0)
+
+    def _layer_values(self, layer: Layer) -> array:
+        """Valor (desde VERDE) de cada estado de la capa, resolviéndola si hace falta"""
+        values = self.layers.get(layer)
+        if values is not None:
+            return values
+
+        painted, green_owned, red_owned = layer
+        final_value = self._final_value(layer)
+        free_zone = self.zones_mask & ~painted
+        threshold = self.zone_win_threshold
+        zones_won = sum(
+            1 for mask in self.zone_masks
+            if (green_owned & mask).bit_count() >= threshold or (red_owned & mask).bit_count() >= threshold
+        )
+        if zones_won == len(self.zone_masks) or not free_zone:
+            values = array('i', [final_value]) * self.layer_states
+        else:
+            values = self._solve_layer(layer, final_value)
+
+        if len(self.layers) >= self.max_layers:
+            self.layers.clear()
+        self.layers[layer] = values
+        self.layers_solved += 1
+        return values
+
+    def _solve_layer(self, layer: Layer, final_value: int) -> array:
+        painted = layer[0]
+        free = ~painted
+        free_zone = self.zones_mask & free
+        zones_mask = self.zones_mask
+        num_squares = self.num_squares
+        knight_targets = self.knight_targets
+        red_to_move_offset = self.red_to_move_offset
+        layer_states = self.layer_states
+
+        # Movimientos dentro de la capa (grafo de estados) y salidas a otras capas
+        stays: List[List[int]] = [[] for _ in range(layer_states)]
+        exits: List[List[int]] = [[] for _ in range(layer_states)]
+        predecessors: List[List[int]] = [[] for _ in range(layer_states)]
+        valid = []
+        standing = [square for square in range(num_squares) if not (free_zone >> square) & 1]
+        for green_sq in standing:
+            for red_sq in standing:
+                if green_sq == red_sq:
+                    continue
+                for green in (True, False):
+                    if green:
+                        index = green_sq * num_squares + red_sq
+                        origin, other = green_sq, red_sq
+                    else:
+                        index = red_to_move_offset + green_sq * num_squares + red_sq
+                        origin, other = red_sq, green_sq
+                    valid.append(index)
+                    for target in knight_targets[origin]:
+                        if target == other or not (free >> target) & 1:
+                            continue
+                        if (zones_mask >> target) & 1:
+                            child_layer, child_index = self._child(layer, green, green_sq, red_sq, target)
+                            exits[index].append(self._layer_values(child_layer)[child_index])
+                        else:
+                            if green:
+                                child = red_to_move_offset + target * num_squares + red_sq
+                            else:
+                                child = green_sq * num_squares + target
+                            stays[index].append(child)
+                            predecessors[child].append(index)
+        if ((self.deadline is not None and time.perf_counter() >= self.deadline) or
+                (self.stop_event is not None and self.stop_event.is_set())):
+            raise SolverLimit()
+
+        def attractor(player_green: bool, goal: Callable[[int], bool]) -> List[Optional[int]]:
+            """Distancia con la que ``player_green`` fuerza un final en ``goal`` (None si no puede)"""
+            distance: List[Optional[int]] = [None] * layer_states
+            pending = [0] * layer_states
+            longest = [0] * layer_states
+            heap = []
+            for index in valid:
+                state_exits = exits[index]
+                if not stays[index] and not state_exits:
+                    if goal(final_value):
+                        heap.append((0, index))  # Sin movimientos: la partida termina
+                    continue
+                if (index < red_to_move_offset) == player_green:
+                    reachable = [value_distance(value) + 1 for value in state_exits if goal(value)]
+                    if reachable:
+                        heap.append((min(reachable), index))
+                elif all(goal(value) for value in state_exits):
+                    pending[index] = len(stays[index])
+                    longest[index] = max((value_distance(value) + 1 for value in state_exits), default=0)
+                    if not pending[index]:
+                        heap.append((longest[index], index))
+                else:
+                    pending[index] = -1  # El rival tiene una salida fuera de ``goal``
+            heapq.heapify(heap)
+            while heap:
+                steps, index = heapq.heappop(heap)
+                if distance[index] is not None:
+                    continue
+                distance[index] = steps
+                for parent in predecessors[index]:
+                    if distance[parent] is not None:
+                        continue
+                    if (parent < red_to_move_offset) == player_green:
+                        heapq.heappush(heap, (steps + 1, parent))
+                    elif pending[parent] > 0:
+                        pending[parent] -= 1
+                        longest[parent] = max(longest[parent], steps + 1)
+                        if not pending[parent]:
+                            heapq.heappush(heap, (longest[parent], parent))
+            return distance
+
+        tally = (final_value > 0) - (final_value < 0)
+        green_wins = attractor(True, lambda value: value > 0)
+        red_wins = attractor(False, lambda value: value < 0)
+        # Si el marcador favorece a alguien, a ese le basta con no perder la ventaja
+        if tally > 0:
+            red_holds = attractor(False, lambda value: value <= 0)
+        elif tally < 0:
+            green_holds = attractor(True, lambda value: value >= 0)
+
+        values = array('i', [0]) * layer_states
+        for index in valid:
+            if green_wins[index] is not None:
+                values[index] = _encode(1, green_wins[index])
+            elif red_wins[index] is not None:
+                values[index] = _encode(-1, red_wins[index])
+            elif tally > 0 and red_holds[index] is None:
+                values[index] = _encode(1, STALL)
+            elif tally < 0 and green_holds[index] is None:
+                values[index] = _encode(-1, STALL)
+        return values
@@ -4,19 +4,29 @@ import random
 from enum import Enum
 from typing import List, Tuple, Optional, Set
 from algoritmo import GameLogic, Player, Difficulty
+from cache_posiciones import POSITION_CACHE_PATH
+from partidas import GAME_RECORDS_PATH, HUMAN, GameRecordWriter
+from recursos import ASSETS, GREEN_YOSHI_IMAGE, RED_YOSHI_IMAGE
+from reglas import HeadlessGame
+from tablas import BOARD_VARIANTS, DEFAULT_BOARD, BoardConfig, board_tables, iter_bits
 
+# Constantes (el tamaño de casilla se ajusta para que cualquier tablero ocupe BOARD_PIXELS)
+BOARD_PIXELS = 640
+SIDEBAR_WIDTH = 300
 
-# Inicializar pygame
-pygame.init()
+# Textos renderizados que se conservan antes de vaciar la caché
+TEXT_CACHE_SIZE = 256
 
-# Constantes
-BOARD_SIZE = 8
-CELL_SIZE = 80
-BOARD_WIDTH = BOARD_SIZE * CELL_SIZE
-BOARD_HEIGHT = BOARD_SIZE * CELL_SIZE
-SIDEBAR_WIDTH = 300
-WINDOW_WIDTH = BOARD_WIDTH + SIDEBAR_WIDTH
-WINDOW_HEIGHT = BOARD_HEIGHT + 100
+# Eventos propios del bucle: fin de los delays (temporizadores de pygame), aviso
+# de que la búsqueda de la IA terminó y pulso de la cuenta regresiva del turno
+AI_DELAY_EVENT = pygame.USEREVENT + 1
+HUMAN_DELAY_EVENT = pygame.USEREVENT + 2
+AI_SEARCH_DONE_EVENT = pygame.USEREVENT + 3
+COUNTDOWN_EVENT = pygame.USEREVENT + 4
+COUNTDOWN_INTERVAL_MS = 250
+
+# Tope de cuadros por segundo, solo mientras hay algo que redibujar
+MAX_FPS = 60
 
 # Colores
 WHITE = (255, 255, 255)
@@ -39,12 +49,21 @@ class GameState(Enum):
     GAME_OVER = 3
 
 class YoshisZonesGame:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    def __init__(self, board_config: BoardConfig = DEFAULT_BOARD, game_records: Optional[str] = GAME_RECORDS_PATH):
+        # Configuración del tablero (tamaño, zonas y umbral) y sus tablas en caché
+        self.board_config = board_config
+        self.tables = board_tables(board_config)
+        self.cell_size = BOARD_PIXELS // board_config.size
+        self.board_width = self.board_height = board_config.size * self.cell_size
+        self.window_width = self.board_width + SIDEBAR_WIDTH
+        self.window_height = self.board_height + 100
+
+        # pygame se inicializa al crear la ventana, no al importar el módulo
+        pygame.init()
+        self.screen = pygame.display.set_mode((self.window_width, self.window_height))
         pygame.display.set_caption("Yoshi's Zones")
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        self.assets = ASSETS  # Imágenes y fuentes, cargadas al primer uso
         self.cell_owner = {}
         
         # Estado del juego
@@ -53,18 +72,20 @@ class YoshisZonesGame:
         self.current_player = Player.GREEN  # La máquina siempre inicia
         
         # Tablero y posiciones
-        self.board = [[None for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+        self.board = [[None for _ in range(board_config.size)] for _ in range(board_config.size)]
         self.green_yoshi_pos = None
         self.red_yoshi_pos = None
         
         # Zonas especiales (esquinas + casillas adyacentes)
         self.special_zones = self._create_special_zones()
-        self.logic = GameLogic(self.difficulty, self.special_zones)
+        self.logic = GameLogic(self.difficulty, board=board_config, position_cache=POSITION_CACHE_PATH)
         self.painted_cells = set()
+        self.game = None  # Partida en curso (reglas.HeadlessGame)
+        self.game_records = game_records  # Registro al que se anexa cada partida terminada (None: ninguno)
+        self.snapshot = None  # Posición inmutable que consume la IA
         
         # Control de zonas ganadas
         self.zone_winners = {}  # Diccionario: zona_index -> Player
-        self.won_zones_cells = set()  # Casillas de zonas ya ganadas
         
         # Puntuación
         self.green_zones_won = 0
@@ -81,6 +102,7 @@ class YoshisZonesGame:
         self.human_move_delay = 500 
         self.last_move_time = 0
         self.show_initial_positions = True
+        self.ai_delay_elapsed = False
         
         # Historial de movimientos para evitar bucles
         self.move_history = []
@@ -89,95 +111,68 @@ class YoshisZonesGame:
         # Mostrar movimientos válidos
         self.show_valid_moves = False
         self.valid_moves_for_display = []
+        
+        # Búsqueda de la IA en curso (avisa con AI_SEARCH_DONE_EVENT al terminar) y
+        # reflexión de la IA durante el turno del humano
+        self.ai_future = None
+        self.ponder_future = None
+        self.human_moves = []  # Movimientos válidos del humano, calculados al empezar su turno
+
+        # Dibujado retenido: superficies y textos en caché y lo último dibujado
+        # en cada casilla, para redibujar solo lo que cambia (ver ``draw``)
+        self._text_cache = {}
+        self._board_surface = None
+        self._overlay = None
+        self._scene = None
+        self._board_key = None
+        self._cell_visuals = [None] * self.tables.num_squares
+        self._sidebar_drawn = None
 
-        # Cargar imágenes de los Yoshis
-        self.yoshi_green_img = pygame.image.load("./imagenes/yoshi_verde.png")
-        self.yoshi_green_img = pygame.transform.scale(self.yoshi_green_img, (CELL_SIZE-10, CELL_SIZE-10))
-        self.yoshi_red_img = pygame.image.load("./imagenes/yoshi_rojo.png")
-        self.yoshi_red_img = pygame.transform.scale(self.yoshi_red_img, (CELL_SIZE-10, CELL_SIZE-10))
+    @property
+    def font(self) -> pygame.font.Font:
+        return self.assets.font(None, 36)
+
+    @property
+    def small_font(self) -> pygame.font.Font:
+        return self.assets.font(None, 24)
+
+    @property
+    def yoshi_green_img(self) -> pygame.Surface:
+        return self.assets.image(GREEN_YOSHI_IMAGE, (self.cell_size - 10, self.cell_size - 10))
+
+    @property
+    def yoshi_red_img(self) -> pygame.Surface:
+        return self.assets.image(RED_YOSHI_IMAGE, (self.cell_size - 10, self.cell_size - 10))
 
     def _create_special_zones(self) -> List[List[Tuple[int, int]]]:
-        """Crea las 4 zonas especiales en las esquinas del tablero"""
-        zones = []
-        
-        # Zona 1: Esquina superior izquierda
-        zone1 = [(0, 0), (0, 1), (0, 2), (1, 0), (2, 0)]
-        zones.append(zone1)
-        
-        # Zona 2: Esquina superior derecha
-        zone2 = [(0, 5), (0, 6), (0, 7), (1, 7), (2, 7)]
-        zones.append(zone2)
-        
-        # Zona 3: Esquina inferior izquierda 
-        zone3 = [(5, 0), (6, 0), (7, 0), (7, 1), (7, 2)]
-        zones.append(zone3)
-        
-        # Zona 4: Esquina inferior derecha
-        zone4 = [(7, 5), (7, 6), (7, 7), (6, 7), (5, 7)]
-        zones.append(zone4)
-        
-        return zones
+        """Crea las zonas especiales del tablero (por defecto, las 4 esquinas)"""
+        # La distribución y sus tablas de búsqueda se precalculan en tablas.py
+        return [list(zone) for zone in self.tables.special_zones]
 
     def _is_in_special_zone(self, pos: Tuple[int, int]) -> bool:
         """Verifica si una posición está en alguna zona especial"""
         row, col = pos
-        if not (0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE):
+        if not (0 <= row < self.board_config.size and 0 <= col < self.board_config.size):
             return False
         
-        for zone in self.special_zones:
-            if pos in zone:
-                return True
-        return False
+        return self.tables.square_zone[self.tables.to_square(pos)] >= 0
 
     def _get_zone_index(self, pos: Tuple[int, int]) -> int:
         """Obtiene el índice de la zona especial donde está la posición"""
-        for i, zone in enumerate(self.special_zones):
-            if pos in zone:
-                return i
-        return -1
-
-    def _is_zone_won(self, pos: Tuple[int, int]) -> bool:
-        """Verifica si la posición está en una zona ya ganada"""
-        zone_index = self._get_zone_index(pos)
-        return zone_index in self.zone_winners
+        return self.tables.square_zone[self.tables.to_square(pos)]
 
     def _get_valid_knight_moves(self, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
         """Obtiene todos los movimientos válidos de caballo desde una posición"""
-        row, col = pos
-        knight_moves = [
-            (-2, -1), (-2, 1), (-1, -2), (-1, 2),
-            (1, -2), (1, 2), (2, -1), (2, 1)
-        ]
-        
-        valid_moves = []
-        for dr, dc in knight_moves:
-            new_row, new_col = row + dr, col + dc
-            if (0 <= new_row < BOARD_SIZE and 0 <= new_col < BOARD_SIZE):
-                new_pos = (new_row, new_col)
-                
-                # No permitir movimiento a casillas ya pintadas
-                if new_pos in self.painted_cells:
-                    continue
-                
-                # No permitir movimiento a zonas ya ganadas
-                if self._is_zone_won(new_pos):
-                    continue
-                
-                # No permitir que los Yoshis ocupen la misma posición
-                other_yoshi_pos = self.red_yoshi_pos if pos == self.green_yoshi_pos else self.green_yoshi_pos
-                if other_yoshi_pos and new_pos == other_yoshi_pos:
-                    continue
-                
-                valid_moves.append(new_pos)
-        
-        return valid_moves
+        # Las reglas (casillas pintadas, zonas ganadas, el otro Yoshi) están en reglas.py
+        player = Player.GREEN if pos == self.green_yoshi_pos else Player.RED
+        return self.game.legal_moves(player)
 
     def _place_yoshis_randomly(self):
         """Coloca los Yoshis en posiciones aleatorias válidas (NO en zonas especiales)"""
         available_positions = []
         
-        for row in range(BOARD_SIZE):
-            for col in range(BOARD_SIZE):
+        for row in range(self.board_config.size):
+            for col in range(self.board_config.size):
                 pos = (row, col)
                 if not self._is_in_special_zone(pos):
                     available_positions.append(pos)
@@ -187,118 +182,76 @@ class YoshisZonesGame:
         
         selected_positions = random.sample(available_positions, 2)
         
-        self.green_yoshi_pos = selected_positions[0]
-        self.red_yoshi_pos = selected_positions[1]
+        # La partida la lleva HeadlessGame; la interfaz solo copia lo que dibuja
+        self.game = HeadlessGame(
+            selected_positions[0], selected_positions[1], board=self.board_config,
+            max_history=self.max_history, max_plies=None
+        )
+        self._sync_from_game()
         
         # Registrar la zona inicial de la IA para estrategia experta
         self.logic.set_initial_zone(self.green_yoshi_pos, self.special_zones)
+
+    def _sync_from_game(self):
+        """Copia el estado de la partida a los atributos que usa el dibujado"""
+        game = self.game
+        # La instantánea es inmutable: la IA la usa sin copiarla en su hilo
+        state = self.snapshot = game.snapshot()
+        self.green_yoshi_pos = game.green_pos
+        self.red_yoshi_pos = game.red_pos
+        self.current_player = game.current_player
+        self.move_history = game.move_history
         
-        # Limpiar historial de movimientos
-        self.move_history.clear()
-
-    def _check_zone_completion(self, zone_index: int):
-        """Verifica si una zona ha sido ganada por tener 3 casillas del mismo color"""
-        zone = self.special_zones[zone_index]
-        
-        # Contar casillas por jugador
-        green_count = 0
-        red_count = 0
-        
-        for cell in zone:
-            if cell in self.cell_owner:
-                if self.cell_owner[cell] == Player.GREEN:
-                    green_count += 1
-                elif self.cell_owner[cell] == Player.RED:
-                    red_count += 1
-        
-        # Verificar si algún jugador ha ganado la zona (3 casillas)
-        if green_count >= 3 and zone_index not in self.zone_winners:
-            self.zone_winners[zone_index] = Player.GREEN
-            self._mark_zone_as_won(zone_index, Player.GREEN)
-            self.green_zones_won += 1
-        elif red_count >= 3 and zone_index not in self.zone_winners:
-            self.zone_winners[zone_index] = Player.RED
-            self._mark_zone_as_won(zone_index, Player.RED)
-            self.red_zones_won += 1
-
-    def _mark_zone_as_won(self, zone_index: int, winner: Player):
-        """Marca toda la zona como ganada por el jugador especificado"""
-        zone = self.special_zones[zone_index]
-        
-        # Marcar todas las casillas de la zona como pintadas y del color del ganador
-        for cell in zone:
+        self.painted_cells = set()
+        self.cell_owner = {}
+        for square in iter_bits(state.painted):
+            cell = self.tables.to_pos(square)
             self.painted_cells.add(cell)
-            self.cell_owner[cell] = winner
-            self.won_zones_cells.add(cell)
-
-    def _check_zone_winners(self):
-        """Verifica qué zonas han sido ganadas por tener 3 casillas del mismo color"""
-        for i in range(len(self.special_zones)):
-            if i not in self.zone_winners:  # Solo verificar zonas no ganadas
-                self._check_zone_completion(i)
-
-    def _is_game_over(self) -> bool:
-        """Verifica si el juego ha terminado"""
-        # El juego termina cuando todas las zonas especiales han sido ganadas
-        # o cuando no hay más movimientos válidos
-        return len(self.zone_winners) == len(self.special_zones)
-
-    def _is_repetitive_move(self, new_pos: Tuple[int, int]) -> bool:
-        """Verifica si el movimiento causaría una repetición excesiva"""
-        if len(self.move_history) < 4:
-            return False
-        
-        # Verificar patrones de movimiento repetitivo
-        recent_moves = self.move_history[-4:]
-        if recent_moves.count(new_pos) >= 2:
-            return True
+            self.cell_owner[cell] = Player.GREEN if state.green_owned >> square & 1 else Player.RED
         
-        return False
+        self.zone_winners = dict(game.zone_winners)
+        self.green_zones_won = game.green_zones_won
+        self.red_zones_won = game.red_zones_won
+        self.game_over = game.game_over
+        self.winner = game.winner
 
-    def _make_move(self, new_pos: Tuple[int, int]):
+    def _make_move(self, new_pos: Tuple[int, int], think_ms: float, score: Optional[float] = None):
         """Realiza un movimiento del jugador actual"""
-        # Agregar al historial de movimientos
-        self.move_history.append(new_pos)
-        if len(self.move_history) > self.max_history:
-            self.move_history.pop(0)
-        
-        if self.current_player == Player.GREEN:
-            self.green_yoshi_pos = new_pos
-        else:
-            self.red_yoshi_pos = new_pos
-
-        # Si la nueva posición está en una zona especial, la pintamos
-        if self._is_in_special_zone(new_pos):
-            self.painted_cells.add(new_pos)
-            self.cell_owner[new_pos] = self.current_player
-            
-            # Verificar si se ganó la zona
-            zone_index = self._get_zone_index(new_pos)
-            if zone_index >= 0:
-                self._check_zone_completion(zone_index)
-
-        # Cambiar turno
-        self.current_player = Player.RED if self.current_player == Player.GREEN else Player.GREEN
+        self.game.make_move(new_pos, think_ms, score)
+        self._sync_from_game()
+        if self.game_over:
+            self._record_game()
         
         # Actualizar tiempo del último movimiento
         self.last_move_time = pygame.time.get_ticks()
+        self._start_turn()
 
-        # Verificar si el juego terminó
-        if self._is_game_over():
-            self.game_over = True
-            if self.green_zones_won > self.red_zones_won:
-                self.winner = Player.GREEN
-            elif self.red_zones_won > self.green_zones_won:
-                self.winner = Player.RED
-            else:
-                self.winner = None
+    def _record_game(self):
+        """Anexa la partida terminada al registro de partidas"""
+        if not self.game_records:
+            return
+        try:
+            with GameRecordWriter(self.game_records) as writer:
+                writer.write(self.game.to_record(self.difficulty.value, HUMAN))
+        except OSError:
+            pass  # Sin registro (p. ej. carpeta de solo lectura) el juego sigue igual
+
+    def _text(self, font: pygame.font.Font, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        """Superficie del texto, renderizada una sola vez por (fuente, texto, color)"""
+        key = (font, text, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            if len(self._text_cache) >= TEXT_CACHE_SIZE:
+                self._text_cache.clear()
+            surface = self._text_cache[key] = font.render(text, True, color)
+        return surface
 
     def _draw_menu(self):
         """Dibuja el menú principal"""
         self.screen.fill(WHITE)
         
-        title = self.font.render("YOSHI'S ZONES", True, BLACK)
-        title_rect = title.get_rect(center=(WINDOW_WIDTH//2, 100))
+        title = self._text(self.font, "YOSHI'S ZONES", BLACK)
+        title_rect = title.get_rect(center=(self.window_width//2, 100))
         self.screen.blit(title, title_rect)
         
         # Botones de dificultad
@@ -310,96 +263,103 @@ class YoshisZonesGame:
         
         for i, (text, diff) in enumerate(difficulties):
             color = GREEN if diff == self.difficulty else LIGHT_GRAY
-            pygame.draw.rect(self.screen, color, (WINDOW_WIDTH//2 - 150, 200 + i*60, 300, 50))
-            text_surface = self.small_font.render(text, True, BLACK)
-            text_rect = text_surface.get_rect(center=(WINDOW_WIDTH//2, 225 + i*60))
+            pygame.draw.rect(self.screen, color, (self.window_width//2 - 150, 200 + i*60, 300, 50))
+            text_surface = self._text(self.small_font, text, BLACK)
+            text_rect = text_surface.get_rect(center=(self.window_width//2, 225 + i*60))
             self.screen.blit(text_surface, text_rect)
         
         # Botón de inicio
-        pygame.draw.rect(self.screen, BLUE, (WINDOW_WIDTH//2 - 100, 400, 200, 50))
-        start_text = self.font.render("INICIAR", True, WHITE)
-        start_rect = start_text.get_rect(center=(WINDOW_WIDTH//2, 425))
+        pygame.draw.rect(self.screen, BLUE, (self.window_width//2 - 100, 400, 200, 50))
+        start_text = self._text(self.font, "INICIAR", WHITE)
+        start_rect = start_text.get_rect(center=(self.window_width//2, 425))
         self.screen.blit(start_text, start_rect)
 
-    def _draw_board(self):
-        """Dibuja el tablero de ajedrez con mejor visualización"""
-        for row in range(BOARD_SIZE):
-            for col in range(BOARD_SIZE):
-                x = col * CELL_SIZE
-                y = row * CELL_SIZE
-                
-                # Color base del tablero (ajedrez)
-                base_color = WHITE if (row + col) % 2 == 0 else LIGHT_GRAY
-                
-                # Determinar el color final de la celda
-                pos = (row, col)
-                zone_index = self._get_zone_index(pos)
-                
-                if zone_index >= 0:  # Es una zona especial
-                    if zone_index in self.zone_winners:
-                        # Zona ganada - colorear toda la zona del color del ganador
-                        winner = self.zone_winners[zone_index]
-                        if winner == Player.GREEN:
-                            color = DARK_GREEN
-                        else:
-                            color = DARK_RED
-                    elif pos in self.painted_cells:
-                        # Casilla pintada en zona no ganada
-                        owner = self.cell_owner.get(pos)
-                        if owner == Player.GREEN:
-                            color = LIGHT_GREEN
-                        elif owner == Player.RED:
-                            color = LIGHT_RED
-                        else:
-                            color = YELLOW
-                    else:
-                        # Zona especial disponible
-                        color = YELLOW
-                else:
-                    # Casilla normal
-                    color = base_color
-                
-                # Destacar movimientos válidos
-                if pos in self.valid_moves_for_display:
-                    color = ORANGE
-                
-                pygame.draw.rect(self.screen, color, (x, y, CELL_SIZE, CELL_SIZE))
-                pygame.draw.rect(self.screen, BLACK, (x, y, CELL_SIZE, CELL_SIZE), 2)
-                
-                # Agregar texto "GANADA" en zonas ganadas
-                if zone_index >= 0 and zone_index in self.zone_winners:
-                    text_color = WHITE if self.zone_winners[zone_index] == Player.GREEN else WHITE
-                    won_text = self.small_font.render("GANADA", True, text_color)
-                    text_rect = won_text.get_rect(center=(x + CELL_SIZE//2, y + CELL_SIZE//2))
-                    self.screen.blit(won_text, text_rect)
-        
-        # Dibujar Yoshis
-        if self.green_yoshi_pos:
-            col, row = self.green_yoshi_pos[1], self.green_yoshi_pos[0]
-            x = col * CELL_SIZE + 5
-            y = row * CELL_SIZE + 5
-            self.screen.blit(self.yoshi_green_img, (x, y))
+    def _cell_color(self, pos: Tuple[int, int], zone_index: int) -> Tuple[int, int, int]:
+        """Color de una casilla según su zona, quién la pintó y si es un movimiento válido"""
+        # Destacar movimientos válidos
+        if pos in self.valid_moves_for_display:
+            return ORANGE
+        
+        if zone_index >= 0:  # Es una zona especial
+            if zone_index in self.zone_winners:
+                # Zona ganada - colorear toda la zona del color del ganador
+                return DARK_GREEN if self.zone_winners[zone_index] == Player.GREEN else DARK_RED
+            if pos in self.painted_cells:
+                # Casilla pintada en zona no ganada
+                owner = self.cell_owner.get(pos)
+                if owner == Player.GREEN:
+                    return LIGHT_GREEN
+                if owner == Player.RED:
+                    return LIGHT_RED
+        return self._base_color(pos, zone_index)
 
-        if self.red_yoshi_pos:
-            col, row = self.red_yoshi_pos[1], self.red_yoshi_pos[0]
-            x = col * CELL_SIZE + 5
-            y = row * CELL_SIZE + 5
-            self.screen.blit(self.yoshi_red_img, (x, y))
+    def _base_color(self, pos: Tuple[int, int], zone_index: int) -> Tuple[int, int, int]:
+        """Color de la casilla vacía: zona especial disponible o colores de ajedrez"""
+        if zone_index >= 0:
+            return YELLOW
+        row, col = pos
+        return WHITE if (row + col) % 2 == 0 else LIGHT_GRAY
 
-    def _draw_sidebar(self):
-        """Dibuja la barra lateral con información del juego"""
-        sidebar_x = BOARD_WIDTH
-        pygame.draw.rect(self.screen, LIGHT_GRAY, (sidebar_x, 0, SIDEBAR_WIDTH, WINDOW_HEIGHT))
-        
-        # Título
-        title = self.font.render("INFORMACIÓN", True, BLACK)
-        self.screen.blit(title, (sidebar_x + 10, 20))
-        
-        # Dificultad actual
-        diff_text = f"Dificultad: {self.difficulty.name}"
-        diff_surface = self.small_font.render(diff_text, True, BLACK)
-        self.screen.blit(diff_surface, (sidebar_x + 10, 60))
-        
+    def _static_board(self) -> pygame.Surface:
+        """Tablero vacío (colores base y bordes), dibujado una sola vez"""
+        if self._board_surface is None:
+            surface = pygame.Surface((self.board_width, self.board_height))
+            for square in range(self.tables.num_squares):
+                row, col = pos = self.tables.to_pos(square)
+                rect = (col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size)
+                pygame.draw.rect(surface, self._base_color(pos, self.tables.square_zone[square]), rect)
+                pygame.draw.rect(surface, BLACK, rect, 2)
+            self._board_surface = surface
+        return self._board_surface
+
+    def _draw_board(self) -> List[pygame.Rect]:
+        """Dibuja las casillas que cambiaron desde el último cuadro y devuelve sus rectángulos.
+
+        Cada casilla recuerda lo último que se dibujó en ella (color, etiqueta y
+        Yoshi); si el estado del juego no cambió ni siquiera se recorren.
+        """
+        state = self.snapshot
+        board_key = (
+            state.painted, state.green_owned, state.green_sq, state.red_sq,
+            tuple(self.valid_moves_for_display)
+        ) if state is not None else None
+        if board_key == self._board_key:
+            return []
+        self._board_key = board_key
+        
+        static_board = self._static_board()
+        yoshis = {self.green_yoshi_pos: self.yoshi_green_img, self.red_yoshi_pos: self.yoshi_red_img}
+        dirty = []
+        for square in range(self.tables.num_squares):
+            row, col = pos = self.tables.to_pos(square)
+            zone_index = self.tables.square_zone[square]
+            won = zone_index >= 0 and zone_index in self.zone_winners
+            yoshi = yoshis.get(pos)
+            visual = (self._cell_color(pos, zone_index), won, yoshi)
+            if visual == self._cell_visuals[square]:
+                continue
+            self._cell_visuals[square] = visual
+            
+            rect = pygame.Rect(col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size)
+            if visual[0] == self._base_color(pos, zone_index):
+                self.screen.blit(static_board, rect, rect)
+            else:
+                pygame.draw.rect(self.screen, visual[0], rect)
+                pygame.draw.rect(self.screen, BLACK, rect, 2)
+            
+            # Agregar texto "GANADA" en zonas ganadas
+            if won:
+                won_text = self._text(self.small_font, "GANADA", WHITE)
+                self.screen.blit(won_text, won_text.get_rect(center=rect.center))
+            
+            # Dibujar Yoshis
+            if yoshi is not None:
+                self.screen.blit(yoshi, (rect.x + 5, rect.y + 5))
+            dirty.append(rect)
+        return dirty
+
+    def _sidebar_lines(self) -> List[Tuple[pygame.font.Font, str, Tuple[int, int, int], int]]:
+        """Textos de la barra lateral: (fuente, texto, color, y)"""
         # Turno actual con información adicional
         if self.show_initial_positions:
             current = "Iniciando... (IA jugará en breve)"
@@ -412,42 +372,31 @@ class YoshisZonesGame:
                 remaining_time = max(0, self.human_move_delay - (current_time - self.last_move_time)) // 1000
                 current = f"Humano (Rojo) - {remaining_time}s"
         
-        turn_text = f"Turno: {current}"
-        turn_surface = self.small_font.render(turn_text, True, BLACK)
-        self.screen.blit(turn_surface, (sidebar_x + 10, 90))
+        lines = [
+            (self.font, "INFORMACIÓN", BLACK, 20),
+            (self.small_font, f"Dificultad: {self.difficulty.name}", BLACK, 60),
+            (self.small_font, f"Turno: {current}", BLACK, 90),
+        ]
         
         # Mostrar posiciones actuales
         if self.green_yoshi_pos:
-            green_pos_text = f"Verde en: {self.green_yoshi_pos}"
-            green_pos_surface = self.small_font.render(green_pos_text, True, GREEN)
-            self.screen.blit(green_pos_surface, (sidebar_x + 10, 120))
-        
+            lines.append((self.small_font, f"Verde en: {self.green_yoshi_pos}", GREEN, 120))
         if self.red_yoshi_pos:
-            red_pos_text = f"Rojo en: {self.red_yoshi_pos}"
-            red_pos_surface = self.small_font.render(red_pos_text, True, RED)
-            self.screen.blit(red_pos_surface, (sidebar_x + 10, 145))
+            lines.append((self.small_font, f"Rojo en: {self.red_yoshi_pos}", RED, 145))
         
         # Puntuación
-        score_text = "PUNTUACIÓN:"
-        score_surface = self.small_font.render(score_text, True, BLACK)
-        self.screen.blit(score_surface, (sidebar_x + 10, 180))
-        
-        green_score = f"Verde: {self.green_zones_won} zonas"
-        green_surface = self.small_font.render(green_score, True, GREEN)
-        self.screen.blit(green_surface, (sidebar_x + 10, 210))
-        
-        red_score = f"Rojo: {self.red_zones_won} zonas"
-        red_surface = self.small_font.render(red_score, True, RED)
-        self.screen.blit(red_surface, (sidebar_x + 10, 240))
+        lines += [
+            (self.small_font, "PUNTUACIÓN:", BLACK, 180),
+            (self.small_font, f"Verde: {self.green_zones_won} zonas", GREEN, 210),
+            (self.small_font, f"Rojo: {self.red_zones_won} zonas", RED, 240),
+            (self.small_font, "ZONAS GANADAS:", BLACK, 270),
+        ]
         
         # Mostrar zonas ganadas específicas
-        zones_won_text = "ZONAS GANADAS:"
-        zones_surface = self.small_font.render(zones_won_text, True, BLACK)
-        self.screen.blit(zones_surface, (sidebar_x + 10, 270))
-        
         y_offset = 300
         zone_names = ["Sup. Izq.", "Sup. Der.", "Inf. Izq.", "Inf. Der."]
-        for i, zone_name in enumerate(zone_names):
+        zone_names += [f"Zona {i + 1}" for i in range(len(zone_names), len(self.special_zones))]
+        for i, zone_name in enumerate(zone_names[:len(self.special_zones)]):
             if i in self.zone_winners:
                 winner = self.zone_winners[i]
                 color = GREEN if winner == Player.GREEN else RED
@@ -456,9 +405,7 @@ class YoshisZonesGame:
             else:
                 color = DARK_GRAY
                 zone_text = f"{zone_name}: Disponible"
-            
-            zone_surface = self.small_font.render(zone_text, True, color)
-            self.screen.blit(zone_surface, (sidebar_x + 10, y_offset + i*20))
+            lines.append((self.small_font, zone_text, color, y_offset + i*20))
         
         # Instrucciones mejoradas
         instructions = [
@@ -467,25 +414,40 @@ class YoshisZonesGame:
             "  caballos de ajedrez",
             "- Haz clic en una casilla",
             "  naranja (válida) para moverte",
-            "- Gana una zona con 3 casillas",
+            f"- Gana una zona con {self.board_config.zone_win_threshold} casillas",
             "- Zonas ganadas se colorean",
             "  completamente",
             "- No puedes moverte a zonas",
             "  ya ganadas"
         ]
         
+        instructions_y = y_offset + len(self.special_zones) * 20 + 20
         for i, instruction in enumerate(instructions):
             color = BLACK if i == 0 else DARK_GRAY
-            font = self.small_font if i > 0 else self.small_font
-            inst_surface = font.render(instruction, True, color)
-            self.screen.blit(inst_surface, (sidebar_x + 10, 400 + i*22))
+            lines.append((self.small_font, instruction, color, instructions_y + i*22))
+        return lines
+
+    def _draw_sidebar(self) -> List[pygame.Rect]:
+        """Dibuja la barra lateral si alguno de sus textos cambió"""
+        lines = self._sidebar_lines()
+        if lines == self._sidebar_drawn:
+            return []
+        self._sidebar_drawn = lines
+        
+        sidebar_x = self.board_width
+        rect = pygame.Rect(sidebar_x, 0, SIDEBAR_WIDTH, self.window_height)
+        pygame.draw.rect(self.screen, LIGHT_GRAY, rect)
+        for font, text, color, y in lines:
+            self.screen.blit(self._text(font, text, color), (sidebar_x + 10, y))
+        return [rect]
 
     def _draw_game_over(self):
         """Dibuja la pantalla de fin de juego"""
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-        overlay.set_alpha(128)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        if self._overlay is None:
+            self._overlay = pygame.Surface((self.window_width, self.window_height))
+            self._overlay.set_alpha(128)
+            self._overlay.fill(BLACK)
+        self.screen.blit(self._overlay, (0, 0))
         
         if self.winner == Player.GREEN:
             message = "¡LA IA HA GANADO!"
@@ -497,18 +459,18 @@ class YoshisZonesGame:
             message = "¡EMPATE!"
             color = BLUE
         
-        text_surface = self.font.render(message, True, color)
-        text_rect = text_surface.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 - 50))
+        text_surface = self._text(self.font, message, color)
+        text_rect = text_surface.get_rect(center=(self.window_width//2, self.window_height//2 - 50))
         self.screen.blit(text_surface, text_rect)
         
         final_score = f"Verde: {self.green_zones_won} - Rojo: {self.red_zones_won}"
-        score_surface = self.small_font.render(final_score, True, WHITE)
-        score_rect = score_surface.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2))
+        score_surface = self._text(self.small_font, final_score, WHITE)
+        score_rect = score_surface.get_rect(center=(self.window_width//2, self.window_height//2))
         self.screen.blit(score_surface, score_rect)
         
-        pygame.draw.rect(self.screen, BLUE, (WINDOW_WIDTH//2 - 100, WINDOW_HEIGHT//2 + 50, 200, 50))
-        menu_text = self.small_font.render("VOLVER AL MENÚ", True, WHITE)
-        menu_rect = menu_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 + 75))
+        pygame.draw.rect(self.screen, BLUE, (self.window_width//2 - 100, self.window_height//2 + 50, 200, 50))
+        menu_text = self._text(self.small_font, "VOLVER AL MENÚ", WHITE)
+        menu_rect = menu_text.get_rect(center=(self.window_width//2, self.window_height//2 + 75))
         self.screen.blit(menu_text, menu_rect)
 
     def _handle_click(self, pos: Tuple[int, int]):
@@ -525,118 +487,213 @@ class YoshisZonesGame:
             elif 320 <= y <= 370:
                 self.difficulty = Difficulty.EXPERT
                 self.logic.difficulty = self.difficulty
-            elif 400 <= y <= 450 and WINDOW_WIDTH//2 - 100 <= x <= WINDOW_WIDTH//2 + 100:
+            elif 400 <= y <= 450 and self.window_width//2 - 100 <= x <= self.window_width//2 + 100:
                 # Iniciar juego
+                self._cancel_ai_search()
                 self.game_state = GameState.PLAYING
                 self._place_yoshis_randomly()
-                self.green_zones_won = 0
-                self.red_zones_won = 0
-                self.painted_cells.clear()
-                self.cell_owner.clear()
-                self.zone_winners.clear()
-                self.won_zones_cells.clear()
-                self.current_player = Player.GREEN
-                self.game_over = False
-                self.winner = None
                 
                 self.ai_move_timer = pygame.time.get_ticks()
                 self.last_move_time = pygame.time.get_ticks()
                 self.show_initial_positions = True
                 self.show_valid_moves = False
                 self.valid_moves_for_display.clear()
+                self._start_turn()
                 
         elif self.game_state == GameState.PLAYING and not self.game_over:
             # Solo permitir clics del humano en su turno y después del delay
-            current_time = pygame.time.get_ticks()
-            if (self.current_player == Player.RED and x < BOARD_WIDTH and 
-                current_time - self.last_move_time >= self.human_move_delay):
+            # (HUMAN_DELAY_EVENT muestra los movimientos válidos)
+            if (self.current_player == Player.RED and x < self.board_width and 
+                self.show_valid_moves):
                 
-                col = x // CELL_SIZE
-                row = y // CELL_SIZE
+                col = x // self.cell_size
+                row = y // self.cell_size
                 
-                if 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE:
-                    valid_moves = self._get_valid_knight_moves(self.red_yoshi_pos)
+                if 0 <= row < self.board_config.size and 0 <= col < self.board_config.size:
+                    valid_moves = self.human_moves
                     if (row, col) in valid_moves:
-                        self._make_move((row, col))
+                        self._make_move((row, col), pygame.time.get_ticks() - self.last_move_time)
                         self.show_valid_moves = False
                         self.valid_moves_for_display.clear()
                         
         elif self.game_over:
-            if (WINDOW_HEIGHT//2 + 50 <= y <= WINDOW_HEIGHT//2 + 100 and
-                WINDOW_WIDTH//2 - 100 <= x <= WINDOW_WIDTH//2 + 100):
+            if (self.window_height//2 + 50 <= y <= self.window_height//2 + 100 and
+                self.window_width//2 - 100 <= x <= self.window_width//2 + 100):
+                self._cancel_ai_search()
+                self._stop_timers()
                 self.game_state = GameState.MENU
                 
-    def update(self):
-        """Actualiza la lógica del juego"""
-        current_time = pygame.time.get_ticks()
+    def _cancel_ai_search(self):
+        """Cancela la búsqueda (o la reflexión) de la IA en segundo plano, si hay una en curso"""
+        if self.ai_future is not None:
+            self.ai_future.cancel()
+            self.ai_future = None
+        self._cancel_ponder()
+
+    def _cancel_ponder(self):
+        if self.ponder_future is not None:
+            self.ponder_future.cancel()
+            self.ponder_future = None
+
+    def _start_turn(self):
+        """Programa el turno que empieza: búsqueda y delay de la IA, o delay del humano"""
+        if self.game_over:
+            self._stop_timers()
+            return
         
-        if (self.game_state == GameState.PLAYING and not self.game_over):
-            
-            # Turno de la IA
-            if self.current_player == Player.GREEN:
-                if self.show_initial_positions:
-                    if current_time - self.ai_move_timer > self.ai_move_delay:
-                        self.show_initial_positions = False
-                        # Hacer el primer movimiento de la IA
-                        ai_move = self.logic.get_ai_move(
-                            self.green_yoshi_pos,
-                            self.red_yoshi_pos,
-                            self.painted_cells,
-                            self.cell_owner,
-                            self.move_history
-                        )
-                        if ai_move:
-                            self._make_move(ai_move)
-                else:
-                    # Movimientos normales de la IA con delay
-                    if current_time - self.last_move_time >= self.ai_move_delay:
-                        ai_move = self.logic.get_ai_move(
-                            self.green_yoshi_pos,
-                            self.red_yoshi_pos,
-                            self.painted_cells,
-                            self.cell_owner,
-                            self.move_history
-                        )
-                        if ai_move:
-                            self._make_move(ai_move)
-            
+        profile = self.logic.profile
+        if self.current_player == Player.GREEN:
+            # La búsqueda corre en segundo plano durante el delay, así que el
+            # tiempo de pensar se solapa con la espera en lugar de sumarse; si el
+            # humano jugó una respuesta prevista, la reflexión ya la tiene
+            self._cancel_ponder()
+            self.ai_delay_elapsed = False
+            future = self.ai_future = self.logic.get_ai_move_async(
+                self.snapshot,
+                time_budget_ms=profile.time_budget_ms,
+                max_depth=profile.max_depth
+            )
+            future.add_done_callback(self._post_search_done)
+            self._set_timer(AI_DELAY_EVENT, self.ai_move_delay)
+        else:
+            # Mientras el humano piensa, la IA calcula sus respuestas posibles
+            self.human_moves = self._get_valid_knight_moves(self.red_yoshi_pos)
+            self.ponder_future = self.logic.start_pondering(
+                self.snapshot,
+                time_budget_ms=profile.time_budget_ms,
+                max_depth=profile.max_depth
+            )
+            self._set_timer(HUMAN_DELAY_EVENT, self.human_move_delay)
+        pygame.time.set_timer(COUNTDOWN_EVENT, COUNTDOWN_INTERVAL_MS)
+
+    def _set_timer(self, event_type: int, delay_ms: int):
+        """Publica ``event_type`` una vez tras ``delay_ms`` (reemplaza el temporizador anterior)"""
+        if delay_ms > 0:
+            pygame.time.set_timer(event_type, delay_ms, loops=1)
+        else:
+            pygame.time.set_timer(event_type, 0)
+            pygame.event.post(pygame.event.Event(event_type))
+
+    def _stop_timers(self):
+        for event_type in (AI_DELAY_EVENT, HUMAN_DELAY_EVENT, COUNTDOWN_EVENT):
+            pygame.time.set_timer(event_type, 0)
+
+    def _post_search_done(self, future):
+        """Despierta el bucle cuando la IA termina de buscar (corre en el hilo de la búsqueda)"""
+        try:
+            pygame.event.post(pygame.event.Event(AI_SEARCH_DONE_EVENT, future=future))
+        except pygame.error:
+            pass  # pygame ya se cerró
+
+    def _play_ai_move(self):
+        """Juega el movimiento de la IA cuando la búsqueda terminó y pasó su delay"""
+        if (self.game_state != GameState.PLAYING or self.game_over or
+                self.current_player != Player.GREEN or not self.ai_delay_elapsed or
+                self.ai_future is None or not self.ai_future.done()):
+            return
+        self.show_initial_positions = False
+        ai_move = self.ai_future.result()
+        self.ai_future = None
+        if ai_move is None:
+            legal_moves = self.game.legal_moves()
+            if not legal_moves:
+                # La IA no puede mover: la partida se decide con lo ganado
+                self.game.end_game()
+                self._sync_from_game()
+                self._record_game()
+                return
+            # La búsqueda no devolvió movimiento: jugar uno válido para no bloquear el turno
+            self._make_move(legal_moves[0], self.logic.last_think_ms)
+            return
+        self._make_move(ai_move, self.logic.last_think_ms, self.logic.last_score)
+
+    def _handle_game_event(self, event: pygame.event.Event):
+        """Maneja los temporizadores y el aviso de la búsqueda"""
+        if event.type == AI_DELAY_EVENT:
+            self.ai_delay_elapsed = True
+            pygame.time.set_timer(COUNTDOWN_EVENT, 0)
+            self._play_ai_move()
+        elif event.type == AI_SEARCH_DONE_EVENT:
+            # Ignorar el aviso de una búsqueda cancelada o de una partida anterior
+            if event.future is self.ai_future:
+                self._play_ai_move()
+        elif event.type == HUMAN_DELAY_EVENT:
+            pygame.time.set_timer(COUNTDOWN_EVENT, 0)
             # Turno del humano - mostrar movimientos válidos
-            elif self.current_player == Player.RED:
-                if current_time - self.last_move_time >= self.human_move_delay:
-                    if not self.show_valid_moves:
-                        self.show_valid_moves = True
-                        self.valid_moves_for_display = self._get_valid_knight_moves(self.red_yoshi_pos)
-
-    def draw(self):
-        """Dibuja toda la interfaz"""
+            if (self.game_state == GameState.PLAYING and not self.game_over and
+                    self.current_player == Player.RED and not self.show_valid_moves):
+                self.show_valid_moves = True
+                self.valid_moves_for_display = list(self.human_moves)
+        # COUNTDOWN_EVENT solo despierta el bucle para actualizar la cuenta regresiva
+
+    def draw(self) -> List[pygame.Rect]:
+        """Dibuja lo que cambió desde el último cuadro y devuelve los rectángulos a actualizar.
+
+        Al cambiar de pantalla (menú, partida nueva, fin de juego) se redibuja
+        todo; durante la partida solo las casillas y la barra lateral que cambiaron.
+        """
         if self.game_state == GameState.MENU:
-            self._draw_menu()
-        elif self.game_state == GameState.PLAYING:
-            self.screen.fill(WHITE)
-            self._draw_board()
-            self._draw_sidebar()
-            if self.game_over:
-                self._draw_game_over()
+            scene = (GameState.MENU, self.difficulty)
+        else:
+            scene = (self.game_state, self.game, self.game_over)
+        if scene != self._scene:
+            self._scene = scene
+            self._board_key = None
+            self._cell_visuals = [None] * self.tables.num_squares
+            self._sidebar_drawn = None
+            if self.game_state == GameState.MENU:
+                self._draw_menu()
+            else:
+                self.screen.fill(WHITE)
+                self._draw_board()
+                self._draw_sidebar()
+                if self.game_over:
+                    self._draw_game_over()
+            return [self.screen.get_rect()]
+        
+        if self.game_state == GameState.PLAYING and not self.game_over:
+            return self._draw_board() + self._draw_sidebar()
+        return []
+
+    def _wait_events(self) -> List[pygame.event.Event]:
+        """Eventos pendientes; si no hay, se bloquea hasta que llegue alguno (los
+        temporizadores y el aviso del hilo de búsqueda también lo despiertan)"""
+        return [pygame.event.wait()] + pygame.event.get()
 
     def run(self):
-        """Bucle principal del juego"""
+        """Bucle principal del juego.
+
+        Solo trabaja cuando llega algo que atender: un clic, el fin de un delay
+        (temporizadores de pygame), el aviso de la búsqueda o el pulso de la
+        cuenta regresiva. Sin nada pendiente (menú, fin de juego, esperando el
+        clic del humano) duerme en ``_wait_events`` y no redibuja nada.
+        """
+        game_events = (AI_DELAY_EVENT, HUMAN_DELAY_EVENT, AI_SEARCH_DONE_EVENT, COUNTDOWN_EVENT)
         running = True
         while running:
-            for event in pygame.event.get():
+            dirty_rects = self.draw()
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
+                self.clock.tick(MAX_FPS)
+            
+            for event in self._wait_events():
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     self._handle_click(event.pos)
-            
-            self.update()
-            self.draw()
-            pygame.display.flip()
-            self.clock.tick(60)
-        
+                elif event.type == pygame.WINDOWEXPOSED:
+                    self._scene = None  # Redibujar todo la próxima vez
+                elif event.type in game_events:
+                    self._handle_game_event(event)
+        
+        self._cancel_ai_search()
+        self._stop_timers()
+        self.logic.shutdown()
         pygame.quit()
         sys.exit()
 
 # Ejecutar el juego
 if __name__ == "__main__":
-    game = YoshisZonesGame()
+    # Opcionalmente, una variante de tablero: python interfaz.py 10x10
+    game = YoshisZonesGame(BOARD_VARIANTS[sys.argv[1]] if len(sys.argv) > 1 else DEFAULT_BOARD)
     game.run()
\ No newline at end of file
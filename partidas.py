@@ -0,0 +1,219 @@
+# Registro de partidas: un archivo binario de solo anexado con cada partida
+# completa (casillas iniciales, niveles, jugadas con su tiempo y puntaje) y su
+# lectura en flujo. Las partidas se reproducen con las reglas de bitboard.py,
+# sin pygame, para construir libros de aperturas, corpus y datos de ajuste.
+import argparse
+import math
+import os
+import struct
+import time
+from typing import BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from bitboard import GameSnapshot
+from tablas import BoardConfig
+
+# Registro de la interfaz, junto a los módulos (como la caché de posiciones)
+GAME_RECORDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "partidas.yzr")
+
+# Cabecera del archivo: firma y versión. Después, una partida tras otra:
+# longitud del resto del registro, nivel de cada jugador (el valor de su
+# Difficulty, HUMAN si jugó una persona), casillas iniciales, resultado para
+# VERDE (1, 0, -1), zonas ganadas, tamaño del tablero codificado y número de
+# jugadas; luego el tablero y las jugadas (casilla, ms pensando, puntaje).
+RECORDS_MAGIC = b"YZGR"
+RECORDS_VERSION = 1
+HEADER = struct.Struct("<4sH")
+LENGTH = struct.Struct("<I")
+GAME = struct.Struct("<BBBBbBBHH")
+MOVE = struct.Struct("<BIf")
+
+HUMAN = 0
+
+
+class MoveRecord(NamedTuple):
+    square: int
+    think_ms: float = 0.0           # Se guarda en milisegundos enteros
+    score: Optional[float] = None   # Puntaje de la búsqueda desde quien movió (None si no buscó)
+
+
+class GameRecord(NamedTuple):
+    board: BoardConfig
+    green_start: int
+    red_start: int
+    green_level: int   # Difficulty.value o HUMAN
+    red_level: int
+    result: int        # Para VERDE: 1 gana, 0 empata, -1 pierde
+    green_zones: int
+    red_zones: int
+    moves: Tuple[MoveRecord, ...]
+
+
+class PositionSample(NamedTuple):
+    """Una posición de una partida registrada, la jugada que se hizo y cómo terminó la partida"""
+    snapshot: GameSnapshot
+    move: MoveRecord
+    result: int
+
+
+def encode_board(board: BoardConfig) -> bytes:
+    """Tamaño, umbral y casillas de cada zona: el registro no depende de BOARD_VARIANTS"""
+    data = bytearray((board.size, board.zone_win_threshold, len(board.special_zones)))
+    for zone in board.special_zones:
+        data.append(len(zone))
+        data.extend(row * board.size + col for row, col in zone)
+    return bytes(data)
+
+
+def decode_board(data: bytes) -> BoardConfig:
+    size, threshold, zone_count = data[0], data[1], data[2]
+    zones = []
+    offset = 3
+    for _ in range(zone_count):
+        count = data[offset]
+        zones.append(tuple(divmod(square, size) for square in data[offset + 1:offset + 1 + count]))
+        offset += 1 + count
+    if offset != len(data):
+        raise ValueError("Tablero mal codificado en el registro de partidas")
+    return BoardConfig.create(size, zones, threshold)
+
+
+def encode_record(record: GameRecord) -> bytes:
+    board = encode_board(record.board)
+    parts = [
+        GAME.pack(record.green_level, record.red_level, record.green_start, record.red_start,
+                  record.result, record.green_zones, record.red_zones, len(board), len(record.moves)),
+        board,
+    ]
+    for square, think_ms, score in record.moves:
+        think = min(max(int(round(think_ms)), 0), 0xFFFFFFFF)
+        parts.append(MOVE.pack(square, think, math.nan if score is None else score))
+    body = b"".join(parts)
+    return LENGTH.pack(len(body)) + body
+
+
+def decode_record(body: bytes, boards: Optional[Dict[bytes, BoardConfig]] = None) -> GameRecord:
+    """Decodifica un registro sin su longitud; ``boards`` reutiliza los tableros ya leídos"""
+    (green_level, red_level, green_start, red_start, result,
+     green_zones, red_zones, board_size, move_count) = GAME.unpack_from(body, 0)
+    offset = GAME.size
+    if len(body) != offset + board_size + move_count * MOVE.size:
+        raise ValueError("Registro de partida con un tamaño inconsistente")
+    board_data = bytes(body[offset:offset + board_size])
+    board = boards.get(board_data) if boards is not None else None
+    if board is None:
+        board = decode_board(board_data)
+        if boards is not None:
+            boards[board_data] = board
+    offset += board_size
+    moves = tuple(
+        MoveRecord(square, float(think_ms), None if math.isnan(score) else score)
+        for square, think_ms, score in MOVE.iter_unpack(body[offset:])
+    )
+    return GameRecord(board, green_start, red_start, green_level, red_level, result,
+                      green_zones, red_zones, moves)
+
+
+class GameRecordWriter:
+    """Anexa partidas a un archivo de registro; lo crea con su cabecera si no existe.
+
+    Cada partida se escribe entera y se vacía al disco, así que un cierre
+    inesperado pierde como mucho la partida que se estaba escribiendo (el
+    lector ignora un registro final truncado).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file: Optional[BinaryIO] = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(HEADER.pack(RECORDS_MAGIC, RECORDS_VERSION))
+            self._file.flush()
+
+    def write(self, record: GameRecord):
+        self._file.write(encode_record(record))
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "GameRecordWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def append_records(records: Iterable[GameRecord], path: str) -> int:
+    """Anexa ``records`` a ``path``; devuelve cuántos escribió"""
+    count = 0
+    with GameRecordWriter(path) as writer:
+        for record in records:
+            writer.write(record)
+            count += 1
+    return count
+
+
+def read_records(path: str) -> Iterator[GameRecord]:
+    """Lee las partidas de una en una (memoria constante, sin cargar el archivo)"""
+    boards: Dict[bytes, BoardConfig] = {}
+    with open(path, "rb") as records_file:
+        header = records_file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return
+        magic, version = HEADER.unpack(header)
+        if magic != RECORDS_MAGIC or version != RECORDS_VERSION:
+            raise ValueError(f"Registro de partidas no válido: {path}")
+        while True:
+            prefix = records_file.read(LENGTH.size)
+            if len(prefix) < LENGTH.size:
+                return
+            (size,) = LENGTH.unpack(prefix)
+            body = records_file.read(size)
+            if len(body) < size:
+                return  # Última partida a medio escribir
+            yield decode_record(body, boards)
+
+
+def replay(record: GameRecord) -> Iterator[Tuple[GameSnapshot, MoveRecord]]:
+    """Reproduce la partida con las reglas: (posición antes de la jugada, jugada) por cada ply.
+
+    Las instantáneas llevan las últimas jugadas, así que sirven tal cual para
+    GameLogic (con ``swapped`` cuando mueve ROJO). Una jugada ilegal indica un
+    registro dañado y lanza ValueError.
+    """
+    snapshot = GameSnapshot(record.green_start, record.red_start, board=record.board)
+    for move in record.moves:
+        if move.square not in snapshot.legal_moves():
+            raise ValueError(f"Jugada ilegal en el registro: casilla {move.square} desde {snapshot!r}")
+        yield snapshot, move
+        snapshot = snapshot.apply(move.square)
+
+
+def iter_positions(records: Iterable[GameRecord]) -> Iterator[PositionSample]:
+    """Todas las posiciones de ``records`` con su jugada y el resultado final de la partida"""
+    for record in records:
+        for snapshot, move in replay(record):
+            yield PositionSample(snapshot, move, record.result)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Reproduce un registro de partidas y resume su contenido")
+    parser.add_argument("path", nargs="?", default=GAME_RECORDS_PATH)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    games = positions = 0
+    results = {1: 0, 0: 0, -1: 0}
+    for record in read_records(args.path):
+        games += 1
+        results[record.result] += 1
+        for _ in replay(record):
+            positions += 1
+    elapsed = time.perf_counter() - start
+    print(f"{games} partidas, {positions} posiciones "
+          f"(VERDE +{results[1]} ={results[0]} -{results[-1]}) en {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Pesos de la heurística de GameLogic como vector de parámetros: los valores por
+# defecto son los de siempre y ajuste.py los optimiza con autojuego. GameLogic
+# carga el archivo de pesos si existe.
+import json
+import os
+import zlib
+from typing import Dict, NamedTuple, Union
+
+# Pesos de la interfaz, junto a los módulos (como el libro de aperturas)
+WEIGHTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pesos.json")
+
+# Salida por defecto de ajuste.py: separada de WEIGHTS_PATH para que un ajuste
+# en curso no cambie los pesos que usa GameLogic; instalarlos es un paso aparte
+TUNED_WEIGHTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pesos_ajustados.json")
+
+WEIGHTS_VERSION = 1
+
+
+class EvalWeights(NamedTuple):
+    """Pesos de ``evaluate_position``; las penalizaciones se guardan en positivo"""
+    zone_lead: float = 10.0          # Por casilla de ventaja en una zona
+    initial_zone: float = 15.0       # Por casilla propia en la zona inicial (solo EXPERT)
+    zone_won: float = 25.0           # Zona capturada
+    zone_near: float = 15.0          # A una casilla de capturarla
+    zone_lost: float = 30.0          # Zona capturada por el rival
+    zone_threat: float = 20.0        # El rival está a una casilla de capturarla
+    proximity_green: float = 3.0     # Por casilla libre más cerca de VERDE
+    proximity_red: float = 2.0       # Por casilla libre más cerca de ROJO
+    centrality: float = 0.5          # Por paso hacia el centro del tablero
+    repetition: float = 20.0         # Mover a una casilla repetida
+
+
+DEFAULT_WEIGHTS = EvalWeights()
+
+
+def weights_scope(weights: EvalWeights) -> int:
+    """Identificador estable de unos pesos (los puntajes guardados solo valen con ellos)"""
+    return zlib.crc32(repr(tuple(float(value) for value in weights)).encode())
+
+
+def weights_from_dict(values: Dict[str, float]) -> EvalWeights:
+    """Pesos a partir de un diccionario; los que falten toman su valor por defecto"""
+    unknown = set(values) - set(EvalWeights._fields)
+    if unknown:
+        raise ValueError(f"Pesos desconocidos: {', '.join(sorted(unknown))}")
+    return DEFAULT_WEIGHTS._replace(**{name: float(value) for name, value in values.items()})
+
+
+def load_weights(path: str) -> EvalWeights:
+    with open(path, encoding="utf-8") as weights_file:
+        data = json.load(weights_file)
+    if data.get("version") != WEIGHTS_VERSION:
+        raise ValueError(f"Archivo de pesos no válido: {path}")
+    return weights_from_dict(data["weights"])
+
+
+def save_weights(weights: EvalWeights, path: str):
+    """Escribe los pesos en un archivo temporal y lo renombra: quien lea ``path``
+    nunca ve un archivo a medio escribir"""
+    temporary = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as weights_file:
+        json.dump({"version": WEIGHTS_VERSION, "weights": weights._asdict()}, weights_file, indent=2)
+        weights_file.write("\n")
+    os.replace(temporary, path)
+
+
+def resolve_weights(weights: Union[EvalWeights, str, None]) -> EvalWeights:
+    """Pesos explícitos, los de un archivo (si existe y es válido) o los de por defecto"""
+    if isinstance(weights, EvalWeights):
+        return weights
+    if weights and os.path.exists(weights):
+        try:
+            return load_weights(weights)
+        except (ValueError, KeyError, OSError):
+            # Un pesos.json dañado o de otra versión no impide jugar
+            pass
+    return DEFAULT_WEIGHTS
@@ -0,0 +1,58 @@
+# Imágenes y fuentes de la interfaz, cargadas la primera vez que se usan y
+# conservadas ya escaladas y convertidas al formato de la pantalla. Importar
+# este módulo no inicializa pygame: el motor y las herramientas sin interfaz
+# nunca llegan a tocar SDL.
+import os
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+# Carpeta de las imágenes, junto a los módulos (no depende del directorio actual)
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "imagenes")
+
+GREEN_YOSHI_IMAGE = "Yoshi_verde.png"
+RED_YOSHI_IMAGE = "Yoshi_rojo.png"
+
+
+class AssetManager:
+    """Caché compartida de superficies y fuentes.
+
+    Cada imagen se decodifica solo cuando se pide un tamaño que aún no está en
+    caché; se guarda escalada (clave: nombre y tamaño) y, si ya hay ventana,
+    convertida con ``convert_alpha`` para que dibujarla no convierta píxeles
+    en cada cuadro. La imagen original no se conserva.
+    """
+
+    def __init__(self, images_dir: str = IMAGES_DIR):
+        self.images_dir = images_dir
+        self._images: Dict[Tuple[str, Tuple[int, int]], pygame.Surface] = {}
+        self._fonts: Dict[Tuple[Optional[str], int], pygame.font.Font] = {}
+
+    def image(self, name: str, size: Tuple[int, int]) -> pygame.Surface:
+        key = (name, size)
+        surface = self._images.get(key)
+        if surface is None:
+            surface = pygame.transform.scale(pygame.image.load(os.path.join(self.images_dir, name)), size)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+            self._images[key] = surface
+        return surface
+
+    def font(self, name: Optional[str], size: int) -> pygame.font.Font:
+        """Fuente ``name`` (None: la de pygame) de ``size`` puntos"""
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self._fonts[key] = pygame.font.Font(name, size)
+        return font
+
+    def clear(self):
+        """Descarta lo cargado (p. ej. tras cambiar el formato de la pantalla)"""
+        self._images.clear()
+        self._fonts.clear()
+
+
+# Caché de la interfaz, compartida por todas las partidas del proceso
+ASSETS = AssetManager()
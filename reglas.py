@@ -0,0 +1,147 @@
+from typing import Dict, List, Optional, Tuple
+
+from algoritmo import Player
+from bitboard import BitboardState, GameSnapshot
+from partidas import GameRecord, MoveRecord
+from tablas import BOARD_SIZE, SPECIAL_ZONES, BoardConfig, board_tables
+
+
+class HeadlessGame:
+    """Partida completa sin pygame; la usan la interfaz, el torneo y el libro de aperturas.
+
+    Las reglas son las de BitboardState, las mismas que modela la búsqueda: al
+    mover a una casilla de zona se pinta, la zona se gana con 3 casillas del
+    mismo color (el umbral del tablero) y entonces se pinta entera, así que ya
+    no se puede entrar en ella. La partida termina cuando no quedan casillas de
+    zona libres (con todas las zonas ganadas) o cuando el jugador al turno no
+    tiene movimientos; las partidas automáticas terminan además al alcanzar
+    ``max_plies`` (None para no limitarlas).
+    """
+
+    def __init__(
+        self,
+        green_pos: Tuple[int, int],
+        red_pos: Tuple[int, int],
+        special_zones: List[List[Tuple[int, int]]] = SPECIAL_ZONES,
+        zone_win_threshold: int = 3,
+        max_history: int = 6,
+        max_plies: Optional[int] = 200,
+        board: Optional[BoardConfig] = None
+    ):
+        # ``board`` reemplaza a ``special_zones`` y ``zone_win_threshold`` (y permite otros tamaños)
+        if board is None:
+            board = BoardConfig.create(BOARD_SIZE, special_zones, zone_win_threshold)
+        self.board = board
+        self.tables = board_tables(board)
+        self.special_zones = self.tables.special_zones
+        self.zone_masks = self.tables.zone_masks
+        self.square_zone = self.tables.square_zone
+        self.zone_win_threshold = board.zone_win_threshold
+        self.state = BitboardState(self.zone_masks, self.tables.to_square(green_pos),
+                                   self.tables.to_square(red_pos), board=board)
+        self.start_positions = (green_pos, red_pos)
+
+        self.current_player = Player.GREEN  # La máquina siempre inicia
+        self.zone_winners: Dict[int, Player] = {}
+        self.green_zones_won = 0
+        self.red_zones_won = 0
+
+        self.move_history: List[Tuple[int, int]] = []
+        self.max_history = max_history
+        self.moves: List[MoveRecord] = []  # Todas las jugadas, para el registro de partidas
+        self.plies = 0
+        self.max_plies = max_plies
+
+        self.game_over = False
+        self.winner: Optional[Player] = None
+
+    @property
+    def green_pos(self) -> Tuple[int, int]:
+        return self.tables.to_pos(self.state.green_sq)
+
+    @property
+    def red_pos(self) -> Tuple[int, int]:
+        return self.tables.to_pos(self.state.red_sq)
+
+    def legal_moves(self, player: Optional[Player] = None) -> List[Tuple[int, int]]:
+        """Movimientos válidos: sin casillas pintadas (ni zonas ganadas) ni el otro Yoshi"""
+        if player is None:
+            player = self.current_player
+        return [self.tables.to_pos(square) for square in self.state.legal_moves(player == Player.GREEN)]
+
+    def perspective_state(self, player: Player) -> BitboardState:
+        """Copia del estado vista por ``player`` como si fuera VERDE.
+
+        GameLogic siempre maximiza para VERDE; para que un motor juegue con ROJO
+        basta con intercambiar los papeles de los dos Yoshis.
+        """
+        state = self.state
+        if player == Player.GREEN:
+            return state.copy()
+        return BitboardState(state.zone_masks, state.red_sq, state.green_sq,
+                             state.painted, state.red_owned, state.green_owned, state.board)
+
+    def snapshot(self, player: Optional[Player] = None) -> GameSnapshot:
+        """Instantánea inmutable de la posición actual.
+
+        Con ``player`` se ve desde ese jugador como si fuera VERDE (igual que
+        ``perspective_state``), que es lo que recibe GameLogic.
+        """
+        snapshot = GameSnapshot.from_state(self.state, self.current_player == Player.GREEN, self.move_history)
+        if player == Player.RED:
+            return snapshot.swapped()
+        return snapshot
+
+    def make_move(self, new_pos: Tuple[int, int], think_ms: float = 0.0, score: Optional[float] = None):
+        """Realiza un movimiento del jugador actual (tiempo y puntaje solo van al registro)"""
+        # Agregar al historial de movimientos
+        self.move_history.append(new_pos)
+        if len(self.move_history) > self.max_history:
+            self.move_history.pop(0)
+
+        square = self.tables.to_square(new_pos)
+        self.moves.append(MoveRecord(square, think_ms, score))
+        self.state.make_move(self.current_player == Player.GREEN, square)
+
+        # Si la nueva posición está en una zona especial, verificar si se ganó
+        # (make_move ya la capturó y la pintó entera)
+        zone_index = self.square_zone[square]
+        if zone_index >= 0:
+            self._check_zone_completion(zone_index)
+
+        # Cambiar turno
+        self.current_player = Player.RED if self.current_player == Player.GREEN else Player.GREEN
+        self.plies += 1
+
+        if (self.state.is_game_over(self.current_player == Player.GREEN) or
+                (self.max_plies is not None and self.plies >= self.max_plies)):
+            self.end_game()
+
+    def _check_zone_completion(self, zone_index: int):
+        """Registra el ganador de la zona si el último movimiento la capturó"""
+        if zone_index in self.zone_winners:
+            return
+        winner = self.state.zone_winner(zone_index)
+        if winner is True:
+            self.zone_winners[zone_index] = Player.GREEN
+            self.green_zones_won += 1
+        elif winner is False:
+            self.zone_winners[zone_index] = Player.RED
+            self.red_zones_won += 1
+
+    def end_game(self):
+        """Termina la partida y decide el ganador por zonas ganadas"""
+        self.game_over = True
+        if self.green_zones_won > self.red_zones_won:
+            self.winner = Player.GREEN
+        elif self.red_zones_won > self.green_zones_won:
+            self.winner = Player.RED
+        else:
+            self.winner = None
+
+    def to_record(self, green_level: int, red_level: int) -> GameRecord:
+        """Registro de la partida (ver partidas.py); los niveles son Difficulty.value o HUMAN"""
+        result = 0 if self.winner is None else (1 if self.winner == Player.GREEN else -1)
+        green_start, red_start = (self.tables.to_square(pos) for pos in self.start_positions)
+        return GameRecord(self.board, green_start, red_start, green_level, red_level, result,
+                          self.green_zones_won, self.red_zones_won, tuple(self.moves))
@@ -0,0 +1,217 @@
+# Tablas precalculadas del tablero compartidas por el motor (algoritmo.py) y la
+# interfaz (interfaz.py). Cada configuración de tablero (tamaño, zonas y umbral
+# para ganar una zona) construye sus tablas una sola vez y quedan en caché; las
+# constantes del módulo son las del tablero estándar de 8x8.
+from functools import cached_property, lru_cache
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+BOARD_SIZE = 8
+NUM_SQUARES = BOARD_SIZE * BOARD_SIZE
+
+# Desplazamientos del caballo (mismo orden que el resto del juego)
+KNIGHT_OFFSETS = [
+    (-2, -1), (-2, 1), (-1, -2), (-1, 2),
+    (1, -2), (1, 2), (2, -1), (2, 1)
+]
+
+Zone = Tuple[Tuple[int, int], ...]
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Recorre los índices de los bits activos de una máscara"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def corner_zones(size: int) -> List[List[Tuple[int, int]]]:
+    """Cuatro zonas en L en las esquinas del tablero (la distribución estándar)"""
+    last = size - 1
+    return [
+        [(0, 0), (0, 1), (0, 2), (1, 0), (2, 0)],  # Superior izquierda
+        [(0, last - 2), (0, last - 1), (0, last), (1, last), (2, last)],  # Superior derecha
+        [(last - 2, 0), (last - 1, 0), (last, 0), (last, 1), (last, 2)],  # Inferior izquierda
+        [(last, last - 2), (last, last - 1), (last, last), (last - 1, last), (last - 2, last)],  # Inferior derecha
+    ]
+
+
+def edge_zones(size: int) -> List[List[Tuple[int, int]]]:
+    """Cuatro zonas de 2x2 en el centro de cada borde, para tableros grandes"""
+    middle, last = size // 2, size - 1
+    return [
+        [(0, middle - 1), (0, middle), (1, middle - 1), (1, middle)],  # Superior
+        [(middle - 1, 0), (middle, 0), (middle - 1, 1), (middle, 1)],  # Izquierda
+        [(middle - 1, last), (middle, last), (middle - 1, last - 1), (middle, last - 1)],  # Derecha
+        [(last, middle - 1), (last, middle), (last - 1, middle - 1), (last - 1, middle)],  # Inferior
+    ]
+
+
+class BoardConfig(NamedTuple):
+    """Tamaño del tablero, zonas especiales y casillas necesarias para ganar una zona.
+
+    Es inmutable y hashable, así que sirve de clave para las tablas en caché
+    (ver ``board_tables``). Conviene crearla con ``BoardConfig.create``.
+    """
+    size: int
+    special_zones: Tuple[Zone, ...]
+    zone_win_threshold: int = 3
+
+    @classmethod
+    def create(
+        cls,
+        size: int = BOARD_SIZE,
+        special_zones: Optional[List[List[Tuple[int, int]]]] = None,
+        zone_win_threshold: int = 3
+    ) -> "BoardConfig":
+        """Normaliza las zonas a tuplas; sin zonas se usan las cuatro esquinas"""
+        if special_zones is None:
+            special_zones = corner_zones(size)
+        zones = tuple(tuple(tuple(cell) for cell in zone) for zone in special_zones)
+        for zone in zones:
+            for row, col in zone:
+                if not (0 <= row < size and 0 <= col < size):
+                    raise ValueError(f"Casilla de zona fuera del tablero: {(row, col)}")
+        return cls(size, zones, zone_win_threshold)
+
+    @property
+    def num_squares(self) -> int:
+        return self.size * self.size
+
+
+def build_zone_masks(special_zones: List[List[Tuple[int, int]]], size: int = BOARD_SIZE) -> List[int]:
+    """Construye una máscara de bits por cada zona especial"""
+    masks = []
+    for zone in special_zones:
+        mask = 0
+        for row, col in zone:
+            mask |= 1 << (row * size + col)
+        masks.append(mask)
+    return masks
+
+
+def build_square_zone(zone_masks: List[int], num_squares: int = NUM_SQUARES) -> List[int]:
+    """Índice de zona de cada casilla (-1 si no pertenece a ninguna)"""
+    square_zone = [-1] * num_squares
+    for i, mask in enumerate(zone_masks):
+        for square in iter_bits(mask):
+            square_zone[square] = i
+    return square_zone
+
+
+class BoardTables:
+    """Tablas de movimiento, distancias y máscaras de zona de una configuración.
+
+    Se obtienen con ``board_tables``, que las construye una vez por
+    configuración; la búsqueda guarda las listas en variables locales, así que
+    un tablero grande se recorre igual de rápido que el estándar.
+    """
+
+    def __init__(self, config: BoardConfig):
+        self.config = config
+        self.size = size = config.size
+        self.num_squares = num_squares = size * size
+        self.zone_win_threshold = config.zone_win_threshold
+        self.special_zones = [list(zone) for zone in config.special_zones]
+
+        # Destinos en el orden de KNIGHT_OFFSETS y máscara equivalente por casilla
+        self.knight_targets: List[Tuple[int, ...]] = []
+        self.knight_attacks: List[int] = []
+        for square in range(num_squares):
+            row, col = divmod(square, size)
+            square_targets = []
+            mask = 0
+            for dr, dc in KNIGHT_OFFSETS:
+                new_row, new_col = row + dr, col + dc
+                if 0 <= new_row < size and 0 <= new_col < size:
+                    target = new_row * size + new_col
+                    square_targets.append(target)
+                    mask |= 1 << target
+            self.knight_targets.append(tuple(square_targets))
+            self.knight_attacks.append(mask)
+
+        # Fila y columna de cada casilla, para evitar divisiones en la búsqueda
+        self.square_row = [square // size for square in range(num_squares)]
+        self.square_col = [square % size for square in range(num_squares)]
+
+        # Distancia Manhattan entre cada par de casillas (distance[a][b])
+        self.distance = [
+            [abs(self.square_row[a] - self.square_row[b]) + abs(self.square_col[a] - self.square_col[b])
+             for b in range(num_squares)]
+            for a in range(num_squares)
+        ]
+
+        # Pasos hacia el centro del tablero desde la casilla más alejada (la
+        # heurística los multiplica por su peso de centralidad)
+        center = (size - 1) / 2
+        self.center_steps = [
+            int((size - 1) - (abs(self.square_row[square] - center) + abs(self.square_col[square] - center)))
+            for square in range(num_squares)
+        ]
+
+        # Máscara de cada zona, unión de todas y zona de cada casilla (-1 si ninguna)
+        self.zone_masks = build_zone_masks(config.special_zones, size)
+        self.zones_mask = 0
+        for mask in self.zone_masks:
+            self.zones_mask |= mask
+        self.square_zone = build_square_zone(self.zone_masks, num_squares)
+
+    def to_square(self, pos: Tuple[int, int]) -> int:
+        """Convierte una posición (fila, columna) en un índice de casilla"""
+        return pos[0] * self.size + pos[1]
+
+    def to_pos(self, square: int) -> Tuple[int, int]:
+        """Convierte un índice de casilla en una posición (fila, columna)"""
+        return divmod(square, self.size)
+
+    def start_squares(self) -> List[int]:
+        """Casillas fuera de las zonas, donde se colocan los Yoshis al empezar"""
+        return [square for square in range(self.num_squares) if self.square_zone[square] < 0]
+
+    @cached_property
+    def proximity_masks(self) -> Tuple[List[int], List[int]]:
+        """Para cada par (verde, rojo), casillas de zona más cercanas a cada Yoshi.
+
+        Se indexa con ``green_sq * num_squares + red_sq``. La evaluación solo
+        tiene que intersectar estas máscaras con las casillas no pintadas.
+        """
+        zone_squares = list(iter_bits(self.zones_mask))
+        num_squares = self.num_squares
+        closer_green = [0] * (num_squares * num_squares)
+        closer_red = [0] * (num_squares * num_squares)
+        for green_sq in range(num_squares):
+            green_dist = self.distance[green_sq]
+            for red_sq in range(num_squares):
+                red_dist = self.distance[red_sq]
+                green_mask = 0
+                red_mask = 0
+                for cell in zone_squares:
+                    if green_dist[cell] < red_dist[cell]:
+                        green_mask |= 1 << cell
+                    elif red_dist[cell] < green_dist[cell]:
+                        red_mask |= 1 << cell
+                index = green_sq * num_squares + red_sq
+                closer_green[index] = green_mask
+                closer_red[index] = red_mask
+        return closer_green, closer_red
+
+
+@lru_cache(maxsize=None)
+def board_tables(config: BoardConfig) -> BoardTables:
+    """Tablas de ``config``, construidas la primera vez y compartidas después"""
+    return BoardTables(config)
+
+
+# Distribución estándar: 4 zonas especiales en las esquinas del tablero de 8x8
+SPECIAL_ZONES = corner_zones(BOARD_SIZE)
+DEFAULT_BOARD = BoardConfig.create(BOARD_SIZE, SPECIAL_ZONES)
+
+# Variantes más grandes para niveles de IA más exigentes
+BOARD_VARIANTS = {
+    "8x8": DEFAULT_BOARD,
+    "10x10": BoardConfig.create(10),
+    "12x12": BoardConfig.create(12, corner_zones(12) + edge_zones(12)),
+}
+
+# Zona de cada casilla del tablero estándar (el libro de aperturas solo existe para él)
+SQUARE_ZONE = board_tables(DEFAULT_BOARD).square_zone
@@ -0,0 +1,127 @@
+import random
+import threading
+
+import pytest
+
+from algoritmo import GAME_OVER_SCORE, Difficulty, GameLogic
+from bitboard import BitboardState
+from pesos import DEFAULT_WEIGHTS
+from tablas import DEFAULT_BOARD, board_tables
+
+
+def _positions(seed, count=6):
+    """(estado, historial) a mitad de partidas aleatorias, con VERDE al turno"""
+    tables = board_tables(DEFAULT_BOARD)
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        green_sq, red_sq = rng.sample(tables.start_squares(), 2)
+        state = BitboardState(tables.zone_masks, green_sq, red_sq)
+        move_history = []
+        green = True
+        for _ in range(2 * rng.randrange(1, 6)):
+            if state.is_game_over(green):
+                break
+            move = rng.choice(state.legal_moves(green))
+            state.make_move(green, move)
+            move_history.append(tables.to_pos(move))
+            green = not green
+        if green and not state.is_game_over(green):
+            positions.append((state, move_history))
+    return positions
+
+
+def _logic(difficulty=Difficulty.AMATEUR, **options):
+    logic = GameLogic(difficulty, opening_book=None, weights=DEFAULT_WEIGHTS, **options)
+    logic.set_initial_zone((0, 3), logic.special_zones)
+    return logic
+
+
+def _plain_minimax(state, evaluate, maximizing, depth):
+    """Minimax sin poda, tabla ni ordenamiento: la referencia de los puntajes"""
+    if not state.zones_mask & ~state.painted:
+        return state.outcome() * GAME_OVER_SCORE + evaluate()
+    if depth == 0:
+        return evaluate()
+    moves = state.legal_moves(maximizing)
+    if not moves:
+        return state.outcome() * GAME_OVER_SCORE + evaluate()
+    scores = []
+    for move in moves:
+        previous = state.make_move(maximizing, move)
+        scores.append(_plain_minimax(state, evaluate, not maximizing, depth - 1))
+        state.unmake_move(maximizing, move, previous)
+    return max(scores) if maximizing else min(scores)
+
+
+def test_parallel_search_matches_serial():
+    parallel = _logic(parallel_workers=2)
+    try:
+        for state, move_history in _positions(seed=1):
+            # Historia y tabla vacías en los dos: el desempate depende del orden de la raíz
+            serial = _logic()
+            parallel.history_scores[:] = [0] * len(parallel.history_scores)
+            parallel.transposition_table.clear()
+            expected = serial._search(state.copy(), move_history, 4)
+            assert parallel._parallel_search(state.copy(), move_history, 4) == expected
+    finally:
+        parallel.shutdown()
+
+
+@pytest.mark.parametrize("options", [{}, {"pvs": True}, {"aspiration": True}, {"pvs": True, "aspiration": True}])
+def test_search_score_matches_plain_minimax(options):
+    depth = 4
+    for state, move_history in _positions(seed=2):
+        evaluate = _logic().make_evaluator(state, move_history)
+        expected = _plain_minimax(state, evaluate, True, depth)
+        # La ventana de aspiración se centra en el puntaje anterior: acertado, alto y bajo
+        for guess in (None, expected, expected + 100.0, expected - 100.0):
+            logic = _logic(**options)
+            logic.previous_score = guess
+            score, move = logic._search(state, move_history, depth)
+            assert score == expected and move in state.legal_moves(True)
+
+
+@pytest.mark.parametrize("time_budget_ms", [1, 5])
+def test_tiny_time_budget_still_returns_a_legal_move(time_budget_ms):
+    tables = board_tables(DEFAULT_BOARD)
+    logic = _logic(Difficulty.EXPERT)
+    for state, move_history in _positions(seed=3):
+        legal_moves = [tables.to_pos(move) for move in state.legal_moves(True)]
+        move = logic.get_ai_move_from_state(state, move_history, time_budget_ms=time_budget_ms, max_depth=12)
+        assert move in legal_moves
+
+
+
+def _signal_first_call(function, event):
+    """``function`` que además activa ``event`` al llamarse"""
+    def wrapper(*args, **kwargs):
+        event.set()
+        return function(*args, **kwargs)
+    return wrapper
+
+
+def test_cancelled_search_returns_none_and_keeps_the_logic_state():
+    logic = _logic(Difficulty.EXPERT, endgame_cells=0)
+    try:
+        (state, move_history), (other, other_history) = _positions(seed=4, count=2)
+        # Una búsqueda terminada deja historia y puntaje de referencia
+        assert logic.get_ai_move_from_state(state, move_history, max_depth=4) is not None
+        history_scores = logic.history_scores[:]
+        previous_score = logic.previous_score
+        assert any(history_scores) and previous_score is not None
+
+        started = threading.Event()
+        logic.make_evaluator = _signal_first_call(logic.make_evaluator, started)
+        running = logic.get_ai_move_async(other, other_history, max_depth=30)
+        # Con un único hilo de búsqueda, esta espera a la anterior y se cancela sin empezar
+        pending = logic.get_ai_move_async(other, other_history, max_depth=30)
+        assert started.wait(5)
+        pending.cancel()
+        running.cancel()
+        assert running.result() is None and running.cancelled
+        assert pending.result() is None and pending.cancelled
+        assert logic.history_scores == history_scores
+        assert logic.previous_score == previous_score
+    finally:
+        logic.shutdown()
@@ -0,0 +1,204 @@
+import pickle
+import random
+
+import pytest
+
+from algoritmo import Difficulty, GameLogic
+from bitboard import CAPTURE_FLAG, BitboardState, GameSnapshot
+from pesos import DEFAULT_WEIGHTS
+from tablas import BOARD_VARIANTS, DEFAULT_BOARD, board_tables
+
+
+def _fields(state):
+    """Todo lo que ``unmake_move`` debe dejar como estaba"""
+    return (state.green_sq, state.red_sq, state.painted, state.green_owned, state.red_owned,
+            state.hash, list(state.green_counts), list(state.red_counts), list(state.captures))
+
+
+def _start(board, rng):
+    tables = board_tables(board)
+    green_sq, red_sq = rng.sample(tables.start_squares(), 2)
+    return BitboardState(tables.zone_masks, green_sq, red_sq, board=board)
+
+
+def _playouts(board, seed, games=20):
+    """Partidas aleatorias: (estado, jugador al turno) en cada ply, sobre el mismo objeto"""
+    rng = random.Random(seed)
+    for _ in range(games):
+        state = _start(board, rng)
+        green = True
+        while not state.is_game_over(green):
+            yield state, green
+            state.make_move(green, rng.choice(state.legal_moves(green)))
+            green = not green
+
+
+@pytest.mark.parametrize("board", list(BOARD_VARIANTS))
+def test_unmake_restores_every_child(board):
+    for state, green in _playouts(BOARD_VARIANTS[board], seed=1):
+        before = _fields(state)
+        for move in state.legal_moves(green):
+            previous = state.make_move(green, move)
+            state.unmake_move(green, move, previous)
+            assert _fields(state) == before
+
+
+@pytest.mark.parametrize("board", list(BOARD_VARIANTS))
+def test_unmake_unwinds_a_whole_game(board):
+    rng = random.Random(2)
+    for _ in range(20):
+        state = _start(BOARD_VARIANTS[board], rng)
+        initial = _fields(state)
+        undo = []
+        green = True
+        while not state.is_game_over(green):
+            move = rng.choice(state.legal_moves(green))
+            undo.append((green, move, _fields(state), state.make_move(green, move)))
+            green = not green
+        for green, move, before, previous in reversed(undo):
+            state.unmake_move(green, move, previous)
+            assert _fields(state) == before
+        assert _fields(state) == initial
+
+
+@pytest.mark.parametrize("board", list(BOARD_VARIANTS))
+def test_incremental_hash_matches_recomputed(board):
+    for state, green in _playouts(BOARD_VARIANTS[board], seed=3):
+        assert state.hash == state.compute_hash()
+        for move in state.legal_moves(green):
+            previous = state.make_move(green, move)
+            assert state.hash == state.compute_hash()
+            state.unmake_move(green, move, previous)
+
+
+def test_capture_paints_the_zone_and_unmake_restores_it():
+    tables = board_tables(DEFAULT_BOARD)
+    square = tables.to_square
+    # Zona superior izquierda: VERDE tiene dos casillas, ROJO una y queda otra libre
+    green_owned = (1 << square((0, 0))) | (1 << square((0, 1)))
+    red_owned = 1 << square((1, 0))
+    state = BitboardState(tables.zone_masks, square((2, 1)), square((7, 7)),
+                          green_owned | red_owned, green_owned, red_owned)
+    before = _fields(state)
+
+    previous = state.make_move(True, square((0, 2)))
+    zone = tables.zone_masks[0]
+    assert previous & CAPTURE_FLAG
+    assert state.green_owned & zone == zone and not state.red_owned & zone
+    assert state.painted & zone == zone
+    assert state.zone_winner(0) is True and state.red_counts[0] == 0
+    assert state.hash == state.compute_hash()
+    # La zona capturada queda bloqueada para los dos
+    assert not any(zone >> move & 1 for move in state.legal_moves(True) + state.legal_moves(False))
+
+    state.unmake_move(True, square((0, 2)), previous)
+    assert _fields(state) == before
+
+
+def test_playouts_exercise_captures():
+    captures = 0
+    for state, green in _playouts(DEFAULT_BOARD, seed=4):
+        for move in state.legal_moves(green):
+            previous = state.make_move(green, move)
+            captures += bool(previous & CAPTURE_FLAG)
+            state.unmake_move(green, move, previous)
+    assert captures > 0
+
+
+def _scratch_evaluation(logic, zone_terms, state, repetitive_mask):
+    """Heurística recorriendo el tablero, sin los conteos ni las máscaras incrementales"""
+    tables = logic.tables
+    weights = logic.weights
+    score = 0.0
+    for i, zone_mask in enumerate(tables.zone_masks):
+        score += zone_terms[i][(state.green_owned & zone_mask).bit_count()][
+            (state.red_owned & zone_mask).bit_count()]
+    green_distance = tables.distance[state.green_sq]
+    red_distance = tables.distance[state.red_sq]
+    for cell in range(tables.num_squares):
+        if not tables.zones_mask >> cell & 1 or state.painted >> cell & 1:
+            continue
+        if green_distance[cell] < red_distance[cell]:
+            score += weights.proximity_green
+        elif red_distance[cell] < green_distance[cell]:
+            score -= weights.proximity_red
+    score += weights.centrality * tables.center_steps[state.green_sq]
+    if repetitive_mask >> state.green_sq & 1:
+        score -= weights.repetition
+    return score
+
+
+@pytest.mark.parametrize("board", list(BOARD_VARIANTS))
+@pytest.mark.parametrize("difficulty", [Difficulty.BEGINNER, Difficulty.EXPERT])
+def test_incremental_evaluation_matches_scratch(board, difficulty):
+    config = BOARD_VARIANTS[board]
+    tables = board_tables(config)
+    logic = GameLogic(difficulty, board=config, opening_book=None, weights=DEFAULT_WEIGHTS)
+    rng = random.Random(7)
+    for _ in range(3):
+        state = _start(config, rng)
+        logic.set_initial_zone(tables.to_pos(state.green_sq), tables.special_zones)
+        # Un historial con repeticiones, para que también cuente esa penalización
+        move_history = [tables.to_pos(state.green_sq), tables.to_pos(state.red_sq)] * 2
+        repetitive_mask = logic._repetitive_mask(move_history)
+        zone_terms = logic._zone_terms()
+        evaluate = logic.make_evaluator(state, move_history)
+        green = True
+        while not state.is_game_over(green):
+            assert evaluate() == pytest.approx(_scratch_evaluation(logic, zone_terms, state, repetitive_mask))
+            for move in state.legal_moves(green):
+                previous = state.make_move(green, move)
+                assert evaluate() == pytest.approx(_scratch_evaluation(logic, zone_terms, state, repetitive_mask))
+                state.unmake_move(green, move, previous)
+            state.make_move(green, rng.choice(state.legal_moves(green)))
+            green = not green
+        assert evaluate() == pytest.approx(_scratch_evaluation(logic, zone_terms, state, repetitive_mask))
+
+
+def _snapshot_games(board, seed, games=10):
+    """Instantáneas de partidas aleatorias, jugadas con ``GameSnapshot.apply``"""
+    rng = random.Random(seed)
+    for _ in range(games):
+        green_sq, red_sq = rng.sample(board_tables(board).start_squares(), 2)
+        snapshot = GameSnapshot(green_sq, red_sq, board=board)
+        while not snapshot.to_state().is_game_over(snapshot.green_to_move):
+            yield snapshot
+            snapshot = snapshot.apply(rng.choice(snapshot.legal_moves()))
+        yield snapshot
+
+
+@pytest.mark.parametrize("board", list(BOARD_VARIANTS))
+def test_snapshot_bytes_round_trip(board):
+    config = BOARD_VARIANTS[board]
+    for snapshot in _snapshot_games(config, seed=5):
+        data = snapshot.to_bytes()
+        restored = GameSnapshot.from_bytes(data, config)
+        assert restored == snapshot and restored.hash == snapshot.hash
+        assert hash(restored) == hash(snapshot)
+        assert pickle.loads(pickle.dumps(snapshot)) == snapshot
+        with pytest.raises(ValueError):
+            GameSnapshot.from_bytes(data[:-1], config)
+
+
+@pytest.mark.parametrize("board", list(BOARD_VARIANTS))
+def test_snapshot_apply_follows_make_move(board):
+    config = BOARD_VARIANTS[board]
+    for snapshot in _snapshot_games(config, seed=6):
+        # El hash incremental coincide con el calculado desde cero
+        assert snapshot.hash == GameSnapshot(snapshot.green_sq, snapshot.red_sq, snapshot.green_owned,
+                                             snapshot.red_owned, snapshot.green_to_move, board=config).hash
+        state = snapshot.to_state()
+        assert state.legal_moves(snapshot.green_to_move) == snapshot.legal_moves()
+        for move in snapshot.legal_moves():
+            child = snapshot.apply(move)
+            previous = state.make_move(snapshot.green_to_move, move)
+            expected = GameSnapshot.from_state(state, not snapshot.green_to_move)
+            state.unmake_move(snapshot.green_to_move, move, previous)
+            assert (child.green_sq, child.red_sq, child.green_owned, child.red_owned, child.hash) == (
+                expected.green_sq, expected.red_sq, expected.green_owned, expected.red_owned, expected.hash)
+
+
+def test_snapshot_is_immutable():
+    snapshot = GameSnapshot(0, 63)
+    with pytest.raises(AttributeError):
+        snapshot.green_sq = 1
@@ -0,0 +1,68 @@
+import sqlite3
+
+from cache_posiciones import PositionCache
+from tablas import DEFAULT_BOARD
+from transposicion import EXACT, TranspositionTable
+
+
+def _search(table, stores=(), probes=()):
+    """Una búsqueda simulada: escribe ``stores`` y consulta ``probes``"""
+    table.new_search()
+    for key, depth in stores:
+        table.store(key, depth, EXACT, float(depth), key % 64)
+    for key in probes:
+        table.probe(key)
+
+
+def _last_used(path):
+    with sqlite3.connect(path) as connection:
+        return dict(connection.execute("SELECT key, last_used FROM positions"))
+
+
+def test_record_seed_and_touch(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    table = TranspositionTable(1 << 16)
+    table.track_changes()
+    cache = PositionCache(path, DEFAULT_BOARD, min_depth=2)
+    cache.wait_loaded()
+    _search(table, stores=[(11, 3), (12, 1), (13, 4)])
+    # Otra búsqueda: solo se guarda lo escrito en ella (la de antes ya se guardó)
+    _search(table, stores=[(14, 2)])
+    cache.record(table)
+    assert set(cache._pending) == {14}
+    cache.close()
+
+    cache = PositionCache(path, DEFAULT_BOARD, min_depth=2)
+    assert len(cache) == 0
+    cache.wait_loaded()
+    assert set(_last_used(path)) == {14}
+
+    fresh = TranspositionTable(1 << 16)
+    fresh.track_changes()
+    seed = cache.prepare_seed(fresh.size)
+    cache.wait_loaded()
+    fresh.adopt(seed.result())
+    assert fresh.peek(14)[1:5] == (2, EXACT, 2.0, 14)
+
+    before = _last_used(path)[14]
+    _search(fresh, probes=[14])
+    cache.record(fresh)
+    cache.flush()
+    assert _last_used(path)[14] > before
+    cache.close()
+
+
+def test_seed_keeps_the_deeper_entry_on_collision(tmp_path):
+    cache = PositionCache(str(tmp_path / "cache.sqlite"), DEFAULT_BOARD, min_depth=1)
+    cache.wait_loaded()
+    table = TranspositionTable(1 << 16)
+    table.track_changes()
+    # Dos búsquedas que escriben en la misma ranura de la tabla
+    _search(table, stores=[(5, 6)])
+    cache.record(table)
+    _search(table, stores=[(5 + table.size, 2)])
+    cache.record(table)
+    assert len(cache) == 2
+    slots = cache.prepare_seed(table.size).result()
+    assert slots[5] == (5, 6, EXACT, 6.0, 5, 0)
+    cache.close()
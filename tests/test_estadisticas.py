@@ -0,0 +1,16 @@
+import json
+import math
+
+from estadisticas import SearchStats
+
+
+def test_json_has_no_infinite_or_nan_values():
+    stats = SearchStats("EXPERT", 6, None)
+    stats.score = -math.inf
+    stats.depth_times_ms = [(1, 0.5), (2, math.nan)]
+    data = json.loads(stats.to_json())
+    assert data["score"] is None
+    assert data["depth_times_ms"] == [[1, 0.5], [2, None]]
+
+    stats.score = 12.5
+    assert json.loads(stats.to_json())["score"] == 12.5
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from algoritmo import Difficulty, GameLogic
+from bitboard import BitboardState
+from pesos import DEFAULT_WEIGHTS
+from tablas import DEFAULT_BOARD, board_tables
+
+
+def _positions(seed, games=10):
+    """(estado, historial, jugador al turno) de partidas aleatorias en el tablero estándar"""
+    tables = board_tables(DEFAULT_BOARD)
+    rng = random.Random(seed)
+    for _ in range(games):
+        green_sq, red_sq = rng.sample(tables.start_squares(), 2)
+        state = BitboardState(tables.zone_masks, green_sq, red_sq)
+        move_history = []
+        green = True
+        while not state.is_game_over(green):
+            yield state, move_history, green
+            move = rng.choice(state.legal_moves(green))
+            state.make_move(green, move)
+            move_history.append(tables.to_pos(move))
+            green = not green
+
+
+@pytest.mark.parametrize("difficulty", [Difficulty.BEGINNER, Difficulty.EXPERT])
+def test_batch_matches_scalar_evaluator(difficulty):
+    logic = GameLogic(difficulty, opening_book=None, weights=DEFAULT_WEIGHTS)
+    logic.set_initial_zone((0, 3), logic.special_zones)
+    for state, move_history, green in _positions(seed=1):
+        evaluate = logic.make_evaluator(state, move_history)
+        batch = logic.make_batch_evaluator(move_history)
+        assert batch.evaluate_states([state]).tolist() == [evaluate()]
+
+        moves = state.legal_moves(green)
+        expected = []
+        for move in moves:
+            previous = state.make_move(green, move)
+            expected.append(evaluate())
+            state.unmake_move(green, move, previous)
+        assert batch.evaluate_children(state, green, moves).tolist() == expected
+
+
+def test_batch_evaluates_many_states_at_once():
+    logic = GameLogic(Difficulty.AMATEUR, opening_book=None, weights=DEFAULT_WEIGHTS)
+    states, expected = [], []
+    for state, _, _ in _positions(seed=2, games=3):
+        expected.append(logic.make_evaluator(state)())
+        states.append(state.copy())
+    assert logic.make_batch_evaluator().evaluate_states(states).tolist() == expected
@@ -0,0 +1,139 @@
+import random
+
+import pytest
+
+from bitboard import BitboardState
+from finales import WIN, EndgameSolver
+from tablas import BoardConfig, board_tables
+
+# Tablero de 4x4 cubierto por cuatro zonas de 2x2: cada jugada pinta una casilla,
+# así que la partida es finita y minimax hasta el final es una referencia exacta
+FULL_BOARD = BoardConfig.create(4, [
+    [(0, 0), (0, 1), (1, 0), (1, 1)],
+    [(0, 2), (0, 3), (1, 2), (1, 3)],
+    [(2, 0), (2, 1), (3, 0), (3, 1)],
+    [(2, 2), (2, 3), (3, 2), (3, 3)],
+], zone_win_threshold=3)
+
+# Tablero de 5x5 con casillas fuera de zona: se puede jugar indefinitamente
+OPEN_BOARD = BoardConfig.create(5, [
+    [(0, 0), (0, 1), (1, 0)],
+    [(0, 3), (0, 4), (1, 4)],
+    [(3, 4), (4, 3), (4, 4)],
+], zone_win_threshold=2)
+
+
+def _random_position(board, rng, painted_cells):
+    """Posición en curso con ``painted_cells`` casillas de zona pintadas al azar"""
+    tables = board_tables(board)
+    cells = list(range(tables.num_squares))
+    rng.shuffle(cells)
+    green_owned = red_owned = 0
+    zone_cells = [square for square in cells if tables.zones_mask >> square & 1]
+    for square in zone_cells[:painted_cells]:
+        if rng.random() < 0.5:
+            green_owned |= 1 << square
+        else:
+            red_owned |= 1 << square
+    painted = green_owned | red_owned
+    # Como en una partida, los Yoshis están fuera de las zonas o en casillas ya pintadas
+    standing = [square for square in cells if not (tables.zones_mask & ~painted) >> square & 1]
+    if len(standing) < 2:
+        return None
+    green_sq, red_sq = standing[:2]
+    state = BitboardState(tables.zone_masks, green_sq, red_sq, painted, green_owned, red_owned, board)
+    if any(state.zone_winner(zone) is not None for zone in range(len(tables.zone_masks))):
+        return None  # Las capturas se hacen al jugar, no al sembrar casillas
+    return state
+
+
+def _solver(board):
+    # Sin límite de capas: vaciar la caché a mitad de una resolución solo la repite
+    return EndgameSolver(board_tables(board).zone_masks, board.zone_win_threshold, max_layers=1 << 20, board=board)
+
+
+def _positions(board, seed, count, painted_cells):
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        state = _random_position(board, rng, rng.choice(painted_cells))
+        if state is not None and not state.is_game_over(True):
+            positions.append(state)
+    return positions
+
+
+def _minimax(state, green, memo):
+    """Valor exacto desde VERDE: ganar a d plies del final vale WIN - d (solo partidas finitas)"""
+    key = (state.hash, green)
+    value = memo.get(key)
+    if value is not None:
+        return value
+    if state.is_game_over(green):
+        value = state.outcome() * WIN
+    else:
+        children = []
+        for move in state.legal_moves(green):
+            previous = state.make_move(green, move)
+            child = _minimax(state, not green, memo)
+            state.unmake_move(green, move, previous)
+            children.append(child - 1 if child > 0 else child + 1 if child < 0 else 0)
+        value = max(children) if green else min(children)
+    memo[key] = value
+    return value
+
+
+def _forces_end(state, green, winner, depth, memo):
+    """True si ``winner`` (desde VERDE, 1 o -1) fuerza que la partida termine a su favor en ``depth`` plies"""
+    if state.is_game_over(green):
+        return state.outcome() == winner
+    if depth == 0:
+        return False
+    key = (state.hash, green, depth)
+    forced = memo.get(key)
+    if forced is None:
+        results = []
+        for move in state.legal_moves(green):
+            previous = state.make_move(green, move)
+            results.append(_forces_end(state, not green, winner, depth - 1, memo))
+            state.unmake_move(green, move, previous)
+        forced = memo[key] = any(results) if green == (winner == 1) else all(results)
+    return forced
+
+
+@pytest.mark.parametrize("green", [True, False], ids=["verde", "rojo"])
+def test_solver_matches_minimax_on_finite_games(green):
+    solver = _solver(FULL_BOARD)
+    memo = {}
+    for state in _positions(FULL_BOARD, seed=5, count=20, painted_cells=range(11, 14)):
+        if state.is_game_over(green):
+            continue
+        result = solver.solve(state, green)
+        value = _minimax(state, green, memo) * (1 if green else -1)  # Desde el jugador al turno
+        assert result.proven
+        assert result.outcome == (value > 0) - (value < 0)
+        assert result.distance == (WIN - abs(value) if value else None)
+
+        # Todos los movimientos de ``moves`` conservan el resultado y ``move`` es el más rápido
+        for move in result.moves:
+            previous = state.make_move(green, move)
+            child = _minimax(state, not green, memo) * (1 if green else -1)
+            state.unmake_move(green, move, previous)
+            assert (child > 0) - (child < 0) == result.outcome
+            if move == result.move and value:
+                assert WIN - abs(child) + 1 == result.distance
+
+
+def test_solver_distances_on_open_board():
+    solver = _solver(OPEN_BOARD)
+    for state in _positions(OPEN_BOARD, seed=6, count=20, painted_cells=range(6, 8)):
+        result = solver.solve(state, True)
+        assert result.proven
+        memo = {}
+        if result.distance is not None:
+            # Final forzado: se alcanza en exactamente ``distance`` plies, no antes
+            assert _forces_end(state, True, result.outcome, result.distance, memo)
+            assert not _forces_end(state, True, result.outcome, result.distance - 1, memo)
+        else:
+            # Empate o ventaja conservada jugando indefinidamente: nadie fuerza un final ganador
+            for winner in (1, -1):
+                assert not _forces_end(state, True, winner, 10, memo)
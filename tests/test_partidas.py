@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from bitboard import GameSnapshot
+from partidas import (HUMAN, GameRecord, GameRecordWriter, MoveRecord, append_records, decode_board,
+                      encode_board, iter_positions, read_records, replay)
+from tablas import BOARD_VARIANTS, board_tables
+
+
+def _random_record(board, rng):
+    """Partida aleatoria legal, con puntajes representables en float32"""
+    green_start, red_start = rng.sample(board_tables(board).start_squares(), 2)
+    snapshot = GameSnapshot(green_start, red_start, board=board)
+    moves = []
+    while not snapshot.to_state().is_game_over(snapshot.green_to_move) and len(moves) < 80:
+        square = rng.choice(snapshot.legal_moves())
+        score = None if rng.random() < 0.2 else rng.randint(-4000, 4000) / 4
+        moves.append(MoveRecord(square, float(rng.randint(0, 5000)), score))
+        snapshot = snapshot.apply(square)
+    green_zones, red_zones = snapshot.to_state().zones_won()
+    result = (green_zones > red_zones) - (red_zones > green_zones)
+    return GameRecord(board, green_start, red_start, rng.choice((HUMAN, 2, 4, 6)), rng.choice((2, 4, 6)),
+                      result, green_zones, red_zones, tuple(moves))
+
+
+def _records(seed, count=12):
+    rng = random.Random(seed)
+    return [_random_record(BOARD_VARIANTS[name], rng) for name in BOARD_VARIANTS for _ in range(count // 3)]
+
+
+@pytest.mark.parametrize("board", list(BOARD_VARIANTS))
+def test_board_encoding_round_trip(board):
+    assert decode_board(encode_board(BOARD_VARIANTS[board])) == BOARD_VARIANTS[board]
+
+
+def test_records_round_trip(tmp_path):
+    path = str(tmp_path / "partidas.yzr")
+    records = _records(seed=1)
+    with GameRecordWriter(path) as writer:
+        for record in records[:5]:
+            writer.write(record)
+    # Anexar a un archivo existente no repite la cabecera
+    assert append_records(records[5:], path) == len(records) - 5
+    assert list(read_records(path)) == records
+
+
+def test_reader_ignores_truncated_last_record(tmp_path):
+    path = tmp_path / "partidas.yzr"
+    records = _records(seed=2, count=3)
+    append_records(records, str(path))
+    data = path.read_bytes()
+    path.write_bytes(data[:-3])
+    assert list(read_records(str(path))) == records[:-1]
+
+
+def test_reader_rejects_other_formats(tmp_path):
+    path = tmp_path / "partidas.yzr"
+    path.write_bytes(b"XXXX\x01\x00")
+    with pytest.raises(ValueError):
+        list(read_records(str(path)))
+
+
+def test_replay_follows_the_rules():
+    for record in _records(seed=3):
+        positions = list(iter_positions([record]))
+        assert [sample.move for sample in positions] == list(record.moves)
+        assert all(sample.result == record.result for sample in positions)
+        start = positions[0].snapshot
+        assert (start.green_sq, start.red_sq) == (record.green_start, record.red_start)
+
+    record = _records(seed=4, count=3)[0]
+    first = record.moves[0]
+    illegal = next(square for square in range(record.board.num_squares)
+                   if square not in GameSnapshot(record.green_start, record.red_start,
+                                                 board=record.board).legal_moves())
+    with pytest.raises(ValueError):
+        list(replay(record._replace(moves=(first._replace(square=illegal),))))
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from pesos import (DEFAULT_WEIGHTS, WEIGHTS_VERSION, load_weights, resolve_weights, save_weights,
+                   weights_from_dict)
+
+
+def _write(path, data):
+    with open(path, "w", encoding="utf-8") as weights_file:
+        json.dump(data, weights_file)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "pesos.json")
+    weights = DEFAULT_WEIGHTS._replace(zone_lead=12.5, repetition=7.0)
+    save_weights(weights, path)
+    assert load_weights(path) == weights
+    assert not (tmp_path / "pesos.json.tmp").exists()
+
+
+def test_missing_weights_take_their_default():
+    assert weights_from_dict({"centrality": 1.0}) == DEFAULT_WEIGHTS._replace(centrality=1.0)
+
+
+def test_unknown_weights_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        weights_from_dict({"zone_lead": 10.0, "mobility": 1.0})
+    path = str(tmp_path / "pesos.json")
+    _write(path, {"version": WEIGHTS_VERSION, "weights": {"mobility": 1.0}})
+    with pytest.raises(ValueError):
+        load_weights(path)
+
+
+def test_wrong_version_is_rejected(tmp_path):
+    path = str(tmp_path / "pesos.json")
+    _write(path, {"version": WEIGHTS_VERSION + 1, "weights": {}})
+    with pytest.raises(ValueError):
+        load_weights(path)
+
+
+def test_resolve_falls_back_to_defaults(tmp_path):
+    weights = DEFAULT_WEIGHTS._replace(zone_won=40.0)
+    assert resolve_weights(weights) is weights
+    assert resolve_weights(None) == DEFAULT_WEIGHTS
+    assert resolve_weights(str(tmp_path / "no_existe.json")) == DEFAULT_WEIGHTS
+
+    path = str(tmp_path / "pesos.json")
+    save_weights(weights, path)
+    assert resolve_weights(path) == weights
+    # Archivos dañados, de otra versión o sin pesos no impiden jugar
+    for data in ("{no es json", json.dumps({"version": WEIGHTS_VERSION + 1, "weights": {}}),
+                 json.dumps({"version": WEIGHTS_VERSION}),
+                 json.dumps({"version": WEIGHTS_VERSION, "weights": {"mobility": 1.0}})):
+        with open(path, "w", encoding="utf-8") as weights_file:
+            weights_file.write(data)
+        assert resolve_weights(path) == DEFAULT_WEIGHTS
+    # Una carpeta con el nombre del archivo (OSError al abrirla)
+    assert resolve_weights(str(tmp_path)) == DEFAULT_WEIGHTS
@@ -0,0 +1,38 @@
+import math
+
+import pytest
+
+from torneo import elo_difference, percentile
+
+
+def test_elo_of_an_even_score_is_zero():
+    elo, low, high = elo_difference(3, 4, 3)
+    assert elo == pytest.approx(0.0)
+    assert low < 0.0 < high
+
+
+@pytest.mark.parametrize("wins, losses", [(10, 0), (1, 0)])
+def test_elo_of_a_perfect_score_is_finite(wins, losses):
+    elo, low, high = elo_difference(wins, 0, losses)
+    assert math.isfinite(elo) and elo > 0.0
+    # Sin varianza el intervalo se reduce al propio valor
+    assert low == high == elo
+    assert elo_difference(losses, 0, wins) == pytest.approx((-elo, -high, -low))
+
+
+def test_elo_without_games():
+    assert elo_difference(0, 0, 0) == (0.0, 0.0, 0.0)
+
+
+def test_elo_of_a_single_draw():
+    assert elo_difference(0, 1, 0) == (pytest.approx(0.0), pytest.approx(0.0), pytest.approx(0.0))
+
+
+def test_percentile_edges():
+    assert percentile([], 50) == 0.0
+    assert [percentile([7.5], pct) for pct in (0, 50, 90, 100)] == [7.5] * 4
+    values = [4.0, 1.0, 3.0, 2.0]
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 50) == 2.0
+    assert percentile(values, 90) == 4.0
+    assert percentile(values, 100) == 4.0
@@ -0,0 +1,34 @@
+from transposicion import EXACT, LOWER_BOUND, UPPER_BOUND, TranspositionTable
+
+
+def test_probe_returns_only_the_stored_key():
+    table = TranspositionTable(1 << 16)
+    key = 0x1234_5678_9ABC_DEF0
+    table.store(key, 3, EXACT, 12.5, 17)
+    assert table.probe(key) == (key, 3, EXACT, 12.5, 17, 0)
+    # Misma ranura, otra posición: no debe confundirse
+    assert table.probe(key + table.size) is None
+    assert table.collisions == 1
+
+
+def test_deeper_entry_survives_within_a_search():
+    table = TranspositionTable(1 << 16)
+    key = 42
+    table.store(key, 5, LOWER_BOUND, 1.0, 9)
+    table.store(key, 2, UPPER_BOUND, -1.0, 3)
+    assert table.peek(key)[1:5] == (5, LOWER_BOUND, 1.0, 9)
+    table.store(key + table.size, 1, EXACT, 0.0, 4)
+    assert table.peek(key) is not None
+
+
+def test_older_search_is_replaceable_and_keeps_best_move():
+    table = TranspositionTable(1 << 16)
+    key = 42
+    table.store(key, 5, EXACT, 1.0, 9)
+    table.new_search()
+    table.store(key, 2, UPPER_BOUND, -1.0, None)
+    assert table.peek(key) == (key, 2, UPPER_BOUND, -1.0, 9, 1)
+    table.new_search()
+    table.store(key + table.size, 1, EXACT, 0.0, 4)
+    assert table.peek(key) is None
+    assert table.replacements == 1
@@ -0,0 +1,278 @@
+import argparse
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, NamedTuple, Optional, Tuple
+
+from algoritmo import Difficulty, GameLogic, Player
+from partidas import GameRecord, GameRecordWriter
+from pesos import DEFAULT_WEIGHTS, WEIGHTS_PATH, EvalWeights, load_weights
+from reglas import HeadlessGame
+from tablas import BOARD_VARIANTS, DEFAULT_BOARD, BoardConfig, board_tables
+
+
+class EngineConfig(NamedTuple):
+    """Configuración de un motor participante en el torneo"""
+    name: str
+    difficulty: Difficulty
+    max_depth: Optional[int] = None
+    time_budget_ms: Optional[int] = None
+    weights: Optional[EvalWeights] = None  # None: los de GameLogic (archivo de pesos o por defecto)
+
+
+class GameResult(NamedTuple):
+    """Resultado de una partida, visto desde el motor A"""
+    start: Tuple[Tuple[int, int], Tuple[int, int]]
+    a_is_green: bool
+    score_a: float  # 1 victoria, 0.5 empate, 0 derrota
+    green_zones: int
+    red_zones: int
+    plies: int
+    latencies_a: List[float]  # milisegundos por jugada
+    latencies_b: List[float]
+    nodes_a: int
+    nodes_b: int
+    record: Optional[GameRecord] = None  # Partida completa, para el registro de partidas
+
+
+class TournamentReport(NamedTuple):
+    games: int
+    wins: int
+    draws: int
+    losses: int
+    elo: float
+    elo_low: float
+    elo_high: float
+    avg_nodes_a: float
+    avg_nodes_b: float
+    latency_a: Tuple[float, float, float]  # p50, p90, p99 en ms
+    latency_b: Tuple[float, float, float]
+
+
+def _create_engine(
+    config: EngineConfig,
+    start_pos: Tuple[int, int],
+    board: BoardConfig,
+    position_cache: Optional[str] = None
+) -> GameLogic:
+    weights = config.weights if config.weights is not None else WEIGHTS_PATH
+    logic = GameLogic(config.difficulty, board=board, position_cache=position_cache, weights=weights)
+    logic.set_initial_zone(start_pos, logic.special_zones)
+    logic.enable_stats()
+    return logic
+
+
+def play_game(
+    config_a: EngineConfig,
+    config_b: EngineConfig,
+    green_pos: Tuple[int, int],
+    red_pos: Tuple[int, int],
+    a_is_green: bool,
+    max_plies: int = 200,
+    board: BoardConfig = DEFAULT_BOARD,
+    position_cache: Optional[str] = None
+) -> GameResult:
+    """Juega una partida completa motor contra motor sin interfaz.
+
+    Con ``position_cache`` ambos motores comparten la caché persistente de
+    posiciones (ver cache_posiciones.py), que se calienta partida tras partida.
+    """
+    game = HeadlessGame(green_pos, red_pos, max_plies=max_plies, board=board)
+    green_config, red_config = (config_a, config_b) if a_is_green else (config_b, config_a)
+    engines = {
+        Player.GREEN: (green_config, _create_engine(green_config, green_pos, board, position_cache)),
+        Player.RED: (red_config, _create_engine(red_config, red_pos, board, position_cache)),
+    }
+    latencies = {Player.GREEN: [], Player.RED: []}
+    nodes = {Player.GREEN: 0, Player.RED: 0}
+
+    while not game.game_over:
+        player = game.current_player
+        config, logic = engines[player]
+
+        start = time.perf_counter()
+        move = logic.get_ai_move_from_snapshot(
+            game.snapshot(player),
+            time_budget_ms=config.time_budget_ms,
+            max_depth=config.max_depth
+        )
+        latency = (time.perf_counter() - start) * 1000.0
+        latencies[player].append(latency)
+        nodes[player] += logic.last_stats.nodes
+
+        if move is None or move not in game.legal_moves():
+            # El motor no puede (o no sabe) mover: la partida se decide con lo ganado
+            game.end_game()
+            break
+        game.make_move(move, latency, logic.last_score)
+
+    # Los procesos del torneo no ejecutan atexit: la caché se escribe aquí
+    for _, logic in engines.values():
+        logic.shutdown()
+
+    a_player = Player.GREEN if a_is_green else Player.RED
+    b_player = Player.RED if a_is_green else Player.GREEN
+    if game.winner is None:
+        score_a = 0.5
+    else:
+        score_a = 1.0 if game.winner == a_player else 0.0
+    return GameResult(
+        (green_pos, red_pos), a_is_green, score_a,
+        game.green_zones_won, game.red_zones_won, game.plies,
+        latencies[a_player], latencies[b_player], nodes[a_player], nodes[b_player],
+        game.to_record(green_config.difficulty.value, red_config.difficulty.value)
+    )
+
+
+def opening_positions(
+    count: int,
+    seed: int,
+    board: BoardConfig = DEFAULT_BOARD
+) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """Posiciones iniciales reproducibles fuera de las zonas especiales"""
+    rng = random.Random(seed)
+    tables = board_tables(board)
+    available = [tables.to_pos(square) for square in tables.start_squares()]
+    return [tuple(rng.sample(available, 2)) for _ in range(count)]
+
+
+def elo_difference(wins: int, draws: int, losses: int) -> Tuple[float, float, float]:
+    """Diferencia Elo de A sobre B con intervalo de confianza del 95%"""
+    games = wins + draws + losses
+    if games == 0:
+        return 0.0, 0.0, 0.0
+    score = (wins + 0.5 * draws) / games
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    margin = 1.96 * math.sqrt(variance / games)
+
+    def to_elo(p: float) -> float:
+        p = min(max(p, 1e-6), 1 - 1e-6)
+        return -400.0 * math.log10(1.0 / p - 1.0)
+
+    return to_elo(score), to_elo(score - margin), to_elo(score + margin)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentil por rango más cercano (0 si no hay valores)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def run_tournament(
+    config_a: EngineConfig,
+    config_b: EngineConfig,
+    games: int,
+    workers: Optional[int] = None,
+    seed: int = 0,
+    max_plies: int = 200,
+    board: BoardConfig = DEFAULT_BOARD,
+    position_cache: Optional[str] = None,
+    record_path: Optional[str] = None
+) -> TournamentReport:
+    """Juega ``games`` partidas en un ProcessPoolExecutor.
+
+    Cada posición inicial se juega dos veces intercambiando colores, para que
+    la ventaja de mover primero no sesgue el resultado. Con ``record_path`` las
+    partidas se anexan a ese registro (ver partidas.py) desde este proceso.
+    """
+    openings = opening_positions((games + 1) // 2, seed, board)
+    tasks = []
+    for green_pos, red_pos in openings:
+        tasks.append((green_pos, red_pos, True))
+        tasks.append((green_pos, red_pos, False))
+    tasks = tasks[:games]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(play_game, config_a, config_b, green_pos, red_pos, a_is_green, max_plies, board,
+                        position_cache)
+            for green_pos, red_pos, a_is_green in tasks
+        ]
+        results = [future.result() for future in futures]
+    if record_path:
+        with GameRecordWriter(record_path) as writer:
+            for result in results:
+                writer.write(result.record)
+    return summarize(results)
+
+
+def summarize(results: List[GameResult]) -> TournamentReport:
+    wins = sum(1 for result in results if result.score_a == 1.0)
+    draws = sum(1 for result in results if result.score_a == 0.5)
+    losses = len(results) - wins - draws
+    elo, elo_low, elo_high = elo_difference(wins, draws, losses)
+
+    latencies_a = [value for result in results for value in result.latencies_a]
+    latencies_b = [value for result in results for value in result.latencies_b]
+    moves_a = max(1, len(latencies_a))
+    moves_b = max(1, len(latencies_b))
+    return TournamentReport(
+        len(results), wins, draws, losses, elo, elo_low, elo_high,
+        sum(result.nodes_a for result in results) / moves_a,
+        sum(result.nodes_b for result in results) / moves_b,
+        tuple(percentile(latencies_a, pct) for pct in (50, 90, 99)),
+        tuple(percentile(latencies_b, pct) for pct in (50, 90, 99)),
+    )
+
+
+def format_report(config_a: EngineConfig, config_b: EngineConfig, report: TournamentReport) -> str:
+    lines = [
+        f"{config_a.name} vs {config_b.name}: {report.games} partidas",
+        f"  A: +{report.wins} ={report.draws} -{report.losses}",
+        f"  Elo A-B: {report.elo:+.1f} (IC 95%: {report.elo_low:+.1f} .. {report.elo_high:+.1f})",
+        f"  Nodos por jugada: A {report.avg_nodes_a:.0f}, B {report.avg_nodes_b:.0f}",
+        "  Latencia A (p50/p90/p99 ms): {:.1f} / {:.1f} / {:.1f}".format(*report.latency_a),
+        "  Latencia B (p50/p90/p99 ms): {:.1f} / {:.1f} / {:.1f}".format(*report.latency_b),
+    ]
+    return "\n".join(lines)
+
+
+def _parse_engine(
+    name: str,
+    difficulty: str,
+    depth: Optional[int],
+    budget: Optional[int],
+    weights: Optional[str]
+) -> EngineConfig:
+    if weights == "default":
+        engine_weights = DEFAULT_WEIGHTS
+    else:
+        engine_weights = load_weights(weights) if weights else None
+    return EngineConfig(name, Difficulty[difficulty.upper()], depth, budget, engine_weights)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Torneo motor contra motor sin interfaz")
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-plies", type=int, default=200)
+    parser.add_argument("--board", default="8x8", choices=list(BOARD_VARIANTS))
+    parser.add_argument("--cache", default=None,
+                        help="archivo SQLite de la caché persistente de posiciones")
+    parser.add_argument("--record", default=None,
+                        help="registro de partidas al que anexar las partidas jugadas")
+    for side in ("a", "b"):
+        parser.add_argument(f"--difficulty-{side}", default="AMATEUR",
+                            choices=[difficulty.name for difficulty in Difficulty])
+        parser.add_argument(f"--depth-{side}", type=int, default=None)
+        parser.add_argument(f"--budget-{side}", type=int, default=None,
+                            help="tiempo por jugada en ms (profundización iterativa)")
+        parser.add_argument(f"--weights-{side}", default=None,
+                            help="archivo de pesos de la heurística (ver pesos.py), o 'default' "
+                                 "para los de por defecto aunque exista pesos.json")
+    args = parser.parse_args(argv)
+
+    config_a = _parse_engine("A", args.difficulty_a, args.depth_a, args.budget_a, args.weights_a)
+    config_b = _parse_engine("B", args.difficulty_b, args.depth_b, args.budget_b, args.weights_b)
+    report = run_tournament(config_a, config_b, args.games, args.workers, args.seed, args.max_plies,
+                            BOARD_VARIANTS[args.board], args.cache, args.record)
+    print(format_report(config_a, config_b, report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+from typing import Dict, List, Optional, Tuple
+
+# Tipos de cota guardados en cada entrada
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# Entrada: (clave, profundidad, tipo de cota, puntaje, mejor movimiento, generación)
+TTEntry = Tuple[int, int, int, float, Optional[int], int]
+
+
+class TranspositionTable:
+    """Tabla de transposición indexada por hash Zobrist con memoria acotada.
+
+    Usa un arreglo de tamaño fijo (potencia de dos) indexado por los bits bajos
+    de la clave. Al guardar se conserva la entrada más profunda, salvo que la
+    existente pertenezca a una búsqueda anterior (``new_search``), lo que permite
+    mantener la tabla entre llamadas a ``get_ai_move`` sin que se llene de
+    entradas obsoletas.
+    """
+
+    # Estimación del costo en memoria de una entrada (tupla + enteros + flotante)
+    ENTRY_BYTES = 200
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        size = 1
+        while size * 2 * self.ENTRY_BYTES <= max_bytes:
+            size *= 2
+        self.size = size
+        self.mask = size - 1
+        self.slots = [None] * size
+        self.generation = 0
+
+        # Con ``track_changes``: ranuras escritas y claves encontradas en la búsqueda
+        # actual (para la caché de posiciones, que así no recorre toda la tabla)
+        self.written: Optional[List[int]] = None
+        self.hit_keys: Optional[List[int]] = None
+
+        # Contadores para dimensionar la tabla
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def new_search(self):
+        """Marca el inicio de una nueva búsqueda; las entradas previas pasan a ser reemplazables"""
+        self.generation += 1
+        if self.written is not None:
+            self.written = []
+            self.hit_keys = []
+
+    def track_changes(self):
+        """Empieza a anotar en ``written`` y ``hit_keys`` lo que toca cada búsqueda"""
+        self.written = []
+        self.hit_keys = []
+
+    def adopt(self, slots: List[Optional[TTEntry]]):
+        """Incorpora ranuras preparadas fuera de la búsqueda (p. ej. desde la caché de posiciones).
+
+        Una tabla sin búsquedas las toma tal cual, sin copiarlas; si ya tiene
+        entradas, las preparadas solo ocupan las ranuras vacías.
+        """
+        if len(slots) != self.size:
+            raise ValueError("Las ranuras no corresponden al tamaño de la tabla")
+        if self.generation == 0 and self.stores == 0:
+            self.slots = slots
+        else:
+            self.slots = [own if own is not None else other for own, other in zip(self.slots, slots)]
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        """Busca la entrada de una posición; devuelve None si no está"""
+        entry = self.slots[key & self.mask]
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] != key:
+            self.misses += 1
+            self.collisions += 1
+            return None
+        self.hits += 1
+        if self.hit_keys is not None:
+            self.hit_keys.append(key)
+        return entry
+
+    def peek(self, key: int) -> Optional[TTEntry]:
+        """Como ``probe`` pero sin afectar los contadores (p. ej. para extraer la variante principal)"""
+        entry = self.slots[key & self.mask]
+        if entry is None or entry[0] != key:
+            return None
+        return entry
+
+    def store(self, key: int, depth: int, bound: int, score: float, best_move: Optional[int]):
+        """Guarda una posición con política de reemplazo por profundidad"""
+        index = key & self.mask
+        entry = self.slots[index]
+        if entry is not None:
+            if entry[0] == key:
+                # Misma posición: no perder el mejor movimiento de una búsqueda más profunda
+                if depth < entry[1] and entry[5] == self.generation:
+                    return
+                if best_move is None:
+                    best_move = entry[4]
+            elif depth < entry[1] and entry[5] == self.generation:
+                return
+            else:
+                self.replacements += 1
+        self.slots[index] = (key, depth, bound, score, best_move, self.generation)
+        self.stores += 1
+        if self.written is not None:
+            self.written.append(index)
+
+    def clear(self):
+        """Vacía la tabla y reinicia los contadores"""
+        self.slots = [None] * self.size
+        self.generation = 0
+        if self.written is not None:
+            self.written = []
+            self.hit_keys = []
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def usage(self) -> int:
+        """Número de entradas ocupadas"""
+        return self.size - self.slots.count(None)
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de aciertos, fallos y colisiones para dimensionar la tabla"""
+        return {
+            "size": self.size,
+            "used": self.usage(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "stores": self.stores,
+            "replacements": self.replacements,
+        }